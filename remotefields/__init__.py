@@ -1 +1,16 @@
 from base import *  # NOQA
+from breaker import CircuitBreaker, CircuitOpen  # NOQA
+from cache import RemoteIdentityMap, RemoteObjectCache  # NOQA
+from conditional import (ConditionalRequests, NotModified,  # NOQA
+                         RemoteResponse)
+from connections import (ConnectionPool, HttpEndpoint,  # NOQA
+                         get_connection_pool)
+from executor import (RemoteNotFound, RemoteServerError,  # NOQA
+                      RemoteTimeout, RemoteUnavailable)
+from filters import RemoteFieldsFilter  # NOQA
+from metrics import RemoteFieldMetrics, RequestMetrics, record  # NOQA
+from pagination import LimitOffsetPagination, PagePagination  # NOQA
+from prefetch import RemotePrefetchedList, prefetch_remote  # NOQA
+from signals import remote_field_resolved  # NOQA
+from snapshot import RemoteSnapshot  # NOQA
+from sync import RemoteSync  # NOQA
@@ -1,6 +1,19 @@
-from rest_framework.fields import WritableField
+import time
+from collections import OrderedDict
+from functools import partial
+
+from rest_framework.fields import WritableField, get_component
 from rest_framework.serializers import is_simple_callable
 
+from cache import RemoteIdentityMap, RemoteObjectCache
+from conditional import get_data
+from executor import (RemoteNotFound, RemoteTimeout, RemoteUnavailable,
+                      call_with_timeout, get_async_workers, get_max_workers,
+                      get_pool, get_refresh_workers, get_timeout,
+                      run_concurrently)
+from metrics import RemoteFieldMetrics, bind, collect, record
+from signals import remote_field_resolved
+
 
 class RemoteField(WritableField):
     """
@@ -15,14 +28,154 @@ class RemoteField(WritableField):
                 'detail': client.some.endpoint_detail
             }
         )
+
+    If the 'list' endpoint accepts a filter by a set of pks, it can be
+    declared using `bulk_param`, so only the needed remote objects are
+    retrieved (in chunks of `bulk_chunk_size` pks) instead of the whole
+    remote collection:
+
+        thing = RemoteField(
+            source='thing_id', remote_sources=('id', 'name',),
+            bulk_param='pk__in',
+            endpoints={...}
+        )
+
+    Remote objects can be cached on any of the backends configured on the
+    `CACHES` setting by giving a `cache_name` (identifying the remote
+    resource) and a `cache_timeout`:
+
+        thing = RemoteField(
+            source='thing_id', remote_sources=('id', 'name',),
+            cache_name='things', cache_timeout=300,
+            endpoints={...}
+        )
+
+    By default, single objects use the 'detail' endpoint and lists use the
+    'list' endpoint. A `strategy` can be given to always use one of them,
+    or to choose automatically: with 'auto', the 'detail' endpoint is used
+    (once per pk) when there are at most `bulk_threshold` distinct pks.
+
+    Remote calls taking longer than `timeout` seconds are abandoned, and
+    the rows waiting for them are filled with `placeholder`:
+
+        thing = RemoteField(
+            source='thing_id', remote_sources=('id', 'name',),
+            timeout=0.5, placeholder={'id': None, 'name': 'Unavailable'},
+            endpoints={...}
+        )
+
+    Endpoints which keep failing can be guarded by a `circuit_breaker`
+    (check CircuitBreaker), so they are not called while they are down and
+    the rows are filled with `placeholder` straight away.
+
+    If the endpoints can return only some attributes of the remote objects,
+    declare the name of the parameter listing them with `projection_param`,
+    so only the `remote_sources` are requested:
+
+        thing = RemoteField(
+            source='thing_id', remote_sources=('name',), flat=True,
+            projection_param='fields',
+            endpoints={...}
+        )
+
+    Remote objects are identified by their 'id'. Endpoints using a
+    different key can declare it with `remote_key`: the name of an
+    attribute, a tuple of attributes (composite keys, the source must return
+    a tuple as well) or a callable returning the key of a remote object:
+
+        thing = RemoteField(
+            source='thing_slug', remote_sources=('name',), flat=True,
+            remote_key='slug', bulk_param='slug__in',
+            endpoints={...}
+        )
+
+    If the 'list' endpoint returns its remote objects in pages, declare its
+    `pagination` (check PagePagination and LimitOffsetPagination), so every
+    page is retrieved:
+
+        thing = RemoteField(
+            source='thing_id', remote_sources=('id', 'name',),
+            pagination=PagePagination(page_param='page'),
+            endpoints={...}
+        )
+
+    Rows pointing to the same remote object get a copy of the same value.
+    With `share_values`, they get the very same dict instead, which saves
+    memory on large lists with many repeated pks, as long as the serialized
+    data is not modified afterwards.
+
+    Cached remote objects can be served for `cache_stale_timeout` more
+    seconds once they expire, while they are refreshed in the background:
+
+        thing = RemoteField(
+            source='thing_id', remote_sources=('id', 'name',),
+            cache_name='things', cache_timeout=300, cache_stale_timeout=3600,
+            endpoints={...}
+        )
+
+    A `snapshot` (check RemoteSnapshot) keeps the remote objects on a file,
+    so they are known as soon as the workers start, and can be served while
+    the remote service is unavailable.
+
+    Endpoints returning the validators of their responses (check
+    RemoteResponse) can be requested conditionally, reusing the previous
+    response while the remote resource does not change:
+
+        thing = RemoteField(
+            source='thing_id', remote_sources=('id', 'name',),
+            conditional=ConditionalRequests(),
+            endpoints={...}
+        )
+
+    Large remote collections can be kept on a local table, synchronized by
+    retrieving only the remote objects which changed (check RemoteSync):
+
+        thing = RemoteField(
+            source='thing_id', remote_sources=('id', 'name',),
+            sync=RemoteSync(modified_since_param='modified_since'),
+            endpoints={...}
+        )
     """
 
+    DETAIL = 'detail'
+    LIST = 'list'
+    AUTO = 'auto'
+    STRATEGIES = (DETAIL, LIST, AUTO)
+
     endpoints = None
     remote_sources = None
     flat = False
+    bulk_param = None
+    bulk_chunk_size = 100
+    cache_name = None
+    cache_timeout = None
+    cache_missing_timeout = None
+    cache_alias = 'default'
+    strategy = None
+    bulk_threshold = 1
+    timeout = None
+    placeholder = None
+    circuit_breaker = None
+    cache_stale_timeout = None
+    projection_param = None
+    share_values = False
+    remote_key = 'id'
+    pagination = None
+    snapshot = None
+    conditional = None
+    sync = None
+    remote_key_attributes = None
 
     def __init__(self, endpoints, remote_sources,
-                 flat=False, *args, **kwargs):
+                 flat=False, bulk_param=None, bulk_chunk_size=100,
+                 cache_name=None, cache_timeout=None,
+                 cache_missing_timeout=None, cache_alias='default',
+                 strategy=None, bulk_threshold=1, timeout=None,
+                 placeholder=None, circuit_breaker=None,
+                 cache_stale_timeout=None, projection_param=None,
+                 share_values=False, remote_key='id', pagination=None,
+                 snapshot=None, conditional=None, sync=None,
+                 remote_key_attributes=None, *args, **kwargs):
         """
         :param args: Standard DRF arguments
         :param kwargs: Standard DRF arguments. It will contain 'source':
@@ -30,20 +183,140 @@ class RemoteField(WritableField):
         :param endpoints: Dictionary containing 'list' and 'detail' endpoints
         :param remote_sources: Field names to retrieve from the remote service
         :param flat: Boolean indicating if it is a flat or nested structure
+        :param bulk_param: Name of the 'list' endpoint parameter used to
+                           filter by a comma separated list of pks
+        :param bulk_chunk_size: Maximum number of pks sent on each 'list'
+                                request when using `bulk_param`
+        :param cache_name: Name of the remote resource, used to build the
+                           cache keys
+        :param cache_timeout: Seconds to keep the remote objects in the
+                              cache. If None, the field is not cached
+        :param cache_missing_timeout: Seconds to remember the pks which do
+                                      not exist. Defaults to 60 seconds (or
+                                      `cache_timeout`, if shorter), 0
+                                      disables it
+        :param cache_alias: Alias of the cache to use, from `CACHES`
+        :param strategy: Endpoint used to retrieve the remote objects:
+                         'detail', 'list' or 'auto'. If None, single
+                         objects use 'detail' and lists use 'list'
+        :param bulk_threshold: Maximum number of distinct pks retrieved
+                               using the 'detail' endpoint with 'auto'
+        :param timeout: Maximum seconds to wait for every remote call. If
+                        None, it is only limited by the serializer deadline
+        :param placeholder: Value of the field when the remote call does not
+                            answer on time, or its circuit is open
+        :param circuit_breaker: CircuitBreaker guarding the endpoints
+        :param cache_stale_timeout: Seconds to keep serving the cached
+                                    remote objects once they expire, while
+                                    they are refreshed in the background.
+                                    If None, they are not served
+        :param projection_param: Name of the endpoints parameter used to
+                                 request a comma separated list of remote
+                                 attributes
+        :param share_values: Boolean indicating if the rows pointing to the
+                             same remote object share the same value,
+                             instead of a copy of it
+        :param remote_key: Attribute (or tuple of attributes) identifying
+                           the remote objects, or a callable returning the
+                           key of a remote object
+        :param pagination: Pagination of the 'list' endpoint. If None, it
+                           returns all the remote objects at once
+        :param snapshot: RemoteSnapshot persisting the remote objects
+        :param conditional: ConditionalRequests keeping the responses of the
+                            endpoints, to request them conditionally
+        :param sync: RemoteSync keeping the whole remote collection on a
+                     local table
+        :param remote_key_attributes: Attributes read by a callable
+                                      `remote_key`, requested from the
+                                      'list' endpoint with `projection_param`
         """
         if flat and len(remote_sources) > 1:
             raise ValueError('Flat fields can only specify a remote_source')
+        if bulk_chunk_size < 1:
+            raise ValueError('bulk_chunk_size must be a positive number')
+        if cache_timeout is not None and not cache_name:
+            raise ValueError('Cached fields must specify a cache_name')
+        if strategy is not None and strategy not in self.STRATEGIES:
+            raise ValueError('strategy must be one of %s' %
+                             ', '.join(self.STRATEGIES))
+        if timeout is not None and timeout <= 0:
+            raise ValueError('timeout must be a positive number')
+        if cache_stale_timeout is not None and cache_timeout is None:
+            raise ValueError('Stale objects can only be served from cached '
+                             'fields')
+        if callable(remote_key) and projection_param is not None and \
+                remote_key_attributes is None:
+            raise ValueError('Fields with a callable remote_key and a '
+                             'projection_param must specify the '
+                             'remote_key_attributes')
 
         self.endpoints = endpoints
         self.remote_sources = remote_sources
         self.flat = flat
+        self.bulk_param = bulk_param
+        self.bulk_chunk_size = bulk_chunk_size
+        self.cache_name = cache_name
+        self.cache_timeout = cache_timeout
+        self.cache_missing_timeout = cache_missing_timeout
+        self.cache_alias = cache_alias
+        self.strategy = strategy
+        self.bulk_threshold = bulk_threshold
+        self.timeout = timeout
+        self.placeholder = placeholder
+        self.circuit_breaker = circuit_breaker
+        self.cache_stale_timeout = cache_stale_timeout
+        self.projection_param = projection_param
+        self.share_values = share_values
+        self.remote_key = remote_key
+        self.pagination = pagination
+        self.snapshot = snapshot
+        self.conditional = conditional
+        self.sync = sync
+        self.remote_key_attributes = remote_key_attributes
         super(RemoteField, self).__init__(*args, **kwargs)
 
+    def get_remote_key(self, remote_object):
+        """
+        Returns the key of a remote object, as returned by the source.
+        It raises KeyError if the remote object does not include it.
+        """
+        if callable(self.remote_key):
+            return self.remote_key(remote_object)
+        if isinstance(self.remote_key, tuple):
+            return tuple(remote_object[name] for name in self.remote_key)
+        return remote_object[self.remote_key]
+
+    def get_remote_key_attributes(self):
+        """
+        Returns the attributes of the remote objects needed to build their
+        keys: the `remote_key_attributes` given for callable keys.
+        """
+        if callable(self.remote_key):
+            return tuple(self.remote_key_attributes or ())
+        if isinstance(self.remote_key, tuple):
+            return self.remote_key
+        return (self.remote_key,)
+
+    def format_remote_key(self, pk):
+        """
+        Returns a remote key as a string, to be sent using `bulk_param` and
+        to build cache keys. The values of composite keys are joined by ':'.
+        """
+        if isinstance(pk, tuple):
+            return ':'.join('%s' % (value,) for value in pk)
+        return '%s' % (pk,)
+
     def field_to_native(self, obj, field_name):
         """
+        Returns the value of the source (the remote pk).
         The serializer class will fill this field content later
         """
-        return getattr(obj, self.source, None)
+        if obj is None:
+            return None
+        try:
+            return get_component(obj, self.source)
+        except AttributeError:
+            return None
 
 
 class RemoteFieldsModelSerializerMixin(object):
@@ -73,89 +346,638 @@ class RemoteFieldsModelSerializerMixin(object):
 
     Where each endpoint is expressed using the rest_client library.
     More info: https://github.com/rockabox/rest_client_builder
+
+    Remote fields retrieving objects from different remote resources can be
+    resolved concurrently using a pool of `remote_max_workers` threads
+    (defaults to the `REMOTE_FIELDS_MAX_WORKERS` setting, 0 disables it).
+
+    The remote fields of every evaluation of `data` must be resolved in
+    `remote_timeout` seconds (defaults to the `REMOTE_FIELDS_TIMEOUT`
+    setting, None disables it), or before the 'remote_deadline' (as given
+    by `time.time()`) on the serializer context. Fields whose remote calls
+    do not answer on time are filled with their `placeholder`, and listed
+    on `timed_out_fields`.
     """
 
+    remote_cache_class = RemoteObjectCache
+    remote_max_workers = None
+    remote_chunk_size = 500
+    remote_timeout = None
+    timed_out_fields = frozenset()
+
     def to_native(self, obj):
         """
         Serialize objects -> primitives.
+
+        Nested remote serializers are serialized without resolving their
+        remote fields; their rows are registered to be resolved in bulk
+        together with the rest of the tree (check `field_to_native`).
         """
         if is_simple_callable(getattr(obj, 'all', None)):
-            ret = [super(RemoteFieldsModelSerializerMixin, self).to_native(i)
-                   for i in obj.all()]
-        else:
-            ret = super(RemoteFieldsModelSerializerMixin, self).to_native(obj)
+            return [self.to_native(i) for i in obj.all()]
+        return super(RemoteFieldsModelSerializerMixin, self).to_native(obj)
+
+    def field_to_native(self, obj, field_name):
+        """
+        Serialize the value of the serializer used as a field of another
+        serializer.
 
-        for field_name, field in self.get_remote_serializers():
-            obj_field = getattr(obj, field_name, None)
-            ret[field_name] = field.__class__(obj_field).data
+        If the parent serializer is collecting the rows of its tree (check
+        `data`), the rows are registered to be resolved together with them.
+        Otherwise (e.g. the serializer is the `results` field of a
+        PaginationSerializer), the whole value is collected and resolved at
+        once, so every RemoteField is resolved once for all its rows.
+        """
+        remote_rows = getattr(getattr(self, 'parent', None),
+                              '_remote_rows', None)
+        nested = remote_rows is not None
+        if not nested:
+            remote_rows = []
+
+        self._remote_rows = remote_rows
+        try:
+            data = super(RemoteFieldsModelSerializerMixin,
+                         self).field_to_native(obj, field_name)
+        finally:
+            self._remote_rows = None
+        if data is None:
+            return data
 
-        return ret
+        many = isinstance(data, list)
+        remote_rows.append((self, data if many else [data], many))
+        if nested:
+            return data
+        return self._resolve_remote_data(
+            data, remote_rows, self._get_remote_identity_map())
 
     @property
     def data(self):
         """
         Returns the serialized data on the serializer.
+
+        The whole tree of nested serializers is serialized first, and then
+        every RemoteField is resolved once for all the rows using it.
+        Remote objects are shared across the whole tree through an identity
+        map (check RemoteIdentityMap).
+
+        While the data is being resolved in the background (check
+        `data_async`), it waits for it instead of resolving it again.
         """
-        existing_fields = self.opts.fields
-        remote_fields_sources = [f.source for _, f in self.get_remote_fields()]
-        new_sources = set(remote_fields_sources) - set(existing_fields)
-        self.opts.fields += tuple(new_sources)
-        self.fields = self.get_fields()
+        pending = getattr(self, '_pending_data', None)
+        if self._data is None and pending is not None:
+            return pending.get()
+        if self._data is None:
+            remote_rows = []
+            data = self._get_unresolved_data(remote_rows)
+            self._resolve_data(
+                data, remote_rows, self._get_remote_identity_map())
+        return self._data
 
-        self._data = super(RemoteFieldsModelSerializerMixin, self).data
+    def data_async(self, callback=None):
+        """
+        Returns the serialized data without blocking on the remote services.
 
-        self.opts.fields = tuple(set(self.fields) - new_sources)
-        self.fields = self.get_fields()
+        The local data is serialized on the calling thread, while the remote
+        fields are resolved on a background thread (there are
+        `REMOTE_FIELDS_ASYNC_WORKERS` of them). It returns an AsyncResult,
+        whose `get()` returns the same value as `data`. The optional
+        `callback` is called with that value once it is available.
 
-        if isinstance(self._data, list):
-            self._data = self._add_remote_fields_to_list(self._data)
-            for instance in self._data:
-                for field in new_sources:
-                    del instance[field]
-        else:
-            self._data = self._add_remote_fields_to_obj(self._data)
-            for field in new_sources:
-                del self._data[field]
+        Evaluating `data` (or `data_async` again) meanwhile waits for the
+        same resolution.
+        """
+        pool = get_pool(get_async_workers(), name='data')
+        pending = getattr(self, '_pending_data', None)
+        if self._data is None and pending is not None:
+            # The resolution was queued first, so it is not waiting behind
+            # this task for a thread of the same pool
+            return pool.apply_async(pending.get, callback=callback)
+        if self._data is not None:
+            return pool.apply_async(lambda: self._data, callback=callback)
+
+        remote_rows = []
+        data = self._get_unresolved_data(remote_rows)
+        self._pending_data = pool.apply_async(
+            self._resolve_data,
+            (data, remote_rows, self._get_remote_identity_map()),
+            callback=callback)
+        return self._pending_data
+
+    def iter_data(self, chunk_size=None):
+        """
+        Returns an iterator over the serialized rows of a queryset (or any
+        iterable), suitable for a StreamingHttpResponse.
+
+        Objects are serialized in chunks of `chunk_size` rows (defaults to
+        `remote_chunk_size`), resolving the remote fields of every chunk in
+        bulk, so the memory used does not depend on the number of rows.
+        """
+        chunk_size = chunk_size or self.remote_chunk_size
+        objects = self.object
+        if is_simple_callable(getattr(objects, 'iterator', None)):
+            objects = objects.iterator()
+
+        chunk = []
+        for obj in objects:
+            chunk.append(obj)
+            if len(chunk) >= chunk_size:
+                for row in self._get_chunk_data(chunk):
+                    yield row
+                chunk = []
+        for row in self._get_chunk_data(chunk):
+            yield row
+
+    def _get_chunk_data(self, objects):
+        if not objects:
+            return []
+        remote_rows = []
+        self._remote_rows = remote_rows
+        try:
+            data = [self.to_native(obj) for obj in objects]
+        finally:
+            self._remote_rows = None
+        remote_rows.append((self, data, True))
+        return self._resolve_remote_data(
+            data, remote_rows, self._get_remote_identity_map())
+
+    def _resolve_data(self, data, remote_rows, identity_map):
+        self._data = self._resolve_remote_data(
+            data, remote_rows, identity_map)
         return self._data
 
+    def _resolve_remote_data(self, data, remote_rows, identity_map):
+        self._remote_identity_map = identity_map
+        self._remote_deadline = self._get_remote_deadline()
+        try:
+            self._resolve_remote_rows(remote_rows)
+        finally:
+            self._remote_identity_map = None
+            self._remote_deadline = None
+        return data
+
+    def _get_remote_deadline(self):
+        """
+        Returns the time (as given by `time.time()`) by which the remote
+        fields must be resolved, or None if there is no time limit.
+        """
+        deadline = self.context.get('remote_deadline')
+        timeout = get_timeout(self.remote_timeout)
+        if timeout is not None:
+            if deadline is None:
+                deadline = time.time() + timeout
+            else:
+                deadline = min(deadline, time.time() + timeout)
+        return deadline
+
     def get_remote_fields(self):
-        all_fields = self.get_fields()
-        return [(field_name, field) for field_name, field in all_fields.items()
-                if isinstance(field, RemoteField)]
+        remote_fields, _ = self._get_remote_declarations()
+        return [(field_name, field) for field_name, field in remote_fields
+                if field_name in self.fields]
 
     def get_remote_serializers(self):
-        all_fields = self.get_fields()
-        return [(field_name, field) for field_name, field in all_fields.items()
-                if isinstance(field, RemoteFieldsModelSerializerMixin)]
+        _, remote_serializers = self._get_remote_declarations()
+        return [(field_name, field) for field_name, field in remote_serializers
+                if field_name in self.fields]
+
+    @classmethod
+    def _get_remote_declarations(cls):
+        """
+        Returns a tuple (remote_fields, remote_serializers) with the
+        RemoteFields and the nested remote serializers declared on the
+        serializer class, as lists of (field_name, field).
+
+        They are computed once per serializer class.
+        """
+        declarations = cls.__dict__.get('_remote_declarations')
+        if declarations is None:
+            declarations = (
+                [(field_name, field)
+                 for field_name, field in cls.base_fields.items()
+                 if isinstance(field, RemoteField)],
+                [(field_name, field)
+                 for field_name, field in cls.base_fields.items()
+                 if isinstance(field, RemoteFieldsModelSerializerMixin)])
+            cls._remote_declarations = declarations
+        return declarations
+
+    def _get_unresolved_data(self, remote_rows):
+        """
+        Serialize the data without resolving the remote fields, which will
+        contain the remote pks.
+
+        The serialized rows are appended to `remote_rows` as a tuple
+        (serializer, rows, many).
+        """
+        self._remote_rows = remote_rows
+        try:
+            data = super(RemoteFieldsModelSerializerMixin, self).data
+        finally:
+            self._remote_rows = None
+            self._data = None
+
+        many = isinstance(data, list)
+        rows = data if many else [data]
+        remote_rows.append((self, rows, many))
+        return data
+
+    def _resolve_remote_rows(self, remote_rows):
+        """
+        Resolve every remote field of a tree of serialized rows.
+
+        Rows are grouped by the serializer class and field declaring each
+        RemoteField, so every group is resolved with a single lookup:
+
+            - A single object uses the 'detail' endpoint.
+            - Lists, or several objects coming from different nested
+              serializers, use the 'list' endpoint.
+        """
+        groups = OrderedDict()
+        for serializer, rows, many in remote_rows:
+            for field_name, remote_field in serializer.get_remote_fields():
+                key = (serializer.__class__, field_name)
+                if key not in groups:
+                    groups[key] = (field_name, remote_field, [], [])
+                groups[key][2].extend(rows)
+                groups[key][3].append(many)
+
+        self._resolve_remote_groups([
+            (serializer_class, field_name, remote_field, rows, any(many))
+            for (serializer_class, _), (field_name, remote_field, rows, many)
+            in groups.items()])
+
+    def _resolve_remote_groups(self, groups):
+        """
+        Resolve a list of remote fields, given as tuples
+        (serializer_class, local_field_name, remote_field, rows, many).
+
+        Fields retrieving objects from different remote resources are
+        independent, so they are resolved concurrently if the serializer
+        uses threads (check `remote_max_workers`). Fields sharing a remote
+        resource are resolved one after the other, so they can reuse the
+        remote objects already retrieved: their remote objects are retrieved
+        (and requested, check `projection_param`) with the attributes needed
+        by all of them.
+        """
+        identity_map = self._get_remote_identity_map()
+        resources = OrderedDict()
+        for group in groups:
+            key = identity_map.get_resource_key(group[2])
+            resources.setdefault(key, []).append(group)
+
+        self._remote_projections = self._get_remote_projections(resources)
+        try:
+            run_concurrently(
+                [partial(self._resolve_remote_resource_groups,
+                         resource_groups)
+                 for resource_groups in resources.values()],
+                get_max_workers(self.remote_max_workers))
+        finally:
+            self._remote_projections = None
+
+    def _get_remote_projections(self, resources):
+        """
+        Returns a dict mapping each remote resource key to the set of
+        remote attributes needed by the fields using it.
+        """
+        projections = {}
+        for key, resource_groups in resources.items():
+            for group in resource_groups:
+                projections.setdefault(key, set()).update(
+                    group[2].remote_sources)
+        return projections
+
+    def _resolve_remote_resource_groups(self, groups):
+        """
+        Resolve a list of remote fields sharing a remote resource.
+
+        The metrics of every field are sent with the `remote_field_resolved`
+        signal once it is resolved.
+        """
+        for serializer_class, local_field_name, remote_field, rows, many \
+                in groups:
+            if not rows:
+                continue
+            use_detail = self._use_detail_endpoint(
+                local_field_name, remote_field, rows, many)
+            metrics = RemoteFieldMetrics(
+                serializer_class, local_field_name, remote_field,
+                RemoteField.DETAIL if use_detail else RemoteField.LIST,
+                len(rows))
+            with collect(metrics):
+                if use_detail:
+                    for row in rows:
+                        self._add_remote_field_to_obj(
+                            local_field_name, remote_field, row)
+                else:
+                    self._add_remote_field_to_list(
+                        local_field_name, remote_field, rows)
+            if metrics.timeouts:
+                self.__dict__.setdefault(
+                    'timed_out_fields', set()).add(metrics.name)
+            remote_field_resolved.send(
+                sender=serializer_class, metrics=metrics,
+                request=self.context.get('request'))
+
+    def _use_detail_endpoint(self, local_field_name, remote_field, rows,
+                             many):
+        """
+        Returns True if the remote objects of some rows must be retrieved
+        using the 'detail' endpoint (once per pk) instead of the 'list'
+        endpoint, depending on the field `strategy`.
+        """
+        if remote_field.strategy == RemoteField.DETAIL:
+            return True
+        if remote_field.strategy == RemoteField.LIST:
+            return False
+        if remote_field.strategy == RemoteField.AUTO:
+            pks = set(row[local_field_name] for row in rows
+                      if row[local_field_name] is not None and
+                      not isinstance(row[local_field_name], dict))
+            return len(pks) <= remote_field.bulk_threshold
+        return not many and len(rows) == 1
 
     def _add_remote_fields_to_list(self, data):
         """
         Add every remote field data to every object in a list.
 
+            - If a field is already expanded for an object,
+              it will be ignored.
             - If the pk to retrieve remote data does not exist,
               the resulting field be null.
         """
-        for local_field_name, remote_field in self.get_remote_fields():
-            list_endpoint = remote_field.endpoints['list']
-            remote_objects = list_endpoint()
-
-            # We use a dict to speed the access to the set of remote_objects
-            remote_objects_data = dict()
-            for remote_object in remote_objects:
-                pk = remote_object['id']
-                remote_objects_data[pk] = remote_object
-
-            for local_object in self._data:
-                remote_pk = local_object[remote_field.source]
-                try:
-                    remote_object = remote_objects_data[remote_pk]
-
-                    local_object[local_field_name] = self._fill_remote_field(
-                        remote_field, remote_object)
-                except KeyError:
-                    local_object[local_field_name] = None
+        self._resolve_remote_groups([
+            (self.__class__, local_field_name, remote_field, data, True)
+            for local_field_name, remote_field in self.get_remote_fields()])
         return data
 
+    def _add_remote_field_to_list(self, local_field_name, remote_field, data):
+        data = [local_object for local_object in data
+                if not isinstance(local_object[local_field_name], dict)]
+        remote_pks = set(local_object[local_field_name]
+                         for local_object in data)
+        try:
+            remote_objects_data = self._get_remote_objects(
+                remote_field, remote_pks)
+        except RemoteUnavailable as e:
+            self._record_unavailable(e)
+            for local_object in data:
+                if local_object[local_field_name] is not None:
+                    local_object[local_field_name] = remote_field.placeholder
+            return
+
+        # Every value is filled once per remote pk, and shared or copied
+        # for the rest of the rows pointing to it
+        values = {}
+        for remote_pk, remote_object in remote_objects_data.items():
+            try:
+                values[remote_pk] = self._fill_remote_field(
+                    remote_field, remote_object)
+            except KeyError:
+                continue
+        copy = not (remote_field.flat or remote_field.share_values)
+
+        for local_object in data:
+            remote_pk = local_object[local_field_name]
+            if remote_pk in values:
+                value = values[remote_pk]
+                local_object[local_field_name] = dict(value) if copy else value
+            else:
+                local_object[local_field_name] = None
+                if remote_pk is not None:
+                    record('missing')
+
+    def _get_remote_cache(self, remote_field):
+        """
+        Returns the cache for the remote objects of a field, or None if the
+        field is not cached.
+        """
+        if remote_field.cache_timeout is None:
+            return None
+        return self.remote_cache_class(remote_field)
+
+    def _get_remote_identity_map(self):
+        """
+        Returns the identity map of the current evaluation of `data`: the
+        one given on the context as 'remote_identity_map', the one of the
+        objects returned by `prefetch_remote`, or a new one.
+        """
+        identity_map = getattr(self, '_remote_identity_map', None)
+        if identity_map is None:
+            identity_map = self.context.get('remote_identity_map')
+        if identity_map is None:
+            identity_map = getattr(self.object, 'remote_identity_map', None)
+        if identity_map is None:
+            identity_map = RemoteIdentityMap()
+        return identity_map
+
+    def _get_remote_objects(self, remote_field, pks):
+        """
+        Retrieve the remote objects of a field for a set of pks.
+
+        Returns a dict mapping each remote pk to its remote object.
+
+            - Remote objects already retrieved while serializing the
+              current data will not be retrieved again.
+        """
+        pks = set(pk for pk in pks if pk is not None)
+        record('pks', len(pks))
+        identity_map = self._get_remote_identity_map()
+        remote_objects_data, missing_pks = identity_map.get_many(
+            remote_field, pks)
+        record('identity_hits', len(remote_objects_data) + len(missing_pks))
+        pending_pks = pks - set(remote_objects_data) - missing_pks
+        if pending_pks:
+            fetched = self._get_synced_remote_objects(
+                remote_field, pending_pks)
+            identity_map.set_many(
+                remote_field, fetched, pending_pks - set(fetched))
+            remote_objects_data.update(fetched)
+        return remote_objects_data
+
+    def _get_synced_remote_objects(self, remote_field, pks):
+        """
+        Retrieve the remote objects of a field for a set of pks.
+
+        Returns a dict mapping each remote pk to its remote object.
+
+            - If the field is synchronized, they are served from its table,
+              and the pks not found do not exist.
+        """
+        if remote_field.sync is None:
+            return self._get_snapshot_remote_objects(remote_field, pks)
+        record('sync_hits', len(pks))
+        return remote_field.sync.get_many(remote_field, pks)
+
+    def _get_snapshot_remote_objects(self, remote_field, pks):
+        """
+        Retrieve the remote objects of a field for a set of pks.
+
+        Returns a dict mapping each remote pk to its remote object.
+
+            - If the field has a snapshot, only the pks missing from it (or
+              too old) will be retrieved, and stored on it.
+            - If the remote service is unavailable, they are served from
+              the snapshot however old, as long as it has all of them.
+        """
+        snapshot = remote_field.snapshot
+        if snapshot is None:
+            return self._get_cached_remote_objects(remote_field, pks)
+
+        remote_objects_data = snapshot.get_fresh_many(remote_field, pks)
+        record('snapshot_hits', len(remote_objects_data))
+        pending_pks = pks - set(remote_objects_data)
+        if pending_pks:
+            try:
+                fetched = self._get_cached_remote_objects(
+                    remote_field, pending_pks)
+            except RemoteUnavailable:
+                fetched = snapshot.get_many(remote_field, pending_pks)
+                if len(fetched) < len(pending_pks):
+                    raise
+                record('snapshot_hits', len(fetched))
+            else:
+                snapshot.update(fetched, pending_pks - set(fetched))
+            remote_objects_data.update(fetched)
+        return remote_objects_data
+
+    def _get_cached_remote_objects(self, remote_field, pks):
+        """
+        Retrieve the remote objects of a field for a set of pks.
+
+        Returns a dict mapping each remote pk to its remote object.
+
+            - If the field is cached, only the pks missing from the cache
+              will be retrieved from the remote service.
+        """
+        cache = self._get_remote_cache(remote_field)
+        if cache is None:
+            return self._fetch_remote_objects(remote_field, pks)
+
+        remote_objects_data, missing_pks = self._get_cache_entries(
+            remote_field, cache, pks, detail=False)
+        record('cache_hits', len(remote_objects_data) + len(missing_pks))
+        pending_pks = pks - set(remote_objects_data) - missing_pks
+        if pending_pks:
+            fetched = self._fetch_remote_objects(remote_field, pending_pks)
+            cache.set_many(
+                dict((pk, fetched[pk]) for pk in pending_pks if pk in fetched),
+                pending_pks - set(fetched))
+            remote_objects_data.update(fetched)
+        return remote_objects_data
+
+    def _get_cache_entries(self, remote_field, cache, pks, detail):
+        """
+        Returns a tuple (remote_objects, missing_pks) with the cached remote
+        objects of some pks, and the pks known not to exist.
+
+        If the field serves stale objects, the expired ones are returned
+        too, and refreshed in the background using the 'detail' or the
+        'list' endpoint.
+        """
+        if remote_field.cache_stale_timeout is None:
+            return cache.get_many(pks)
+
+        remote_objects, missing_pks, stale_pks = cache.get_many_stale(pks)
+        if stale_pks:
+            record('stale_hits', len(stale_pks))
+            self._refresh_remote_objects(remote_field, cache, stale_pks,
+                                         detail)
+        return remote_objects, missing_pks
+
+    def _refresh_remote_objects(self, remote_field, cache, pks, detail):
+        """
+        Refresh some cached remote objects on a background thread (there
+        are `REMOTE_FIELDS_REFRESH_WORKERS` of them), unless they are being
+        refreshed already.
+        """
+        pks = cache.start_refresh(pks)
+        if pks:
+            get_pool(get_refresh_workers(), name='refresh').apply_async(
+                self._refresh_cache, (remote_field, cache, pks, detail))
+
+    def _refresh_cache(self, remote_field, cache, pks, detail):
+        """
+        Retrieve some remote objects and store them on the cache.
+
+        The serializer deadline does not apply to background refreshes.
+        Errors are ignored, so the stale objects keep being served.
+        """
+        try:
+            if detail:
+                remote_objects = {}
+                missing_pks = set()
+                for pk in pks:
+                    try:
+                        remote_objects[pk] = self._call_endpoint(
+                            remote_field, 'detail', {'pk': pk},
+                            background=True)
+                    except RemoteNotFound:
+                        missing_pks.add(pk)
+                    except (KeyError, ValueError):
+                        pass
+            else:
+                remote_objects = self._fetch_remote_objects(
+                    remote_field, pks, background=True)
+                missing_pks = pks - set(remote_objects)
+            cache.set_many(
+                dict((pk, remote_objects[pk]) for pk in pks
+                     if pk in remote_objects),
+                missing_pks)
+        finally:
+            cache.finish_refresh(pks)
+
+    def _fetch_remote_objects(self, remote_field, pks, background=False):
+        """
+        Retrieve the remote objects of a field using its 'list' endpoint.
+
+        Returns a dict mapping each remote pk to its remote object.
+
+            - If the field declares a `bulk_param`, only the given pks
+              will be requested, split in chunks of `bulk_chunk_size`.
+            - Otherwise, the whole remote collection will be retrieved (or,
+              if it is paginated, until all the pks are found).
+        """
+        if remote_field.bulk_param is None:
+            remote_objects = self._call_list_endpoint(
+                remote_field, {}, pks, background)
+        else:
+            pks = sorted(pks)
+            chunk_size = remote_field.bulk_chunk_size
+            remote_objects = []
+            for start in range(0, len(pks), chunk_size):
+                chunk = pks[start:start + chunk_size]
+                remote_objects.extend(self._call_list_endpoint(
+                    remote_field, {
+                        remote_field.bulk_param: ','.join(
+                            remote_field.format_remote_key(pk)
+                            for pk in chunk)
+                    }, chunk, background))
+
+        # We use a dict to speed the access to the set of remote_objects,
+        # keeping only the attributes needed
+        attributes = self._get_remote_attributes(remote_field)
+        remote_objects_data = dict()
+        for remote_object in remote_objects:
+            pk = remote_field.get_remote_key(remote_object)
+            remote_objects_data[pk] = dict(
+                (name, remote_object[name]) for name in attributes
+                if name in remote_object)
+        return remote_objects_data
+
+    def _call_list_endpoint(self, remote_field, params, pks, background):
+        """
+        Call the 'list' endpoint of a field with some parameters, retrieving
+        all its pages if it is paginated, and return the remote objects.
+        """
+        pagination = remote_field.pagination
+        if pagination is None:
+            return self._call_endpoint(
+                remote_field, 'list', params, background=background)
+        return pagination.fetch(
+            partial(self._call_endpoint, remote_field, 'list',
+                    background=background),
+            params, remote_field, pks)
+
     def _add_remote_fields_to_obj(self, data):
         """
         Add every remote field data to an object.
@@ -165,27 +987,202 @@ class RemoteFieldsModelSerializerMixin(object):
             - If the pk to retrieve remote data does not exist,
               the resulting field be null.
         """
-        for local_field_name, remote_field in self.get_remote_fields():
-            detail_endpoint = remote_field.endpoints['detail']
+        self._resolve_remote_groups([
+            (self.__class__, local_field_name, remote_field, [data], False)
+            for local_field_name, remote_field in self.get_remote_fields()])
+        return data
 
-            if (local_field_name in data and
-                    isinstance(data[remote_field.source], dict)):
-                data[local_field_name] = data[remote_field.source]
-                continue
+    def _add_remote_field_to_obj(self, local_field_name, remote_field, data):
+        if isinstance(data.get(local_field_name), dict):
+            return
 
-            try:
-                pk = data[remote_field.source]
-                if pk is None:
-                    data[local_field_name] = None
-                else:
-                    remote_object = detail_endpoint(pk=pk)
+        try:
+            pk = data[local_field_name]
+            if pk is None:
+                data[local_field_name] = None
+            else:
+                remote_object = self._get_remote_object(remote_field, pk)
 
-                    data[local_field_name] = self._fill_remote_field(
-                        remote_field, remote_object)
+                data[local_field_name] = self._fill_remote_field(
+                    remote_field, remote_object)
 
-            except (KeyError, ValueError):
-                data[local_field_name] = None
-        return data
+        except RemoteUnavailable as e:
+            data[local_field_name] = remote_field.placeholder
+            self._record_unavailable(e)
+        except (KeyError, ValueError):
+            data[local_field_name] = None
+            record('missing')
+
+    def _get_remote_object(self, remote_field, pk):
+        """
+        Retrieve a remote object of a field using its 'detail' endpoint.
+
+        It raises KeyError or ValueError if the remote object can not be
+        retrieved.
+
+            - Remote objects already retrieved while serializing the
+              current data will not be retrieved again.
+        """
+        record('pks')
+        identity_map = self._get_remote_identity_map()
+        remote_objects, missing_pks = identity_map.get_many(
+            remote_field, [pk])
+        if pk in missing_pks or pk in remote_objects:
+            record('identity_hits')
+        if pk in missing_pks:
+            raise KeyError(pk)
+        if pk in remote_objects:
+            return remote_objects[pk]
+
+        try:
+            remote_object = self._get_synced_remote_object(remote_field, pk)
+        except (KeyError, ValueError):
+            identity_map.set_many(remote_field, {}, [pk])
+            raise
+        identity_map.set_many(remote_field, {pk: remote_object})
+        return remote_object
+
+    def _get_synced_remote_object(self, remote_field, pk):
+        """
+        Retrieve a remote object of a field using its 'detail' endpoint,
+        unless the field is synchronized (check
+        `_get_synced_remote_objects`).
+        """
+        if remote_field.sync is None:
+            return self._get_snapshot_remote_object(remote_field, pk)
+        record('sync_hits')
+        return remote_field.sync.get_many(remote_field, [pk])[pk]
+
+    def _get_snapshot_remote_object(self, remote_field, pk):
+        """
+        Retrieve a remote object of a field using its 'detail' endpoint,
+        unless it is on the field snapshot (check
+        `_get_snapshot_remote_objects`).
+        """
+        snapshot = remote_field.snapshot
+        if snapshot is None:
+            return self._get_cached_remote_object(remote_field, pk)
+
+        remote_objects = snapshot.get_fresh_many(remote_field, [pk])
+        if pk in remote_objects:
+            record('snapshot_hits')
+            return remote_objects[pk]
+
+        try:
+            remote_object = self._get_cached_remote_object(remote_field, pk)
+        except RemoteUnavailable:
+            remote_objects = snapshot.get_many(remote_field, [pk])
+            if pk not in remote_objects:
+                raise
+            record('snapshot_hits')
+            return remote_objects[pk]
+        except RemoteNotFound:
+            snapshot.update({}, [pk])
+            raise
+        snapshot.update({pk: remote_object})
+        return remote_object
+
+    def _get_cached_remote_object(self, remote_field, pk):
+        """
+        Retrieve a remote object of a field using its 'detail' endpoint,
+        unless it is cached.
+
+        Only the pks the endpoint confirms do not exist (raising
+        RemoteNotFound) are cached as missing.
+        """
+        cache = self._get_remote_cache(remote_field)
+        if cache is None:
+            return self._call_endpoint(remote_field, 'detail', {'pk': pk})
+
+        remote_objects, missing_pks = self._get_cache_entries(
+            remote_field, cache, [pk], detail=True)
+        if pk in missing_pks or pk in remote_objects:
+            record('cache_hits')
+        if pk in missing_pks:
+            raise KeyError(pk)
+        if pk in remote_objects:
+            return remote_objects[pk]
+
+        try:
+            remote_object = self._call_endpoint(
+                remote_field, 'detail', {'pk': pk})
+        except RemoteNotFound:
+            cache.set_many({}, [pk])
+            raise
+        cache.set_many({pk: remote_object})
+        return remote_object
+
+    def _call_endpoint(self, remote_field, endpoint, params=None,
+                       background=False):
+        """
+        Call the 'list' or 'detail' endpoint of a field with some parameters.
+
+        It raises RemoteTimeout if the call does not answer before the field
+        `timeout` or the serializer deadline (unless it is a `background`
+        call), or CircuitOpen if the field `circuit_breaker` does not let it
+        through.
+
+        If the field has `conditional` requests, the response kept is
+        returned while the remote resource does not change.
+        """
+        timeout = remote_field.timeout
+        deadline = getattr(self, '_remote_deadline', None)
+        if deadline is not None and not background:
+            remaining = deadline - time.time()
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        if remote_field.projection_param is not None:
+            params = dict(params or {})
+            params[remote_field.projection_param] = ','.join(
+                self._get_remote_projection(remote_field, endpoint))
+        endpoint = remote_field.endpoints[endpoint]
+        func = endpoint
+        if remote_field.conditional is not None:
+            func = remote_field.conditional.wrap(endpoint)
+        breaker = remote_field.circuit_breaker
+        if breaker is None:
+            return self._call_with_timeout(func, timeout, params or {},
+                                           endpoint)
+        return breaker.call(endpoint, self._call_with_timeout,
+                            (func, timeout, params or {}, endpoint))
+
+    def _get_remote_attributes(self, remote_field):
+        """
+        Returns the set of remote attributes needed from the remote resource
+        of a field: its `remote_sources`, and the ones of the rest of fields
+        using the same remote resource.
+        """
+        attributes = set(remote_field.remote_sources)
+        projections = getattr(self, '_remote_projections', None)
+        if projections:
+            key = self._get_remote_identity_map().get_resource_key(
+                remote_field)
+            attributes.update(projections.get(key, ()))
+        return attributes
+
+    def _get_remote_projection(self, remote_field, endpoint):
+        """
+        Returns the sorted list of remote attributes requested from an
+        endpoint of a field, including the `remote_key` used to index the
+        results of the 'list' endpoint, and the `deleted_key` of the
+        tombstones of synchronized fields (check RemoteSync).
+        """
+        projection = self._get_remote_attributes(remote_field)
+        if endpoint == 'list':
+            projection.update(remote_field.get_remote_key_attributes())
+            if remote_field.sync is not None:
+                projection.add(remote_field.sync.deleted_key)
+        return sorted(projection)
+
+    def _call_with_timeout(self, endpoint, timeout, params, key=None):
+        record('calls')
+        return get_data(call_with_timeout(
+            timeout, bind(endpoint), kwargs=params, key=key))
+
+    def _record_unavailable(self, error):
+        if isinstance(error, RemoteTimeout):
+            record('timeouts')
+        else:
+            record('rejected')
 
     def _fill_remote_field(self, remote_field, remote_object):
         if remote_field.flat:
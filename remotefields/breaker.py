@@ -0,0 +1,171 @@
+import threading
+import time
+from collections import deque
+
+try:
+    from httplib import HTTPException
+except ImportError:
+    from http.client import HTTPException
+
+from executor import RemoteUnavailable
+
+
+# Errors of the connections with the remote services (socket errors are
+# IOErrors)
+CONNECTION_ERRORS = (IOError, HTTPException)
+
+
+class CircuitOpen(RemoteUnavailable):
+    """
+    The circuit of a remote endpoint is open, so it was not called.
+    """
+
+
+class Circuit(object):
+    """
+    State of the circuit of a single endpoint.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, window_size):
+        self.state = self.CLOSED
+        self.outcomes = deque(maxlen=window_size)
+        self.opened_at = None
+        self.probing = False
+
+
+class CircuitBreaker(object):
+    """
+    Stop calling the remote endpoints which keep failing, so they can not
+    keep the threads serving the requests waiting for them.
+
+    Every endpoint has its own circuit:
+
+        - While it is closed, endpoints are called and the outcome of the
+          last `window_size` calls is recorded. Once there are at least
+          `min_calls` of them and the rate of failures reaches
+          `failure_rate`, the circuit opens.
+        - While it is open, calls fail immediately raising CircuitOpen, for
+          `open_interval` seconds.
+        - Then it is half open: a single call at a time is let through as a
+          probe. The circuit closes if it succeeds, or opens again if it
+          fails.
+
+    Calls raising RemoteUnavailable (e.g. not answering on time) or any of
+    the `exceptions` count as failures. By default, those are the
+    connection errors, so the errors for objects which do not exist
+    (KeyError or ValueError) do not open the circuit.
+
+    A single breaker can be shared by all the RemoteFields calling the same
+    remote service:
+
+        things_breaker = CircuitBreaker(failure_rate=0.5, open_interval=30)
+
+        thing = RemoteField(
+            source='thing_id', remote_sources=('id', 'name',),
+            circuit_breaker=things_breaker,
+            endpoints={...}
+        )
+    """
+
+    def __init__(self, failure_rate=0.5, min_calls=10, window_size=20,
+                 open_interval=30, exceptions=CONNECTION_ERRORS):
+        """
+        :param failure_rate: Rate of failed calls (from 0 to 1) opening the
+                             circuit
+        :param min_calls: Minimum number of calls recorded before opening
+                          the circuit
+        :param window_size: Number of calls recorded
+        :param open_interval: Seconds the circuit stays open before probing
+                              the endpoint again
+        :param exceptions: Exceptions counting as failures
+        """
+        if not 0 < failure_rate <= 1:
+            raise ValueError('failure_rate must be between 0 and 1')
+        if not 0 < min_calls <= window_size:
+            raise ValueError('min_calls must be between 1 and window_size')
+
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window_size = window_size
+        self.open_interval = open_interval
+        self.exceptions = (RemoteUnavailable,) + tuple(exceptions)
+        self._circuits = {}
+        self._lock = threading.Lock()
+
+    def call(self, endpoint, func, args=(), kwargs=None):
+        """
+        Call `func` with some arguments through the circuit of `endpoint`
+        (the endpoint called by `func`) and return its result.
+
+        It raises CircuitOpen without calling it if the circuit is open.
+        """
+        circuit = self._before_call(endpoint)
+        try:
+            result = func(*args, **(kwargs or {}))
+        except self.exceptions:
+            self._after_call(circuit, False)
+            raise
+        except Exception:
+            self._after_call(circuit, True)
+            raise
+        self._after_call(circuit, True)
+        return result
+
+    def get_state(self, endpoint):
+        """
+        Returns the state of the circuit of an endpoint: 'closed', 'open' or
+        'half-open'.
+        """
+        with self._lock:
+            circuit = self._circuits.get(endpoint)
+            if circuit is None:
+                return Circuit.CLOSED
+            if circuit.state == Circuit.OPEN and self._can_probe(circuit):
+                return Circuit.HALF_OPEN
+            return circuit.state
+
+    def _can_probe(self, circuit):
+        return time.time() >= circuit.opened_at + self.open_interval
+
+    def _before_call(self, endpoint):
+        with self._lock:
+            circuit = self._circuits.get(endpoint)
+            if circuit is None:
+                circuit = self._circuits[endpoint] = Circuit(
+                    self.window_size)
+
+            if circuit.state == Circuit.OPEN:
+                if not self._can_probe(circuit):
+                    raise CircuitOpen()
+                circuit.state = Circuit.HALF_OPEN
+            if circuit.state == Circuit.HALF_OPEN:
+                if circuit.probing:
+                    raise CircuitOpen()
+                circuit.probing = True
+            return circuit
+
+    def _after_call(self, circuit, success):
+        with self._lock:
+            if circuit.state == Circuit.HALF_OPEN:
+                circuit.probing = False
+                if success:
+                    circuit.state = Circuit.CLOSED
+                    circuit.outcomes.clear()
+                else:
+                    self._open(circuit)
+            elif circuit.state == Circuit.CLOSED:
+                circuit.outcomes.append(success)
+                calls = len(circuit.outcomes)
+                failures = circuit.outcomes.count(False)
+                if (calls >= self.min_calls and
+                        failures >= self.failure_rate * calls):
+                    self._open(circuit)
+
+    def _open(self, circuit):
+        circuit.state = Circuit.OPEN
+        circuit.opened_at = time.time()
+        circuit.outcomes.clear()
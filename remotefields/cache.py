@@ -0,0 +1,195 @@
+import threading
+import time
+
+try:
+    from django.core.cache import caches
+
+    def get_cache(alias):
+        return caches[alias]
+except ImportError:
+    from django.core.cache import get_cache
+
+
+# Value stored for the pks known not to exist on the remote service
+MISSING = '<remotefields:missing>'
+
+# Default seconds to remember the pks known not to exist
+MISSING_TIMEOUT = 60
+
+
+class RemoteObjectCache(object):
+    """
+    Cache of the remote objects retrieved by a RemoteField, backed by any of
+    the backends configured on the `CACHES` setting.
+
+    Remote objects are stored using a key built from the field `cache_name`,
+    the `remote_sources` of the field and the remote pk, so fields
+    retrieving the same attributes from the same resource share entries.
+    Only the `remote_sources` of every remote object are stored.
+
+    The pks which do not exist on the remote service are cached too
+    (negative caching), using `cache_missing_timeout`.
+
+    If the field has a `cache_stale_timeout`, remote objects are stored
+    with their expiration time for `cache_timeout + cache_stale_timeout`
+    seconds, so they can be served once expired (check `get_many_stale`).
+    """
+
+    key_prefix = 'remotefields'
+
+    # Keys being refreshed in the background, shared by all the instances
+    _refreshing = set()
+    _refreshing_lock = threading.Lock()
+
+    def __init__(self, remote_field):
+        self.remote_field = remote_field
+        self.cache = get_cache(remote_field.cache_alias)
+
+    def make_key(self, pk):
+        return ':'.join((self.key_prefix,
+                         self.remote_field.cache_name,
+                         ','.join(self.remote_field.remote_sources),
+                         self.remote_field.format_remote_key(pk)))
+
+    def get_many(self, pks):
+        """
+        Returns a tuple (remote_objects, missing_pks) with the cached remote
+        objects, as a dict indexed by pk, and the set of cached pks which
+        are known not to exist.
+        """
+        remote_objects, missing_pks, _ = self.get_many_stale(pks)
+        return remote_objects, missing_pks
+
+    def get_many_stale(self, pks):
+        """
+        Returns a tuple (remote_objects, missing_pks, stale_pks) like
+        `get_many`, including the stale pks: the remote objects which
+        expired but can still be served.
+        """
+        keys = dict((self.make_key(pk), pk) for pk in pks)
+        remote_objects = {}
+        missing_pks = set()
+        stale_pks = set()
+        now = time.time()
+        for key, value in self.cache.get_many(list(keys)).items():
+            pk = keys[key]
+            if value == MISSING:
+                missing_pks.add(pk)
+            elif isinstance(value, tuple):
+                expires, remote_objects[pk] = value
+                if expires <= now:
+                    stale_pks.add(pk)
+            else:
+                remote_objects[pk] = value
+        return remote_objects, missing_pks, stale_pks
+
+    def set_many(self, remote_objects, missing_pks=()):
+        """
+        Store some remote objects, given as a dict indexed by pk, and the
+        pks which do not exist on the remote service.
+        """
+        remote_sources = self.remote_field.remote_sources
+        timeout = self.remote_field.cache_timeout
+        stale_timeout = self.remote_field.cache_stale_timeout
+        values = {}
+        for pk, remote_object in remote_objects.items():
+            try:
+                value = dict(
+                    (name, remote_object[name]) for name in remote_sources)
+            except KeyError:
+                continue
+            if stale_timeout is not None:
+                value = (time.time() + timeout, value)
+            values[self.make_key(pk)] = value
+        if values:
+            if stale_timeout is not None:
+                timeout += stale_timeout
+            self.cache.set_many(values, timeout)
+
+        missing_timeout = self.remote_field.cache_missing_timeout
+        if missing_timeout is None:
+            missing_timeout = min(MISSING_TIMEOUT,
+                                  self.remote_field.cache_timeout)
+        if missing_pks and missing_timeout:
+            self.cache.set_many(
+                dict((self.make_key(pk), MISSING) for pk in missing_pks),
+                missing_timeout)
+
+    def start_refresh(self, pks):
+        """
+        Returns the set of pks which are not being refreshed already, which
+        are marked as being refreshed until `finish_refresh` is called.
+        """
+        with self._refreshing_lock:
+            pks = set(pk for pk in pks
+                      if self.make_key(pk) not in self._refreshing)
+            self._refreshing.update(self.make_key(pk) for pk in pks)
+        return pks
+
+    def finish_refresh(self, pks):
+        with self._refreshing_lock:
+            self._refreshing.difference_update(
+                self.make_key(pk) for pk in pks)
+
+
+class RemoteIdentityMap(object):
+    """
+    Remote objects retrieved while serializing some data, so every remote
+    object is retrieved at most once, even if several RemoteFields or nested
+    serializers point to it.
+
+    Remote objects are indexed by remote resource and pk. A remote resource
+    is identified by the `cache_name` of the field or, if it is not given,
+    by its endpoints.
+
+    A new identity map is used on every evaluation of `data`, unless one is
+    given on the serializer context as 'remote_identity_map', which allows
+    sharing it across all the serializers used on a request.
+    """
+
+    def __init__(self):
+        self.resources = {}
+
+    def get_resource_key(self, remote_field):
+        if remote_field.cache_name:
+            return remote_field.cache_name
+        return tuple(sorted((kind, id(endpoint)) for kind, endpoint
+                            in remote_field.endpoints.items()))
+
+    def get_many(self, remote_field, pks):
+        """
+        Returns a tuple (remote_objects, missing_pks) with the known remote
+        objects containing all the `remote_sources` of the field, as a dict
+        indexed by pk, and the set of pks known not to exist.
+        """
+        resource = self.resources.get(self.get_resource_key(remote_field), {})
+        remote_objects = {}
+        missing_pks = set()
+        for pk in pks:
+            value = resource.get(pk)
+            if value is None:
+                continue
+            if value == MISSING:
+                missing_pks.add(pk)
+            elif all(name in value for name in remote_field.remote_sources):
+                remote_objects[pk] = value
+        return remote_objects, missing_pks
+
+    def set_many(self, remote_field, remote_objects, missing_pks=()):
+        """
+        Store some remote objects, given as a dict indexed by pk, and the
+        pks which could not be retrieved.
+
+        Attributes of an already known remote object are merged.
+        """
+        resource = self.resources.setdefault(
+            self.get_resource_key(remote_field), {})
+        for pk in missing_pks:
+            resource.setdefault(pk, MISSING)
+        for pk, remote_object in remote_objects.items():
+            known = resource.get(pk)
+            if isinstance(known, dict) and known is not remote_object:
+                known = dict(known)
+                known.update(remote_object)
+                remote_object = known
+            resource[pk] = remote_object
@@ -0,0 +1,122 @@
+import threading
+from collections import OrderedDict
+
+from metrics import record
+
+
+class NotModified(Exception):
+    """
+    Raised by an endpoint called with the validators of a previous response
+    (check ConditionalRequests) when the remote resource did not change,
+    e.g. when the remote service answers '304 Not Modified'.
+    """
+
+
+class RemoteResponse(object):
+    """
+    Response of an endpoint including the validators of the remote resource,
+    so it can be requested conditionally afterwards:
+
+        def endpoint_list(**params):
+            response = session.get(url, params=params)
+            return RemoteResponse(
+                response.json(), etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified'))
+
+    Endpoints can return the data straight away instead.
+    """
+
+    def __init__(self, data, etag=None, last_modified=None):
+        self.data = data
+        self.etag = etag
+        self.last_modified = last_modified
+
+
+def get_data(response):
+    """
+    Returns the data of the response of an endpoint.
+    """
+    if isinstance(response, RemoteResponse):
+        return response.data
+    return response
+
+
+class ConditionalRequests(object):
+    """
+    Keep the last response of the endpoints of a RemoteField, with its
+    validators, and request them conditionally, so unchanged remote
+    resources are neither transferred nor parsed again:
+
+        thing = RemoteField(
+            source='thing_id', remote_sources=('id', 'name',),
+            conditional=ConditionalRequests(max_entries=100),
+            endpoints={...}
+        )
+
+    Endpoints returning a RemoteResponse with an `etag` or a
+    `last_modified` are called again, with the same parameters, adding them
+    as `if_none_match` and `if_modified_since` (check `etag_param` and
+    `modified_param`). They can then raise NotModified, and the response
+    kept is returned instead.
+
+    Responses are kept for the last `max_entries` combinations of endpoint
+    and parameters, so it suits endpoints called with the same parameters
+    over and over (e.g. 'list' endpoints without `bulk_param`, or their
+    pages) better than filters by a changing set of pks.
+    """
+
+    etag_param = 'if_none_match'
+    modified_param = 'if_modified_since'
+
+    def __init__(self, max_entries=1000):
+        """
+        :param max_entries: Maximum number of responses kept
+        """
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def wrap(self, endpoint):
+        """
+        Returns a callable calling `endpoint` conditionally.
+        """
+        def conditional_endpoint(**params):
+            return self.call(endpoint, params)
+        return conditional_endpoint
+
+    def call(self, endpoint, params):
+        """
+        Call `endpoint` with a dict of parameters, conditionally if a
+        previous response with validators is kept, and return its data.
+        """
+        key = (endpoint, tuple(sorted(params.items())))
+        with self.lock:
+            entry = self.entries.get(key)
+        if entry is None:
+            response = endpoint(**params)
+        else:
+            etag, last_modified, data = entry
+            conditional_params = dict(params)
+            if etag is not None:
+                conditional_params[self.etag_param] = etag
+            if last_modified is not None:
+                conditional_params[self.modified_param] = last_modified
+            try:
+                response = endpoint(**conditional_params)
+            except NotModified:
+                record('not_modified')
+                with self.lock:
+                    if key in self.entries:
+                        self.entries[key] = self.entries.pop(key)
+                return data
+
+        if isinstance(response, RemoteResponse) and (
+                response.etag is not None or
+                response.last_modified is not None):
+            with self.lock:
+                self.entries.pop(key, None)
+                self.entries[key] = (response.etag, response.last_modified,
+                                     response.data)
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+        return get_data(response)
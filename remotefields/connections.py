@@ -0,0 +1,320 @@
+import json
+import socket
+import threading
+from string import Formatter
+
+try:
+    from httplib import HTTPConnection, HTTPException, HTTPSConnection
+    from urllib import quote, urlencode
+    from urlparse import urlparse
+except ImportError:
+    from http.client import HTTPConnection, HTTPException, HTTPSConnection
+    from urllib.parse import quote, urlencode, urlparse
+
+from django.conf import settings
+
+from conditional import ConditionalRequests, NotModified, RemoteResponse
+from executor import RemoteNotFound, RemoteServerError
+from metrics import record
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_pool_size():
+    """
+    Returns the number of idle connections kept open per host, from the
+    `REMOTE_FIELDS_POOL_SIZE` setting.
+    """
+    return getattr(settings, 'REMOTE_FIELDS_POOL_SIZE', 10)
+
+
+def get_max_per_host():
+    """
+    Returns the maximum number of concurrent requests per host, from the
+    `REMOTE_FIELDS_POOL_MAX_PER_HOST` setting. None means no limit.
+    """
+    return getattr(settings, 'REMOTE_FIELDS_POOL_MAX_PER_HOST', None)
+
+
+def get_connection_pool():
+    """
+    Returns the ConnectionPool shared by the HttpEndpoints not given one.
+    """
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = ConnectionPool()
+        return _default_pool
+
+
+class HostPool(object):
+    """
+    Persistent (keep-alive) connections to a single host.
+    """
+
+    def __init__(self, scheme, host, port, pool_size, max_concurrency,
+                 timeout):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.idle = []
+        self.in_use = 0
+        self.stats = dict((name, 0) for name in (
+            'requests', 'connections', 'reused', 'waits', 'errors'))
+        self.lock = threading.Lock()
+        self.semaphore = None
+        if max_concurrency is not None:
+            self.semaphore = threading.BoundedSemaphore(max_concurrency)
+
+    def request(self, method, path, headers):
+        """
+        Send a request and return a tuple (status, headers, body), with the
+        names of the headers in lower case.
+
+        Requests on connections which were idle are retried once on a new
+        connection if they fail, as the server may have closed them.
+        """
+        if self.semaphore is not None and \
+                not self.semaphore.acquire(False):
+            self._count('waits')
+            self.semaphore.acquire()
+        try:
+            self._count('requests')
+            connection, reused = self._get_connection()
+            try:
+                response = self._send(connection, method, path, headers)
+            except (socket.error, HTTPException):
+                connection.close()
+                if not reused:
+                    self._fail()
+                    raise
+                connection = self._new_connection()
+                try:
+                    response = self._send(connection, method, path, headers)
+                except (socket.error, HTTPException):
+                    connection.close()
+                    self._fail()
+                    raise
+            status, response_headers, body, keep_alive = response
+            self._release(connection, keep_alive)
+            return status, response_headers, body
+        finally:
+            if self.semaphore is not None:
+                self.semaphore.release()
+
+    def get_stats(self):
+        with self.lock:
+            stats = dict(self.stats)
+            stats.update(idle=len(self.idle), in_use=self.in_use)
+        return stats
+
+    def close(self):
+        with self.lock:
+            idle, self.idle = self.idle, []
+        for connection in idle:
+            connection.close()
+
+    def _send(self, connection, method, path, headers):
+        connection.request(method, path, headers=headers)
+        try:
+            # Python 2 reads the responses byte by byte unless buffered
+            response = connection.getresponse(buffering=True)
+        except TypeError:
+            response = connection.getresponse()
+        body = response.read()
+        response_headers = dict(
+            (name.lower(), value) for name, value in response.getheaders())
+        return response.status, response_headers, body, \
+            not response.will_close
+
+    def _get_connection(self):
+        with self.lock:
+            self.in_use += 1
+            if self.idle:
+                self.stats['reused'] += 1
+                return self.idle.pop(), True
+        return self._new_connection(), False
+
+    def _new_connection(self):
+        self._count('connections')
+        connection_class = HTTPSConnection if self.scheme == 'https' \
+            else HTTPConnection
+        return connection_class(self.host, self.port, timeout=self.timeout)
+
+    def _release(self, connection, keep_alive):
+        with self.lock:
+            self.in_use -= 1
+            if keep_alive and len(self.idle) < self.pool_size:
+                self.idle.append(connection)
+                return
+        connection.close()
+
+    def _fail(self):
+        with self.lock:
+            self.in_use -= 1
+            self.stats['errors'] += 1
+
+    def _count(self, name):
+        with self.lock:
+            self.stats[name] += 1
+
+
+class ConnectionPool(object):
+    """
+    Persistent (keep-alive) HTTP connections, grouped by host, reused by all
+    the HttpEndpoints sharing it, so remote calls do not open a new TCP (and
+    TLS) connection every time:
+
+        pool = ConnectionPool(pool_size=20, max_per_host=20, timeout=5)
+
+        thing = RemoteField(
+            source='thing_id', remote_sources=('id', 'name',),
+            endpoints={
+                'list': HttpEndpoint('https://things/api/things/', pool),
+                'detail': HttpEndpoint('https://things/api/things/{pk}/',
+                                       pool)
+            }
+        )
+
+    Up to `pool_size` idle connections are kept open per host, and at most
+    `max_per_host` requests are sent to every host at the same time (the
+    rest wait for one of them to finish). `get_stats` returns the number of
+    requests, new and reused connections, waits and errors per host.
+    """
+
+    def __init__(self, pool_size=None, max_per_host=None, timeout=None):
+        """
+        :param pool_size: Maximum number of idle connections kept per host.
+                          Defaults to the `REMOTE_FIELDS_POOL_SIZE` setting
+        :param max_per_host: Maximum number of concurrent requests per host.
+                             Defaults to the `REMOTE_FIELDS_POOL_MAX_PER_HOST`
+                             setting (no limit)
+        :param timeout: Seconds to wait for connecting and for every read
+        """
+        self.pool_size = get_pool_size() if pool_size is None else pool_size
+        self.max_per_host = (get_max_per_host() if max_per_host is None
+                             else max_per_host)
+        self.timeout = timeout
+        self.hosts = {}
+        self.lock = threading.Lock()
+
+    def request(self, method, url, headers=None):
+        """
+        Send a request and return a tuple (status, headers, body), with the
+        names of the headers in lower case.
+        """
+        parsed = urlparse(url)
+        path = parsed.path or '/'
+        if parsed.query:
+            path += '?' + parsed.query
+        return self.get_host_pool(parsed.scheme, parsed.hostname,
+                                  parsed.port).request(
+            method, path, headers or {})
+
+    def get_host_pool(self, scheme, host, port):
+        key = (scheme, host, port)
+        with self.lock:
+            if key not in self.hosts:
+                self.hosts[key] = HostPool(
+                    scheme, host, port, self.pool_size, self.max_per_host,
+                    self.timeout)
+            return self.hosts[key]
+
+    def get_stats(self):
+        """
+        Returns a dict mapping every host ('scheme://host:port') to a dict
+        with its `requests`, new `connections`, `reused` connections,
+        requests which had to wait (`waits`), `errors`, and the connections
+        currently `idle` and `in_use`.
+        """
+        with self.lock:
+            hosts = list(self.hosts.items())
+        stats = {}
+        for (scheme, host, port), host_pool in hosts:
+            name = '%s://%s' % (scheme, host)
+            if port is not None:
+                name += ':%s' % port
+            stats[name] = host_pool.get_stats()
+        return stats
+
+    def close(self):
+        """
+        Close the idle connections.
+        """
+        with self.lock:
+            hosts = list(self.hosts.values())
+        for host_pool in hosts:
+            host_pool.close()
+
+
+class HttpEndpoint(object):
+    """
+    Remote endpoint sending GET requests through a ConnectionPool (the one
+    shared by default, check `get_connection_pool`), and returning the
+    decoded JSON response.
+
+    Parameters named on the `url` (e.g. '/things/{pk}/') are formatted into
+    it, quoted, and the rest are sent on the query string. Unsuccessful
+    responses raise RemoteNotFound ('404 Not Found' and '410 Gone'),
+    RemoteServerError (5xx, so the fields are filled with their
+    `placeholder`) or ValueError (the rest).
+
+    The responses include their validators (check RemoteResponse), and
+    `if_none_match` and `if_modified_since` are sent as headers, so it can
+    be used with ConditionalRequests.
+    """
+
+    def __init__(self, url, pool=None, headers=None):
+        """
+        :param url: URL of the endpoint
+        :param pool: ConnectionPool to use
+        :param headers: Headers sent on every request
+        """
+        self.url = url
+        self.pool = pool
+        self.headers = headers or {}
+        self.url_params = set(
+            name for _, name, _, _ in Formatter().parse(url) if name)
+
+    def __call__(self, **params):
+        headers = dict(self.headers)
+        etag = params.pop(ConditionalRequests.etag_param, None)
+        if etag is not None:
+            headers['If-None-Match'] = etag
+        last_modified = params.pop(ConditionalRequests.modified_param, None)
+        if last_modified is not None:
+            headers['If-Modified-Since'] = last_modified
+
+        url = self.url.format(**dict(
+            (name, self.quote(params.pop(name))) for name in self.url_params))
+        if params:
+            url += '?' + urlencode(sorted(params.items()))
+
+        pool = self.pool or get_connection_pool()
+        status, response_headers, body = pool.request('GET', url, headers)
+        record('bytes', len(body))
+        if status == 304:
+            raise NotModified()
+        if status in (404, 410):
+            raise RemoteNotFound('%s: %s' % (url, status))
+        if status >= 500:
+            raise RemoteServerError('%s: %s' % (url, status))
+        if status >= 400:
+            raise ValueError('%s: %s' % (url, status))
+        return RemoteResponse(
+            json.loads(body.decode('utf-8')),
+            etag=response_headers.get('etag'),
+            last_modified=response_headers.get('last-modified'))
+
+    def quote(self, value):
+        """
+        Returns a parameter quoted to be formatted into the path of the URL,
+        including any '/'.
+        """
+        if not isinstance(value, bytes):
+            value = (u'%s' % (value,)).encode('utf-8')
+        return quote(value, safe='')
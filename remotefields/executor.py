@@ -0,0 +1,182 @@
+import threading
+from multiprocessing import TimeoutError
+from multiprocessing.pool import ThreadPool
+
+from django.conf import settings
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+# Keys given their own pool by `get_call_pool`
+_call_pool_keys = set()
+
+
+def get_max_workers(serializer_max_workers=None):
+    """
+    Returns the number of threads used to call the remote endpoints: the
+    one given by the serializer, or the `REMOTE_FIELDS_MAX_WORKERS` setting.
+
+    0 (the default) means the endpoints are called sequentially.
+    """
+    if serializer_max_workers is not None:
+        return serializer_max_workers
+    return getattr(settings, 'REMOTE_FIELDS_MAX_WORKERS', 0)
+
+
+def get_timeout(serializer_timeout=None):
+    """
+    Returns the seconds given to resolve the remote fields of every
+    evaluation of `data`: the ones given by the serializer, or the
+    `REMOTE_FIELDS_TIMEOUT` setting.
+
+    None (the default) means there is no time limit.
+    """
+    if serializer_timeout is not None:
+        return serializer_timeout
+    return getattr(settings, 'REMOTE_FIELDS_TIMEOUT', None)
+
+
+def get_async_workers():
+    """
+    Returns the number of threads used to resolve the data of the
+    serializers evaluated with `data_async`, from the
+    `REMOTE_FIELDS_ASYNC_WORKERS` setting.
+    """
+    return getattr(settings, 'REMOTE_FIELDS_ASYNC_WORKERS', 4)
+
+
+def get_call_workers():
+    """
+    Returns the number of threads used to call the remote endpoints with a
+    timeout, from the `REMOTE_FIELDS_CALL_WORKERS` setting.
+    """
+    return getattr(settings, 'REMOTE_FIELDS_CALL_WORKERS', 10)
+
+
+def get_call_pools():
+    """
+    Returns the maximum number of keys (e.g. remote endpoints) with their
+    own pool of threads calling them with a timeout, from the
+    `REMOTE_FIELDS_CALL_POOLS` setting.
+    """
+    return getattr(settings, 'REMOTE_FIELDS_CALL_POOLS', 10)
+
+
+def get_refresh_workers():
+    """
+    Returns the number of threads used to refresh the stale cached remote
+    objects in the background, from the `REMOTE_FIELDS_REFRESH_WORKERS`
+    setting.
+    """
+    return getattr(settings, 'REMOTE_FIELDS_REFRESH_WORKERS', 2)
+
+
+def get_pool(max_workers, name='fields'):
+    """
+    Returns the thread pool of the given name and size, shared by all the
+    serializers using it.
+
+    Tasks running on a pool must not wait for tasks on the same pool, so
+    every kind of task uses its own pool name.
+    """
+    with _pools_lock:
+        key = (name, max_workers)
+        if key not in _pools:
+            _pools[key] = ThreadPool(max_workers)
+        return _pools[key]
+
+
+def get_call_pool(key):
+    """
+    Returns the pool of threads calling the remote endpoints of a key with a
+    timeout.
+
+    The first `REMOTE_FIELDS_CALL_POOLS` keys get their own pool, and the
+    rest (or a None key) share a single one, so the number of threads is
+    bounded even if endpoints are created at runtime.
+    """
+    with _pools_lock:
+        if key is not None and key not in _call_pool_keys:
+            if len(_call_pool_keys) < get_call_pools():
+                _call_pool_keys.add(key)
+            else:
+                key = None
+    return get_pool(get_call_workers(), name=('calls', key))
+
+
+def run_concurrently(tasks, max_workers, name='fields'):
+    """
+    Run a list of callables using up to `max_workers` threads (from the pool
+    `name`) and return their results, in the same order.
+
+        - If `max_workers` is 0 or there is a single task, they will run
+          sequentially on the current thread.
+        - If any task raises an exception, the exception raised by the
+          first of them (in order) is re-raised once all of them finished.
+    """
+    if max_workers < 1 or len(tasks) < 2:
+        return [task() for task in tasks]
+
+    pool = get_pool(max_workers, name=name)
+    async_results = [pool.apply_async(task) for task in tasks]
+    for async_result in async_results:
+        async_result.wait()
+    return [async_result.get() for async_result in async_results]
+
+
+class RemoteUnavailable(Exception):
+    """
+    A remote endpoint could not be used, so the fields waiting for it are
+    filled with their `placeholder`.
+    """
+
+
+class RemoteNotFound(KeyError):
+    """
+    A remote object does not exist on the remote service (e.g. its 'detail'
+    endpoint answered '404 Not Found'), so the fields pointing to it are
+    filled with None and its pk can be cached as missing.
+
+    Other errors raised by the endpoints are not cached.
+    """
+
+
+class RemoteTimeout(RemoteUnavailable):
+    """
+    A remote endpoint did not answer on time.
+    """
+
+
+class RemoteServerError(RemoteUnavailable):
+    """
+    A remote endpoint failed (e.g. it answered '503 Service Unavailable').
+    """
+
+
+def call_with_timeout(timeout, func, args=(), kwargs=None, key=None):
+    """
+    Call `func` with some arguments and return its result, raising
+    RemoteTimeout if it does not finish in `timeout` seconds.
+
+        - If `timeout` is None, it is called on the current thread.
+        - Otherwise, it is called on a pool of threads (there are
+          `REMOTE_FIELDS_CALL_WORKERS` of them), so the current thread can
+          stop waiting for it. Calls which time out keep running on the pool
+          until they finish, but their results are discarded.
+
+    Every `key` (e.g. the endpoint called) has its own pool
+    (check `get_call_pool`), so calls which hang only hold up the calls
+    with the same key, and the rest are not queued behind them.
+    """
+    kwargs = kwargs or {}
+    if timeout is None:
+        return func(*args, **kwargs)
+    if timeout <= 0:
+        raise RemoteTimeout()
+
+    async_result = get_call_pool(key).apply_async(func, args, kwargs)
+    try:
+        return async_result.get(timeout)
+    except TimeoutError:
+        raise RemoteTimeout()
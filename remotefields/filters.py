@@ -0,0 +1,198 @@
+from rest_framework.filters import BaseFilterBackend
+
+from cache import RemoteIdentityMap
+from prefetch import RemotePrefetchedList, RemotePrefetcher
+
+
+class RemoteOrderedObjects(object):
+    """
+    Objects of a queryset in the order given by a list of pks.
+
+    Only the objects of the slices taken (e.g. the page being serialized)
+    are loaded from the database.
+    """
+
+    def __init__(self, queryset, pks, remote_identity_map=None):
+        self.queryset = queryset
+        self.pks = pks
+        self.remote_identity_map = remote_identity_map
+
+    def __len__(self):
+        return len(self.pks)
+
+    def count(self):
+        return len(self.pks)
+
+    def __iter__(self):
+        chunk_size = 500
+        for start in range(0, len(self.pks), chunk_size):
+            for obj in self[start:start + chunk_size]:
+                yield obj
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1 or None][0]
+        pks = self.pks[index]
+        objects = self.queryset.in_bulk(pks)
+        ret = RemotePrefetchedList(objects[pk] for pk in pks if pk in objects)
+        ret.remote_identity_map = self.remote_identity_map
+        return ret
+
+
+class RemoteFieldsFilter(BaseFilterBackend):
+    """
+    Filter backend ordering and filtering by the attributes of the remote
+    objects of the RemoteFields of the view serializer:
+
+        - `?ordering=thing.name,-other_thing.code` orders by the 'name' of
+          the remote objects of 'thing', and then by the 'code' of the ones
+          of 'other_thing', descending.
+        - `?thing.name=Something` keeps the objects whose remote object has
+          that name.
+
+    Flat RemoteFields are referenced just by their name (`?ordering=name`).
+    The remote attributes available are the `remote_sources` of every
+    field, and can be restricted with `remote_ordering_fields` and
+    `remote_filter_fields` on the view.
+
+    The remote objects are retrieved in bulk for the pks of all the objects
+    of the queryset (whose RemoteField sources must be model fields), and
+    only the page being serialized is loaded from the database. Remote
+    objects which can not be retrieved go last.
+
+    Views looking up a single object (their `kwargs` include the lookup
+    URL kwarg, e.g. the `get_object` of detail views) are neither ordered
+    nor filtered.
+
+    It returns a sequence instead of a queryset when there is something to
+    order or filter, so it must be the last filter backend. Other backends
+    (e.g. OrderingFilter, ordering by local fields) must run before it:
+    their ordering is kept for the objects with the same remote values.
+    """
+
+    ordering_param = 'ordering'
+
+    def filter_queryset(self, request, queryset, view):
+        if self.is_object_lookup(view):
+            return queryset
+        terms = self.get_remote_terms(view)
+        ordering = self.get_ordering(request, view, terms)
+        filters = self.get_filters(request, view, terms)
+        if not ordering and not filters:
+            return queryset
+
+        field_names = set(terms[term.lstrip('-')][0]
+                          for term in list(ordering) + list(filters))
+        declarations = dict(
+            view.get_serializer_class()._get_remote_declarations()[0])
+        remote_fields = [(field_name, declarations[field_name])
+                         for field_name in sorted(field_names)]
+
+        rows = list(queryset.values_list(
+            'pk', *[field.source for _, field in remote_fields]))
+        identity_map = RemoteIdentityMap()
+        values = self.get_remote_values(
+            request, remote_fields, rows, identity_map)
+
+        field_indexes = dict((field_name, index + 1) for index, (
+            field_name, _) in enumerate(remote_fields))
+
+        def get_value(row, term):
+            field_name, attribute = terms[term]
+            value = values[field_name].get(row[field_indexes[field_name]])
+            if attribute is not None and isinstance(value, dict):
+                value = value.get(attribute)
+            return value
+
+        for term, expected in filters.items():
+            rows = [row for row in rows
+                    if get_value(row, term) is not None and
+                    '%s' % (get_value(row, term),) == expected]
+
+        # Sorts are stable, so sorting by the last term first leaves the
+        # rows ordered by every term, and then by their previous order
+        for term in reversed(ordering):
+            reverse = term.startswith('-')
+            term = term.lstrip('-')
+            # Objects without remote value go last
+            keys = {}
+            for row in rows:
+                value = get_value(row, term)
+                if value is None:
+                    keys[row[0]] = (not reverse,)
+                else:
+                    keys[row[0]] = (reverse, value)
+            rows.sort(key=lambda row: keys[row[0]], reverse=reverse)
+
+        return RemoteOrderedObjects(queryset, [row[0] for row in rows],
+                                    identity_map)
+
+    def is_object_lookup(self, view):
+        """
+        Returns whether the view is looking up a single object by the URL
+        kwargs used by GenericAPIView.get_object.
+        """
+        kwargs = getattr(view, 'kwargs', None) or {}
+        lookup_field = getattr(view, 'lookup_field', 'pk')
+        url_kwargs = (getattr(view, 'lookup_url_kwarg', None) or lookup_field,
+                      getattr(view, 'pk_url_kwarg', 'pk'),
+                      getattr(view, 'slug_url_kwarg', 'slug'))
+        return any(kwargs.get(name) is not None for name in url_kwargs)
+
+    def get_remote_terms(self, view):
+        """
+        Returns a dict mapping every term which can be used to order or
+        filter to a tuple (field_name, attribute). The attribute is None for
+        flat fields.
+        """
+        terms = {}
+        remote_fields, _ = \
+            view.get_serializer_class()._get_remote_declarations()
+        for field_name, field in remote_fields:
+            if field.flat:
+                terms[field_name] = (field_name, None)
+            else:
+                for attribute in field.remote_sources:
+                    terms['%s.%s' % (field_name, attribute)] = (
+                        field_name, attribute)
+        return terms
+
+    def get_ordering(self, request, view, terms):
+        valid_terms = getattr(view, 'remote_ordering_fields', None) or terms
+        params = request.QUERY_PARAMS.get(self.ordering_param)
+        if not params:
+            return []
+        ordering = [param.strip() for param in params.split(',')]
+        return [term for term in ordering
+                if term.lstrip('-') in terms and
+                term.lstrip('-') in valid_terms]
+
+    def get_filters(self, request, view, terms):
+        valid_terms = getattr(view, 'remote_filter_fields', None) or terms
+        return dict((term, request.QUERY_PARAMS[term]) for term in terms
+                    if term in valid_terms and term in request.QUERY_PARAMS)
+
+    def get_remote_values(self, request, remote_fields, rows, identity_map):
+        """
+        Returns a dict mapping every field name to a dict with the value of
+        the field for every remote pk in `rows`.
+        """
+        groups = []
+        remote_pks = {}
+        for index, (field_name, remote_field) in enumerate(remote_fields):
+            remote_pks[field_name] = list(set(
+                row[index + 1] for row in rows
+                if row[index + 1] is not None))
+            remote_rows = [{field_name: remote_pk}
+                           for remote_pk in remote_pks[field_name]]
+            groups.append((RemotePrefetcher, field_name, remote_field,
+                           remote_rows, True))
+
+        RemotePrefetcher({'request': request}).prefetch(groups, identity_map)
+
+        # Every row was filled with the value of the field for its pk
+        return dict(
+            (field_name, dict(
+                (remote_pk, row[field_name]) for remote_pk, row in zip(
+                    remote_pks[field_name], remote_rows)))
+            for _, field_name, _, remote_rows, _ in groups)
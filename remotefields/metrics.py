@@ -0,0 +1,141 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+_local = threading.local()
+
+
+class RemoteFieldMetrics(object):
+    """
+    Metrics of the resolution of a RemoteField for a set of rows:
+
+        - `serializer_class` and `field_name`: where the field is declared.
+        - `endpoint`: 'detail' or 'list', the endpoint used.
+        - `rows`: number of rows filled.
+        - `pks`: number of remote pks looked up.
+        - `calls`: number of remote endpoint calls.
+        - `identity_hits`: pks served from the identity map.
+        - `cache_hits`: pks served from the cache.
+        - `stale_hits`: pks served from the cache once expired, while they
+          are refreshed in the background.
+        - `snapshot_hits`: pks served from the snapshot of the field.
+        - `sync_hits`: pks looked up on the synchronized table of the field.
+        - `not_modified`: remote calls answering that the remote resource
+          did not change, so the previous response was reused.
+        - `missing`: rows filled with None, because their remote object
+          could not be retrieved.
+        - `timeouts`: remote calls which did not answer on time, so their
+          rows were filled with the field `placeholder`.
+        - `rejected`: remote calls not made because their circuit was open,
+          so their rows were filled with the field `placeholder`.
+        - `bytes`: bytes received, when the endpoints report them (check
+          `record`).
+        - `duration`: seconds spent resolving the field.
+    """
+
+    counters = ('pks', 'calls', 'identity_hits', 'cache_hits', 'stale_hits',
+                'snapshot_hits', 'sync_hits', 'not_modified', 'missing',
+                'timeouts', 'rejected', 'bytes')
+
+    def __init__(self, serializer_class, field_name, remote_field, endpoint,
+                 rows):
+        self.serializer_class = serializer_class
+        self.field_name = field_name
+        self.remote_field = remote_field
+        self.endpoint = endpoint
+        self.rows = rows
+        self.duration = 0.0
+        for counter in self.counters:
+            setattr(self, counter, 0)
+
+    @property
+    def name(self):
+        return '%s.%s' % (self.serializer_class.__name__, self.field_name)
+
+    def as_dict(self):
+        ret = dict((counter, getattr(self, counter))
+                   for counter in self.counters)
+        ret.update(name=self.name, endpoint=self.endpoint, rows=self.rows,
+                   duration=self.duration)
+        return ret
+
+
+class RequestMetrics(object):
+    """
+    Metrics of all the RemoteFields resolved while processing a request.
+    """
+
+    def __init__(self):
+        self.fields = []
+        self.lock = threading.Lock()
+
+    def add(self, metrics):
+        with self.lock:
+            self.fields.append(metrics)
+
+    def total(self, counter):
+        return sum(getattr(metrics, counter) for metrics in self.fields)
+
+    def get_server_timing(self):
+        """
+        Returns the value of a `Server-Timing` header summarizing the
+        metrics: the total, followed by every field.
+        """
+        entries = ['remote-fields;dur=%.1f;desc="%d calls"' % (
+            self.total('duration') * 1000, self.total('calls'))]
+        for metrics in self.fields:
+            entries.append(
+                'remote-%s;dur=%.1f;desc="%s: %d calls, %d pks, '
+                '%d cache hits, %d missing, %d timeouts"' % (
+                    metrics.name, metrics.duration * 1000, metrics.endpoint,
+                    metrics.calls, metrics.pks, metrics.cache_hits,
+                    metrics.missing, metrics.timeouts))
+        return ', '.join(entries)
+
+
+@contextmanager
+def collect(metrics):
+    """
+    Collect the metrics recorded on the current thread into `metrics`,
+    measuring the time spent.
+    """
+    previous = getattr(_local, 'metrics', None)
+    _local.metrics = metrics
+    start = time.time()
+    try:
+        yield metrics
+    finally:
+        metrics.duration = time.time() - start
+        _local.metrics = previous
+
+
+def bind(func):
+    """
+    Returns a wrapper of `func` recording on the metrics being collected on
+    the current thread, so it can be called from a different thread.
+    """
+    metrics = getattr(_local, 'metrics', None)
+
+    def wrapper(*args, **kwargs):
+        previous = getattr(_local, 'metrics', None)
+        _local.metrics = metrics
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _local.metrics = previous
+    return wrapper
+
+
+def record(counter, value=1):
+    """
+    Add `value` to a counter of the RemoteFieldMetrics being collected on
+    the current thread, if any.
+
+    Remote endpoints can use it to report the bytes they receive:
+
+        record('bytes', len(response.content))
+    """
+    metrics = getattr(_local, 'metrics', None)
+    if metrics is not None:
+        setattr(metrics, counter, getattr(metrics, counter) + value)
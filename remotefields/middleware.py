@@ -0,0 +1,31 @@
+from django.dispatch import receiver
+
+from metrics import RequestMetrics
+from signals import remote_field_resolved
+
+
+class RemoteFieldsMetricsMiddleware(object):
+    """
+    Collect the metrics of the RemoteFields resolved while processing every
+    request, and summarize them on a `Server-Timing` response header.
+
+    The metrics are available on the request as `remote_fields_metrics`.
+    Serializers must receive the request on their context, as the Django
+    Rest Framework generic views do.
+    """
+
+    def process_request(self, request):
+        request.remote_fields_metrics = RequestMetrics()
+
+    def process_response(self, request, response):
+        metrics = getattr(request, 'remote_fields_metrics', None)
+        if metrics is not None and metrics.fields:
+            response['Server-Timing'] = metrics.get_server_timing()
+        return response
+
+
+@receiver(remote_field_resolved)
+def add_request_metrics(sender, metrics, request, **kwargs):
+    request_metrics = getattr(request, 'remote_fields_metrics', None)
+    if request_metrics is not None:
+        request_metrics.add(metrics)
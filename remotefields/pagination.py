@@ -0,0 +1,156 @@
+import math
+from functools import partial
+
+from executor import run_concurrently
+from metrics import bind
+
+
+class Pagination(object):
+    """
+    Base class of the paginations of 'list' endpoints returning their remote
+    objects in pages, as envelopes like:
+
+        {'count': 1000, 'next': '...', 'results': [...]}
+
+    The first page is retrieved first. Then:
+
+        - If the envelope includes the `count` of remote objects, the rest
+          of pages are retrieved concurrently, `max_workers` at a time.
+        - Otherwise, pages are retrieved one after the other while the
+          envelope has a `next` page (or, without `next`, while pages are
+          full).
+
+    Either way, no more pages are retrieved once all the remote objects
+    needed were found.
+    """
+
+    results_key = 'results'
+    count_key = 'count'
+    next_key = 'next'
+
+    def __init__(self, max_workers=4):
+        """
+        :param max_workers: Maximum number of pages retrieved concurrently
+        """
+        self.max_workers = max_workers
+
+    def get_page_params(self, index, page_size):
+        """
+        Returns the parameters requesting the page `index` (starting at 0),
+        given the `page_size` (the number of results of the first page).
+        """
+        raise NotImplementedError
+
+    def fetch(self, call, params, remote_field, pks=None):
+        """
+        Returns the list of remote objects of every page.
+
+        :param call: Callable calling the endpoint with a dict of parameters
+                     and returning the envelope of a page
+        :param params: Parameters sent on every call
+        :param remote_field: RemoteField retrieving the remote objects
+        :param pks: Remote pks needed. If None, every page is retrieved
+        """
+        pending = None if pks is None else set(pks)
+        response = call(self._get_params(params, 0, None))
+        remote_objects = self._add_results(
+            [], response, remote_field, pending)
+        page_size = len(remote_objects)
+        count = response.get(self.count_key)
+
+        if count is not None and page_size:
+            pages = list(range(
+                1, int(math.ceil(count / float(page_size)))))
+            for start in range(0, len(pages), self.max_workers):
+                if pending is not None and not pending:
+                    break
+                responses = run_concurrently(
+                    [partial(bind(call),
+                             self._get_params(params, index, page_size))
+                     for index in pages[start:start + self.max_workers]],
+                    self.max_workers, name='pages')
+                for response in responses:
+                    self._add_results(
+                        remote_objects, response, remote_field, pending)
+            return remote_objects
+
+        index = 0
+        while self._has_next(response, page_size) and \
+                (pending is None or pending):
+            index += 1
+            response = call(self._get_params(params, index, page_size))
+            self._add_results(remote_objects, response, remote_field, pending)
+        return remote_objects
+
+    def _get_params(self, params, index, page_size):
+        page_params = dict(params)
+        page_params.update(self.get_page_params(index, page_size))
+        return page_params
+
+    def _add_results(self, remote_objects, response, remote_field, pending):
+        results = response[self.results_key]
+        remote_objects.extend(results)
+        if pending:
+            pending.difference_update(
+                remote_field.get_remote_key(remote_object)
+                for remote_object in results)
+        return remote_objects
+
+    def _has_next(self, response, page_size):
+        if self.next_key in response:
+            return bool(response[self.next_key])
+        return len(response[self.results_key]) >= page_size > 0
+
+
+class PagePagination(Pagination):
+    """
+    Pagination requesting every page by its number, starting at 1:
+
+        thing = RemoteField(
+            source='thing_id', remote_sources=('id', 'name',),
+            pagination=PagePagination(page_param='page'),
+            endpoints={...}
+        )
+    """
+
+    def __init__(self, page_param='page', max_workers=4):
+        """
+        :param page_param: Name of the parameter with the page number
+        :param max_workers: Maximum number of pages retrieved concurrently
+        """
+        super(PagePagination, self).__init__(max_workers=max_workers)
+        self.page_param = page_param
+
+    def get_page_params(self, index, page_size):
+        return {self.page_param: index + 1}
+
+
+class LimitOffsetPagination(Pagination):
+    """
+    Pagination requesting every page by its offset, with a fixed `limit`:
+
+        thing = RemoteField(
+            source='thing_id', remote_sources=('id', 'name',),
+            pagination=LimitOffsetPagination(limit=500),
+            endpoints={...}
+        )
+    """
+
+    def __init__(self, limit=100, limit_param='limit',
+                 offset_param='offset', max_workers=4):
+        """
+        :param limit: Number of remote objects requested on every page
+        :param limit_param: Name of the parameter with the limit
+        :param offset_param: Name of the parameter with the offset
+        :param max_workers: Maximum number of pages retrieved concurrently
+        """
+        super(LimitOffsetPagination, self).__init__(max_workers=max_workers)
+        self.limit = limit
+        self.limit_param = limit_param
+        self.offset_param = offset_param
+
+    def get_page_params(self, index, page_size):
+        # Offsets follow the size of the pages returned, as the remote
+        # service may return less than `limit` remote objects per page
+        return {self.limit_param: self.limit,
+                self.offset_param: index * page_size if index else 0}
@@ -0,0 +1,83 @@
+from base import RemoteField, RemoteFieldsModelSerializerMixin
+from cache import RemoteIdentityMap
+
+
+class RemotePrefetchedList(list):
+    """
+    List of objects whose remote objects were retrieved by
+    `prefetch_remote`, kept on its `remote_identity_map`.
+    """
+
+    remote_identity_map = None
+
+
+class RemotePrefetcher(RemoteFieldsModelSerializerMixin):
+    """
+    Resolves the remote fields of some objects without a serializer.
+    """
+
+    def __init__(self, context=None):
+        self.context = context or {}
+        self.object = None
+
+    def prefetch(self, groups, identity_map):
+        """
+        Resolve a list of remote fields, given as tuples
+        (serializer_class, local_field_name, remote_field, rows, many),
+        storing the remote objects on `identity_map`.
+        """
+        self._remote_identity_map = identity_map
+        self._remote_deadline = self._get_remote_deadline()
+        try:
+            self._resolve_remote_groups(groups)
+        finally:
+            self._remote_identity_map = None
+            self._remote_deadline = None
+
+
+def prefetch_remote(objects, *fields, **kwargs):
+    """
+    Retrieve in bulk the remote objects pointed by some objects, analogous to
+    `prefetch_related`, so serializing them does not need any remote call:
+
+        things = prefetch_remote(MyModel.objects.all(), MySerializer)
+
+        MySerializer(things).data
+        MyOtherSerializer(things).data
+
+    Returns a list with the objects (evaluating them if they are a
+    queryset), which serializers extending RemoteFieldsModelSerializerMixin
+    recognise, reusing its remote objects. They are kept on its
+    `remote_identity_map`, which can be given on the serializer context as
+    'remote_identity_map' too.
+
+    :param objects: Queryset or iterable of objects
+    :param fields: RemoteFields (with their `source`) or serializer classes,
+                   whose RemoteFields (not the nested ones) are prefetched
+    :param context: Optional context, giving the 'remote_identity_map' to
+                    fill or the 'request' sent with the metrics
+    """
+    context = kwargs.pop('context', None) or {}
+    if kwargs:
+        raise TypeError('Unexpected arguments: %s' % ', '.join(kwargs))
+
+    objects = RemotePrefetchedList(objects)
+    objects.remote_identity_map = (context.get('remote_identity_map') or
+                                   RemoteIdentityMap())
+
+    remote_fields = []
+    for field in fields:
+        if isinstance(field, RemoteField):
+            remote_fields.append((field.source, field))
+        else:
+            remote_fields.extend(field._get_remote_declarations()[0])
+
+    groups = []
+    for field_name, remote_field in remote_fields:
+        rows = [{field_name: remote_field.field_to_native(obj, field_name)}
+                for obj in objects]
+        groups.append(
+            (RemotePrefetcher, field_name, remote_field, rows, True))
+
+    RemotePrefetcher(context).prefetch(groups, objects.remote_identity_map)
+    return objects
@@ -0,0 +1,6 @@
+from django.dispatch import Signal
+
+
+# Sent every time a RemoteField is resolved for a set of rows, with the
+# serializer class declaring the field as sender
+remote_field_resolved = Signal(providing_args=['metrics', 'request'])
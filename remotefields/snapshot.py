@@ -0,0 +1,248 @@
+import json
+import os
+import tempfile
+import threading
+import time
+
+from executor import get_pool, get_refresh_workers
+from prefetch import RemotePrefetcher
+
+
+class RemoteSnapshot(object):
+    """
+    Copy of the remote objects of a remote resource persisted on a file, so
+    workers start with them already known (instead of calling the remote
+    service for every one of them), and can keep serving them while the
+    remote service is unavailable:
+
+        thing = RemoteField(
+            source='thing_id', remote_sources=('id', 'name',),
+            snapshot=RemoteSnapshot('/var/cache/app/things.snapshot',
+                                    max_age=3600),
+            endpoints={...}
+        )
+
+    The remote objects of the snapshot are served for `max_age` seconds
+    since they were retrieved. Then they are retrieved again from the
+    remote service (or its cache) when needed, and updated on the snapshot,
+    which is saved to its file at most every `save_interval` seconds, on a
+    background thread (there are `REMOTE_FIELDS_REFRESH_WORKERS` of them).
+    Any remote objects retrieved by the field are added to it as well.
+
+    While the remote service is unavailable (the calls time out, or their
+    circuit is open), the remote objects of the snapshot are served however
+    old they are.
+
+    The file is loaded the first time the snapshot is used, or when `load`
+    is called (e.g. while the workers start). `refresh` replaces its
+    content with the whole remote collection.
+
+    The file is written atomically, as a header line followed by a line per
+    remote object: [pk, timestamp, remote_object], all of them in JSON. The
+    header includes the `version` of the format and the `timestamp` of the
+    last complete refresh. Files of other versions are ignored.
+
+    A single snapshot can be shared by all the RemoteFields retrieving
+    objects from the same remote resource.
+    """
+
+    version = 1
+
+    def __init__(self, path, max_age=3600, save_interval=60):
+        """
+        :param path: Path of the file
+        :param max_age: Seconds to serve the remote objects since they were
+                        retrieved. If 0, they are only served while the
+                        remote service is unavailable
+        :param save_interval: Minimum seconds between two writes of the file
+        """
+        self.path = path
+        self.max_age = max_age
+        self.save_interval = save_interval
+        self.timestamp = None
+        self.entries = None
+        self.saved_at = None
+        self.saving = False
+        self.save_pending = False
+        self.lock = threading.RLock()
+
+    def load(self):
+        """
+        Load the file, unless it was loaded already. Missing, unreadable or
+        outdated files leave the snapshot empty.
+        """
+        with self.lock:
+            if self.entries is not None:
+                return self
+            self.entries = {}
+            self.saved_at = time.time()
+            try:
+                with open(self.path) as snapshot_file:
+                    header = json.loads(next(snapshot_file))
+                    if header.get('version') != self.version:
+                        return self
+                    entries = {}
+                    for line in snapshot_file:
+                        pk, timestamp, remote_object = json.loads(line)
+                        entries[self._load_pk(pk)] = (timestamp,
+                                                      remote_object)
+            except (IOError, StopIteration, ValueError):
+                return self
+            self.timestamp = header.get('timestamp')
+            self.entries = entries
+        return self
+
+    def save(self):
+        """
+        Write the file, replacing the previous one atomically.
+
+        The remote objects are copied while holding the lock, and written
+        without it, so they keep being served meanwhile.
+        """
+        with self.lock:
+            self.load()
+            header = {'version': self.version, 'timestamp': self.timestamp}
+            entries = list(self.entries.items())
+        directory = os.path.dirname(os.path.abspath(self.path))
+        descriptor, temp_path = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(descriptor, 'w') as snapshot_file:
+                snapshot_file.write(json.dumps(header) + '\n')
+                for pk, (timestamp, remote_object) in entries:
+                    snapshot_file.write(json.dumps(
+                        [pk, timestamp, remote_object]) + '\n')
+            os.rename(temp_path, self.path)
+        except Exception:
+            os.remove(temp_path)
+            raise
+        with self.lock:
+            self.saved_at = time.time()
+
+    def get_many(self, remote_field, pks, max_age=None):
+        """
+        Returns the remote objects of the snapshot containing all the
+        `remote_sources` of the field, as a dict indexed by pk.
+
+        :param max_age: Maximum seconds since the remote objects were
+                        retrieved. If None, they are returned however old
+        """
+        self.load()
+        oldest = None if max_age is None else time.time() - max_age
+        remote_objects = {}
+        for pk in pks:
+            entry = self.entries.get(pk)
+            if entry is None:
+                continue
+            timestamp, remote_object = entry
+            if oldest is not None and timestamp <= oldest:
+                continue
+            if all(name in remote_object
+                   for name in remote_field.remote_sources):
+                remote_objects[pk] = remote_object
+        return remote_objects
+
+    def get_fresh_many(self, remote_field, pks):
+        """
+        Returns the remote objects of the snapshot which can be served
+        without calling the remote service, as a dict indexed by pk.
+        """
+        if not self.max_age:
+            return {}
+        return self.get_many(remote_field, pks, self.max_age)
+
+    def update(self, remote_objects, deleted_pks=(), timestamp=None):
+        """
+        Store some remote objects retrieved now, given as a dict indexed by
+        pk, and remove the pks which do not exist anymore. The file is saved
+        in the background if it was not saved for `save_interval` seconds.
+
+        :param timestamp: New `timestamp` of the snapshot, once it is a
+                          complete copy of the remote collection again
+                          (e.g. after a synchronization). The file is then
+                          saved in any case
+        """
+        now = time.time()
+        with self.lock:
+            self.load()
+            for pk, remote_object in remote_objects.items():
+                known = self.entries.get(pk)
+                if known is not None:
+                    remote_object = dict(known[1], **remote_object)
+                self.entries[pk] = (now, remote_object)
+            for pk in deleted_pks:
+                self.entries.pop(pk, None)
+            if timestamp is not None:
+                self.timestamp = timestamp
+            elif now - self.saved_at < self.save_interval:
+                return
+        self.save_in_background()
+
+    def refresh(self, remote_field):
+        """
+        Replace the remote objects of the snapshot with the whole remote
+        collection of a field, retrieved using its 'list' endpoint, and
+        save it.
+        """
+        prefetcher = RemotePrefetcher()
+        remote_objects = {}
+        for remote_object in prefetcher._call_list_endpoint(
+                remote_field, {}, None, True):
+            remote_objects[remote_field.get_remote_key(remote_object)] = \
+                remote_object
+        self.replace(remote_objects, time.time())
+
+    def replace(self, remote_objects, timestamp, background=False):
+        """
+        Replace the remote objects of the snapshot with a complete copy of
+        the remote collection, given as a dict indexed by pk, retrieved at
+        `timestamp`, and save it (in the background, if `background`).
+        """
+        with self.lock:
+            self.load()
+            self.entries = dict(
+                (pk, (timestamp, remote_object))
+                for pk, remote_object in remote_objects.items())
+            self.timestamp = timestamp
+        if background:
+            self.save_in_background()
+        else:
+            self.save()
+
+    def save_in_background(self):
+        """
+        Save the file on a background thread (there are
+        `REMOTE_FIELDS_REFRESH_WORKERS` of them). If it is being saved
+        already, it is saved again once it finishes.
+        """
+        with self.lock:
+            self.save_pending = True
+            if self.saving:
+                return
+            self.saving = True
+        get_pool(get_refresh_workers(), name='refresh').apply_async(
+            self._background_save)
+
+    def _background_save(self):
+        """
+        Errors are ignored, so the remote objects keep being served from
+        memory and the file is saved again after `save_interval` seconds.
+        """
+        while True:
+            with self.lock:
+                if not self.save_pending:
+                    self.saving = False
+                    return
+                self.save_pending = False
+            try:
+                self.save()
+            except Exception:
+                with self.lock:
+                    self.saved_at = time.time()
+                    self.saving = False
+                return
+
+    def _load_pk(self, pk):
+        # JSON has no tuples, composite keys are loaded as lists
+        if isinstance(pk, list):
+            return tuple(pk)
+        return pk
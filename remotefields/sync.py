@@ -0,0 +1,176 @@
+import threading
+import time
+from datetime import datetime
+
+from executor import get_pool, get_refresh_workers
+from prefetch import RemotePrefetcher
+
+
+class RemoteSync(object):
+    """
+    Local table with the whole remote collection of a RemoteField, kept up
+    to date by retrieving only the remote objects which changed since the
+    previous synchronization:
+
+        thing = RemoteField(
+            source='thing_id', remote_sources=('id', 'name',),
+            sync=RemoteSync(modified_since_param='modified_since',
+                            interval=60),
+            endpoints={...}
+        )
+
+    The first time the field is resolved, the whole remote collection is
+    retrieved from its 'list' endpoint (with all its pages, if it is
+    paginated). Then, once the table is older than `interval` seconds, the
+    'list' endpoint is called on a background thread (there are
+    `REMOTE_FIELDS_REFRESH_WORKERS` of them) with the time of the previous
+    synchronization, minus `overlap` seconds, as `modified_since_param`
+    (check `format_cursor`), while the current table keeps being served. It
+    must return the remote objects created, updated or deleted since then.
+
+    The time is taken from the local clock, so the `overlap` must cover the
+    clock skew with the remote service (and the delay of its changes to be
+    visible): the remote objects which changed within it are retrieved
+    again, but no change is missed.
+
+    Deleted remote objects (tombstones) are the ones whose `deleted_key`
+    attribute is true (check `is_deleted`), and are removed from the table.
+    Remote pks which are not on the table do not exist.
+
+    Given a `snapshot` (check RemoteSnapshot), the table is saved on it (in
+    the background) after every synchronization, and loaded from it the
+    first time, so only the changes since it was saved are retrieved.
+    """
+
+    def __init__(self, modified_since_param='modified_since', interval=60,
+                 deleted_key='deleted', snapshot=None, overlap=60):
+        """
+        :param modified_since_param: Name of the 'list' endpoint parameter
+                                     filtering the remote objects changed
+                                     since a given time
+        :param interval: Seconds between two synchronizations
+        :param deleted_key: Attribute of the deleted remote objects
+        :param snapshot: RemoteSnapshot persisting the table
+        :param overlap: Seconds requested again before the time of the
+                        previous synchronization
+        """
+        self.modified_since_param = modified_since_param
+        self.interval = interval
+        self.deleted_key = deleted_key
+        self.snapshot = snapshot
+        self.overlap = overlap
+        self.table = None
+        self.cursor = None
+        self.synced_at = None
+        self.syncing = False
+        self.lock = threading.Lock()
+        self.sync_lock = threading.RLock()
+
+    def get_many(self, remote_field, pks):
+        """
+        Returns the remote objects of the table for a set of pks, as a dict
+        indexed by pk. The table is loaded first if needed, and synchronized
+        in the background if it is older than `interval`.
+        """
+        if self.table is None:
+            with self.sync_lock:
+                if self.table is None:
+                    self.sync(remote_field)
+        elif time.time() - self.synced_at >= self.interval:
+            self._sync_in_background(remote_field)
+        with self.lock:
+            return dict((pk, self.table[pk]) for pk in pks
+                        if pk in self.table)
+
+    def sync(self, remote_field):
+        """
+        Retrieve the remote objects which changed since the previous
+        synchronization (or the whole remote collection, the first time)
+        and update the table.
+        """
+        with self.sync_lock:
+            if self.table is None and self.snapshot is not None:
+                self._load_snapshot()
+            start = time.time()
+            params = {}
+            if self.cursor is not None:
+                params[self.modified_since_param] = self.format_cursor(
+                    self.cursor - self.overlap)
+            remote_objects = RemotePrefetcher()._call_list_endpoint(
+                remote_field, params, None, True)
+
+            changed = {}
+            deleted_pks = set()
+            for remote_object in remote_objects:
+                pk = remote_field.get_remote_key(remote_object)
+                if self.is_deleted(remote_object):
+                    deleted_pks.add(pk)
+                    changed.pop(pk, None)
+                else:
+                    changed[pk] = remote_object
+                    deleted_pks.discard(pk)
+
+            with self.lock:
+                if self.cursor is None:
+                    self.table = {}
+                self.table.update(changed)
+                for pk in deleted_pks:
+                    self.table.pop(pk, None)
+                full = self.cursor is None
+                self.cursor = start
+                self.synced_at = time.time()
+
+            if self.snapshot is not None:
+                self._save_snapshot(full, changed, deleted_pks)
+
+    def format_cursor(self, timestamp):
+        """
+        Returns the value of `modified_since_param` for a timestamp: an ISO
+        8601 UTC datetime, truncated to seconds so changes are never missed.
+        """
+        return datetime.utcfromtimestamp(int(timestamp)).strftime(
+            '%Y-%m-%dT%H:%M:%SZ')
+
+    def is_deleted(self, remote_object):
+        return bool(remote_object.get(self.deleted_key))
+
+    def _sync_in_background(self, remote_field):
+        with self.lock:
+            if self.syncing:
+                return
+            self.syncing = True
+        get_pool(get_refresh_workers(), name='refresh').apply_async(
+            self._background_sync, (remote_field,))
+
+    def _background_sync(self, remote_field):
+        """
+        Errors are ignored, so the current table keeps being served and the
+        synchronization is retried after `interval` seconds.
+        """
+        try:
+            self.sync(remote_field)
+        except Exception:
+            with self.lock:
+                self.synced_at = time.time()
+        finally:
+            with self.lock:
+                self.syncing = False
+
+    def _load_snapshot(self):
+        snapshot = self.snapshot.load()
+        with snapshot.lock:
+            if snapshot.timestamp is None:
+                return
+            table = dict((pk, remote_object) for pk, (_, remote_object)
+                         in snapshot.entries.items())
+            cursor = snapshot.timestamp
+        with self.lock:
+            self.table = table
+            self.cursor = cursor
+            self.synced_at = cursor
+
+    def _save_snapshot(self, full, changed, deleted_pks):
+        if full:
+            self.snapshot.replace(changed, self.cursor, background=True)
+        else:
+            self.snapshot.update(changed, deleted_pks, timestamp=self.cursor)
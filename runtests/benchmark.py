@@ -0,0 +1,410 @@
+#!/usr/bin/env python
+
+# Measure how the serialization of RemoteFieldsModelSerializerMixin scales.
+#
+# A fake remote service is started on a local port, serving a collection of
+# remote objects with a configurable latency, and every scenario runs on its
+# own forked process so its peak memory can be measured. The 'in-process'
+# scenarios use plain functions as endpoints, so their time per row only
+# shows the overhead added by the serializers themselves.
+import argparse
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from multiprocessing import Process, Queue
+
+try:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urllib import urlencode
+    from urllib2 import HTTPError, urlopen
+    from urlparse import parse_qs, urlparse
+except ImportError:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.error import HTTPError
+    from urllib.parse import parse_qs, urlencode, urlparse
+    from urllib.request import urlopen
+
+# fix sys path so we don't need to setup PYTHONPATH
+sys.path.append(os.path.join(os.path.dirname(__file__), "../"))
+os.environ['DJANGO_SETTINGS_MODULE'] = 'runtests.settings'
+
+import django
+from django.core.management import call_command
+
+from remotefields import record
+
+
+class FakeRemoteService(ThreadingMixIn, HTTPServer):
+    """
+    Remote service serving `collection_size` remote objects:
+
+        /things/              List, filtered by `pk__in` if given
+        /things/detail/       Detail of the object given by `pk`
+        /stats/               Calls and bytes served since the last reset
+        /reset/               Reset the stats
+
+    Every list or detail call waits `latency` seconds before answering.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, collection_size, latency):
+        HTTPServer.__init__(self, address, FakeRemoteHandler)
+        self.collection_size = collection_size
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.calls = 0
+            self.bytes_sent = 0
+
+    def count(self, body):
+        with self.lock:
+            self.calls += 1
+            self.bytes_sent += len(body)
+
+    def get_thing(self, pk):
+        if not 1 <= pk <= self.collection_size:
+            return None
+        return {'id': pk, 'name': 'Name %d' % pk,
+                'description': 'Description of the thing %d' % pk}
+
+
+class FakeRemoteHandler(BaseHTTPRequestHandler):
+    # Keep connections alive for the clients reusing them, without delaying
+    # the last segment of the responses
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = dict((key, values[0])
+                      for key, values in parse_qs(url.query).items())
+        service = self.server
+
+        if url.path == '/stats/':
+            return self.send_json({'calls': service.calls,
+                                   'bytes': service.bytes_sent})
+        if url.path == '/reset/':
+            service.reset()
+            return self.send_json({})
+
+        time.sleep(service.latency)
+        if url.path == '/things/':
+            if 'pk__in' in params:
+                pks = [int(pk) for pk in params['pk__in'].split(',')]
+            else:
+                pks = range(1, service.collection_size + 1)
+            things = [service.get_thing(pk) for pk in pks]
+            body = self.send_json([thing for thing in things if thing])
+        elif url.path == '/things/detail/':
+            thing = service.get_thing(int(params['pk']))
+            if thing is None:
+                body = self.send_json({'detail': 'Not found'}, status=404)
+            else:
+                body = self.send_json(thing)
+        else:
+            body = self.send_json({'detail': 'Not found'}, status=404)
+        service.count(body)
+
+    def send_json(self, data, status=200):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        return body
+
+    def log_message(self, *args):
+        pass
+
+
+class Endpoint(object):
+    """
+    Remote endpoint called with query parameters, returning the decoded
+    JSON response and raising ValueError on errors, as rest_client does.
+    """
+
+    def __init__(self, url):
+        self.url = url
+
+    def __call__(self, **params):
+        url = self.url
+        if params:
+            url += '?' + urlencode(params)
+        try:
+            response = urlopen(url)
+        except HTTPError as e:
+            raise ValueError('%s: %s' % (url, e))
+        body = response.read()
+        record('bytes', len(body))
+        return json.loads(body.decode('utf-8'))
+
+
+def get_local_thing(pk):
+    return {'id': pk, 'name': 'Name %d' % pk,
+            'description': 'Description of the thing %d' % pk}
+
+
+def local_list(pk__in, **params):
+    return [get_local_thing(int(pk)) for pk in pk__in.split(',')]
+
+
+def local_detail(pk, **params):
+    return get_local_thing(int(pk))
+
+
+def serve(queue, collection_size, latency):
+    service = FakeRemoteService(('127.0.0.1', 0), collection_size, latency)
+    queue.put(service.server_address[1])
+    service.serve_forever()
+
+
+def start_service(collection_size, latency):
+    queue = Queue()
+    process = Process(target=serve, args=(queue, collection_size, latency))
+    process.daemon = True
+    process.start()
+    return process, 'http://127.0.0.1:%d/' % queue.get()
+
+
+def get_scenarios(base_url, sizes):
+    from rest_framework import serializers
+    from remotefields import (ConnectionPool, HttpEndpoint,
+                              RemoteFieldsModelSerializerMixin, RemoteField)
+    from tests.models import ModelForTest, ParentModelForTest
+
+    endpoints = {'list': Endpoint(base_url + 'things/'),
+                 'detail': Endpoint(base_url + 'things/detail/')}
+    pool = ConnectionPool()
+    pooled_endpoints = {
+        'list': HttpEndpoint(base_url + 'things/', pool),
+        'detail': HttpEndpoint(base_url + 'things/detail/', pool)}
+    local_endpoints = {'list': local_list, 'detail': local_detail}
+
+    class FlatSerializer(RemoteFieldsModelSerializerMixin,
+                         serializers.ModelSerializer):
+        thing = RemoteField(
+            source='thing_id', remote_sources=('name',), flat=True,
+            endpoints=endpoints
+        )
+
+        class Meta:
+            model = ModelForTest
+            fields = ('id', 'thing')
+
+    class BulkSerializer(RemoteFieldsModelSerializerMixin,
+                         serializers.ModelSerializer):
+        thing = RemoteField(
+            source='thing_id', remote_sources=('id', 'name',),
+            bulk_param='pk__in', endpoints=endpoints
+        )
+
+        class Meta:
+            model = ModelForTest
+            fields = ('id', 'thing')
+
+    class SharedSerializer(RemoteFieldsModelSerializerMixin,
+                           serializers.ModelSerializer):
+        thing = RemoteField(
+            source='thing_id', remote_sources=('id', 'name',),
+            bulk_param='pk__in', share_values=True, endpoints=endpoints
+        )
+
+        class Meta:
+            model = ModelForTest
+            fields = ('id', 'thing')
+
+    class PooledSerializer(RemoteFieldsModelSerializerMixin,
+                           serializers.ModelSerializer):
+        thing = RemoteField(
+            source='thing_id', remote_sources=('id', 'name',),
+            bulk_param='pk__in', endpoints=pooled_endpoints
+        )
+
+        class Meta:
+            model = ModelForTest
+            fields = ('id', 'thing')
+
+    class LocalSerializer(RemoteFieldsModelSerializerMixin,
+                          serializers.ModelSerializer):
+        thing = RemoteField(
+            source='thing_id', remote_sources=('id', 'name',),
+            bulk_param='pk__in', endpoints=local_endpoints
+        )
+
+        class Meta:
+            model = ModelForTest
+            fields = ('id', 'thing')
+
+    class NestedSerializer(RemoteFieldsModelSerializerMixin,
+                           serializers.ModelSerializer):
+        test_instance = BulkSerializer()
+
+        class Meta:
+            model = ParentModelForTest
+            fields = ('id', 'test_instance')
+
+    class NestedManySerializer(RemoteFieldsModelSerializerMixin,
+                               serializers.ModelSerializer):
+        test_instances = BulkSerializer(many=True)
+
+        class Meta:
+            model = ParentModelForTest
+            fields = ('id', 'test_instances')
+
+    class LocalNestedSerializer(RemoteFieldsModelSerializerMixin,
+                                serializers.ModelSerializer):
+        test_instance = LocalSerializer()
+
+        class Meta:
+            model = ParentModelForTest
+            fields = ('id', 'test_instance')
+
+    def children(rows):
+        return ModelForTest.objects.order_by('id')[:rows]
+
+    def parents(rows):
+        return ParentModelForTest.objects.select_related(
+            'test_instance').order_by('id')[:rows]
+
+    scenarios = [
+        ('single object', 1,
+         lambda rows: FlatSerializer(children(rows)[0]).data),
+    ]
+    for rows in sizes:
+        scenarios += [
+            ('flat', rows,
+             lambda rows: FlatSerializer(children(rows), many=True).data),
+            ('flat bulk', rows,
+             lambda rows: BulkSerializer(children(rows), many=True).data),
+            ('shared bulk', rows,
+             lambda rows: SharedSerializer(children(rows), many=True).data),
+            ('pooled bulk', rows,
+             lambda rows: PooledSerializer(children(rows), many=True).data),
+            ('nested', rows,
+             lambda rows: NestedSerializer(parents(rows), many=True).data),
+            ('nested many', rows,
+             lambda rows: NestedManySerializer(
+                 parents(rows), many=True).data),
+            ('streaming bulk', rows,
+             lambda rows: [row for row in BulkSerializer(
+                 children(rows), many=True).iter_data()][-1]),
+            ('in-process bulk', rows,
+             lambda rows: LocalSerializer(children(rows), many=True).data),
+            ('in-process nested', rows,
+             lambda rows: LocalNestedSerializer(
+                 parents(rows), many=True).data),
+        ]
+    return scenarios
+
+
+def create_rows(rows, collection_size):
+    from tests.models import ModelForTest, ParentModelForTest
+
+    ModelForTest.objects.bulk_create(
+        [ModelForTest(thing_id=i % collection_size + 1) for i in range(rows)],
+        batch_size=500)
+    ParentModelForTest.objects.bulk_create(
+        [ParentModelForTest(id=i, test_instance_id=i)
+         for i in range(1, rows + 1)],
+        batch_size=500)
+    through = ParentModelForTest.test_instances.through
+    through.objects.bulk_create(
+        [through(parentmodelfortest_id=i, modelfortest_id=i)
+         for i in range(1, rows + 1)],
+        batch_size=500)
+
+
+def get_max_rss():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def measure(base_url, scenario, rows):
+    """
+    Run a scenario on a forked process and return its results as a dict
+    with 'time' (seconds), 'calls', 'bytes' and 'memory' (peak KB).
+    """
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        Endpoint(base_url + 'reset/')()
+        start_rss = get_max_rss()
+        start = time.time()
+        scenario(rows)
+        results = {'time': time.time() - start,
+                   'memory': get_max_rss() - start_rss}
+        results.update(Endpoint(base_url + 'stats/')())
+        os.write(write_fd, json.dumps(results).encode('utf-8'))
+        os._exit(0)
+
+    os.close(write_fd)
+    output = b''
+    while True:
+        chunk = os.read(read_fd, 4096)
+        if not chunk:
+            break
+        output += chunk
+    os.close(read_fd)
+    os.waitpid(pid, 0)
+    return json.loads(output.decode('utf-8'))
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(
+        description='Benchmark RemoteFieldsModelSerializerMixin against a '
+                    'local fake remote service.')
+    parser.add_argument(
+        '--rows', default='10,1000,100000',
+        help='Comma separated sizes of the serialized querysets')
+    parser.add_argument(
+        '--collection', type=int, default=10000,
+        help='Number of objects of the remote collection')
+    parser.add_argument(
+        '--latency', type=float, default=20,
+        help='Latency of every remote call, in milliseconds')
+    parser.add_argument(
+        '--filter', default='',
+        help='Only run the scenarios containing this text')
+    return parser
+
+
+def main():
+    args = get_parser().parse_args()
+    sizes = [int(size) for size in args.rows.split(',')]
+
+    try:
+        django.setup()
+    except AttributeError:
+        pass
+    import tests.models  # NOQA
+    call_command('syncdb', interactive=False, verbosity=0)
+    create_rows(max(sizes), args.collection)
+
+    process, base_url = start_service(args.collection, args.latency / 1000.0)
+    try:
+        print('%-17s %8s %10s %9s %8s %12s %10s' % (
+            'scenario', 'rows', 'time (ms)', 'us/row', 'calls', 'bytes',
+            'peak (KB)'))
+        for name, rows, scenario in get_scenarios(base_url, sizes):
+            if args.filter not in name:
+                continue
+            results = measure(base_url, scenario, rows)
+            print('%-17s %8d %10.1f %9.1f %8d %12d %10d' % (
+                name, rows, results['time'] * 1000,
+                results['time'] * 1000000 / rows, results['calls'],
+                results['bytes'], results['memory']))
+    finally:
+        process.terminate()
+
+if __name__ == '__main__':
+    main()
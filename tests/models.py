@@ -4,6 +4,10 @@ from django.db import models
 class ModelForTest(models.Model):
     thing_id = models.IntegerField()
 
+    @property
+    def thing_key(self):
+        return ('thing', self.thing_id)
+
 
 class ParentModelForTest(models.Model):
     test_instance = models.ForeignKey(ModelForTest)
@@ -0,0 +1,146 @@
+import mock
+import time
+from unittest import TestCase
+
+from rest_framework import serializers
+
+from remotefields import (RemoteFieldsModelSerializerMixin, RemoteField,
+                          CircuitBreaker, CircuitOpen)
+from tests.models import ModelForTest
+
+
+detail_endpoint = mock.Mock()
+breaker = CircuitBreaker(failure_rate=0.5, min_calls=2, window_size=4,
+                         open_interval=60, exceptions=(IOError,))
+
+
+class BreakerTestSerializer(RemoteFieldsModelSerializerMixin,
+                            serializers.ModelSerializer):
+    thing = RemoteField(
+        source='thing_id', remote_sources=('name',), flat=True,
+        placeholder='Unavailable', circuit_breaker=breaker,
+        endpoints={'list': mock.Mock(), 'detail': detail_endpoint}
+    )
+
+    class Meta:
+        model = ModelForTest
+        fields = ('id', 'thing')
+
+
+class CircuitBreakerTest(TestCase):
+
+    def setUp(self):
+        super(CircuitBreakerTest, self).setUp()
+        self.breaker = CircuitBreaker(failure_rate=0.5, min_calls=2,
+                                      window_size=4, open_interval=60,
+                                      exceptions=(IOError,))
+        self.endpoint = mock.Mock(side_effect=IOError())
+
+    def call(self):
+        return self.breaker.call(self.endpoint, self.endpoint)
+
+    def test_circuit_opens(self):
+        """
+        Call a failing endpoint until the failure rate is reached and check
+        it is not called any more
+        """
+        for _ in range(2):
+            self.assertRaises(IOError, self.call)
+        self.assertEqual(self.breaker.get_state(self.endpoint), 'open')
+
+        self.assertRaises(CircuitOpen, self.call)
+        self.assertEqual(self.endpoint.call_count, 2)
+
+    def test_missing_objects_are_not_failures_by_default(self):
+        """
+        Call an endpoint raising the errors of missing objects through a
+        breaker with the default exceptions, and check only the connection
+        errors open the circuit
+        """
+        self.breaker = CircuitBreaker(min_calls=2, window_size=4)
+        for side_effect in (KeyError(), ValueError(), KeyError()):
+            self.endpoint.side_effect = side_effect
+            self.assertRaises(type(side_effect), self.call)
+        self.assertEqual(self.breaker.get_state(self.endpoint), 'closed')
+
+        self.endpoint.side_effect = IOError()
+        for _ in range(2):
+            self.assertRaises(IOError, self.call)
+        self.assertEqual(self.breaker.get_state(self.endpoint), 'open')
+
+    def test_other_exceptions_are_not_failures(self):
+        """
+        Call an endpoint raising an exception not counting as a failure and
+        check the circuit stays closed
+        """
+        self.endpoint.side_effect = KeyError()
+
+        for _ in range(4):
+            self.assertRaises(KeyError, self.call)
+        self.assertEqual(self.breaker.get_state(self.endpoint), 'closed')
+
+    @mock.patch('remotefields.breaker.time')
+    def test_half_open_probe(self, time_mock):
+        """
+        Wait for the open interval of an open circuit and check a single
+        successful probe closes it again
+        """
+        time_mock.time.return_value = 1000
+        for _ in range(2):
+            self.assertRaises(IOError, self.call)
+
+        time_mock.time.return_value = 1060
+        self.assertEqual(self.breaker.get_state(self.endpoint), 'half-open')
+        self.endpoint.side_effect = None
+        self.endpoint.return_value = 'ok'
+
+        self.assertEqual(self.call(), 'ok')
+        self.assertEqual(self.breaker.get_state(self.endpoint), 'closed')
+
+    @mock.patch('remotefields.breaker.time')
+    def test_failed_probe_opens_again(self, time_mock):
+        """
+        Probe an endpoint which is still failing and check the circuit opens
+        for a whole open interval again
+        """
+        time_mock.time.return_value = 1000
+        for _ in range(2):
+            self.assertRaises(IOError, self.call)
+
+        time_mock.time.return_value = 1060
+        self.assertRaises(IOError, self.call)
+        self.assertEqual(self.breaker.get_state(self.endpoint), 'open')
+
+        time_mock.time.return_value = 1119
+        self.assertRaises(CircuitOpen, self.call)
+        self.assertEqual(self.endpoint.call_count, 3)
+
+
+class SerializerWithBreakerTest(TestCase):
+
+    def setUp(self):
+        super(SerializerWithBreakerTest, self).setUp()
+        detail_endpoint.reset_mock()
+        detail_endpoint.side_effect = IOError()
+        self.model_instance = ModelForTest.objects.create(thing_id=2001)
+
+    def tearDown(self):
+        super(SerializerWithBreakerTest, self).tearDown()
+        ModelForTest.objects.all().delete()
+
+    def test_open_circuit_uses_placeholder(self):
+        """
+        Serialize a model instance once the circuit of its remote endpoint
+        is open and check the field is filled with its placeholder without
+        calling the endpoint
+        """
+        for _ in range(2):
+            with self.assertRaises(IOError):
+                BreakerTestSerializer(self.model_instance).data
+
+        serializer = BreakerTestSerializer(self.model_instance)
+        start = time.time()
+
+        self.assertEqual(serializer.data, {'id': 1, 'thing': 'Unavailable'})
+        self.assertTrue(time.time() - start < 1)
+        self.assertEqual(detail_endpoint.call_count, 2)
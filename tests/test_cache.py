@@ -0,0 +1,309 @@
+import mock
+import time
+from unittest import TestCase
+
+from django.core.cache import cache
+from rest_framework import serializers
+
+from remotefields import (RemoteFieldsModelSerializerMixin, RemoteField,
+                          RemoteIdentityMap, RemoteNotFound)
+from tests.models import ModelForTest, ParentModelForTest
+
+
+list_endpoint = mock.Mock()
+detail_endpoint = mock.Mock()
+
+
+class CachedTestSerializer(RemoteFieldsModelSerializerMixin,
+                           serializers.ModelSerializer):
+    thing = RemoteField(
+        source='thing_id', remote_sources=('id', 'name',),
+        cache_name='things', cache_timeout=60,
+        endpoints={
+            'list': list_endpoint,
+            'detail': detail_endpoint
+        }
+    )
+
+    class Meta:
+        model = ModelForTest
+        fields = ('id', 'thing')
+
+
+class StaleTestSerializer(RemoteFieldsModelSerializerMixin,
+                          serializers.ModelSerializer):
+    thing = RemoteField(
+        source='thing_id', remote_sources=('id', 'name',),
+        cache_name='stale_things', cache_timeout=60, cache_stale_timeout=60,
+        endpoints={
+            'list': list_endpoint,
+            'detail': detail_endpoint
+        }
+    )
+
+    class Meta:
+        model = ModelForTest
+        fields = ('id', 'thing')
+
+
+class SharedEndpointsTestSerializer(RemoteFieldsModelSerializerMixin,
+                                    serializers.ModelSerializer):
+    thing = RemoteField(
+        source='thing_id', remote_sources=('id',),
+        endpoints={
+            'list': list_endpoint,
+            'detail': detail_endpoint
+        }
+    )
+    thing_name = RemoteField(
+        source='thing_id', remote_sources=('name',), flat=True,
+        endpoints={
+            'list': list_endpoint,
+            'detail': detail_endpoint
+        }
+    )
+
+    class Meta:
+        model = ModelForTest
+        fields = ('id', 'thing', 'thing_name')
+
+
+class ParentSharedEndpointsTestSerializer(RemoteFieldsModelSerializerMixin,
+                                          serializers.ModelSerializer):
+    test_instance = SharedEndpointsTestSerializer()
+    test_instances = SharedEndpointsTestSerializer(many=True)
+
+    class Meta:
+        model = ParentModelForTest
+        fields = ('id', 'test_instance', 'test_instances')
+
+
+class RemoteObjectCacheTest(TestCase):
+
+    def setUp(self):
+        super(RemoteObjectCacheTest, self).setUp()
+        list_endpoint.reset_mock()
+        list_endpoint.side_effect = None
+        list_endpoint.return_value = [
+            {'id': 2001, 'name': 'Name 1', 'extra': 'Not cached'},
+            {'id': 2002, 'name': 'Name 2', 'extra': 'Not cached'}
+        ]
+        detail_endpoint.reset_mock()
+        detail_endpoint.side_effect = None
+        detail_endpoint.return_value = {'id': 2001, 'name': 'Name 1'}
+
+    def tearDown(self):
+        super(RemoteObjectCacheTest, self).tearDown()
+        ModelForTest.objects.all().delete()
+        cache.clear()
+
+    def test_cached_model_instance(self):
+        """
+        Serialize a model instance twice and check the remote object is
+        retrieved only once
+        """
+        model_instance = ModelForTest.objects.create(thing_id=2001)
+        expected = {'id': 1, 'thing': {'id': 2001, 'name': 'Name 1'}}
+
+        self.assertEqual(CachedTestSerializer(model_instance).data, expected)
+        self.assertEqual(CachedTestSerializer(model_instance).data, expected)
+
+        detail_endpoint.assert_called_once_with(pk=2001)
+
+    def test_cached_missing_model_instance(self):
+        """
+        Check that the pks which do not exist are cached too
+        """
+        model_instance = ModelForTest.objects.create(thing_id=2009)
+        detail_endpoint.side_effect = RemoteNotFound(2009)
+        expected = {'id': 1, 'thing': None}
+
+        self.assertEqual(CachedTestSerializer(model_instance).data, expected)
+        self.assertEqual(CachedTestSerializer(model_instance).data, expected)
+
+        self.assertEqual(detail_endpoint.call_count, 1)
+
+    def test_failed_model_instance_is_not_cached(self):
+        """
+        Check that the pks which can not be retrieved because of other
+        errors (e.g. the remote service failing) are not cached
+        """
+        model_instance = ModelForTest.objects.create(thing_id=2001)
+        detail_endpoint.side_effect = ValueError
+        expected = {'id': 1, 'thing': None}
+
+        self.assertEqual(CachedTestSerializer(model_instance).data, expected)
+        detail_endpoint.side_effect = None
+
+        self.assertEqual(CachedTestSerializer(model_instance).data,
+                         {'id': 1, 'thing': {'id': 2001, 'name': 'Name 1'}})
+        self.assertEqual(detail_endpoint.call_count, 2)
+
+    def test_cached_queryset_fetches_only_misses(self):
+        """
+        Serialize a queryset after caching one of its remote objects and
+        check that it is not retrieved again
+        """
+        ModelForTest.objects.create(thing_id=2001)
+        CachedTestSerializer(ModelForTest.objects.get()).data
+        ModelForTest.objects.create(thing_id=2002)
+        ModelForTest.objects.create(thing_id=2009)
+        expected = [
+            {'id': 1, 'thing': {'id': 2001, 'name': 'Name 1'}},
+            {'id': 2, 'thing': {'id': 2002, 'name': 'Name 2'}},
+            {'id': 3, 'thing': None}
+        ]
+        list_endpoint.return_value = [
+            {'id': 2002, 'name': 'Name 2', 'extra': 'Not cached'}]
+
+        query = ModelForTest.objects.all()
+        self.assertEqual(CachedTestSerializer(query).data, expected)
+        self.assertEqual(CachedTestSerializer(query).data, expected)
+
+        self.assertEqual(list_endpoint.call_count, 1)
+        self.assertEqual(cache.get('remotefields:things:id,name:2002'),
+                         {'id': 2002, 'name': 'Name 2'})
+
+
+class StaleWhileRevalidateTest(TestCase):
+
+    def setUp(self):
+        super(StaleWhileRevalidateTest, self).setUp()
+        list_endpoint.reset_mock()
+        list_endpoint.side_effect = None
+        detail_endpoint.reset_mock()
+        detail_endpoint.side_effect = None
+        detail_endpoint.return_value = {'id': 2001, 'name': 'Name 1'}
+        self.model_instance = ModelForTest.objects.create(thing_id=2001)
+
+    def tearDown(self):
+        super(StaleWhileRevalidateTest, self).tearDown()
+        ModelForTest.objects.all().delete()
+        cache.clear()
+
+    def wait_for_refresh(self, serializer, pks):
+        cache_ = serializer._get_remote_cache(serializer.fields['thing'])
+        for _ in range(100):
+            if cache_.start_refresh(pks):
+                cache_.finish_refresh(pks)
+                return
+            time.sleep(0.01)
+
+    @mock.patch('remotefields.cache.time')
+    def test_stale_object_is_served_and_refreshed(self, time_mock):
+        """
+        Serialize a model instance once its cached remote object expired
+        and check the stale object is served while it is refreshed
+        """
+        time_mock.time.return_value = 1000
+        StaleTestSerializer(self.model_instance).data
+        detail_endpoint.return_value = {'id': 2001, 'name': 'New name'}
+        time_mock.time.return_value = 1060
+
+        serializer = StaleTestSerializer(self.model_instance)
+        result = serializer.data
+        self.wait_for_refresh(serializer, [2001])
+
+        self.assertEqual(result,
+                         {'id': 1, 'thing': {'id': 2001, 'name': 'Name 1'}})
+        self.assertEqual(detail_endpoint.call_count, 2)
+        self.assertEqual(StaleTestSerializer(self.model_instance).data,
+                         {'id': 1, 'thing': {'id': 2001, 'name': 'New name'}})
+        self.assertEqual(detail_endpoint.call_count, 2)
+
+    @mock.patch('remotefields.cache.time')
+    def test_stale_objects_of_a_list_are_refreshed(self, time_mock):
+        """
+        Serialize a queryset once its cached remote objects expired and
+        check they are refreshed using the 'list' endpoint
+        """
+        ModelForTest.objects.create(thing_id=2002)
+        list_endpoint.return_value = [
+            {'id': 2001, 'name': 'Name 1'}, {'id': 2002, 'name': 'Name 2'}]
+        time_mock.time.return_value = 1000
+        StaleTestSerializer(ModelForTest.objects.all()).data
+        time_mock.time.return_value = 1060
+
+        serializer = StaleTestSerializer(ModelForTest.objects.all())
+        result = serializer.data
+        self.wait_for_refresh(serializer, [2001, 2002])
+
+        self.assertEqual([row['thing']['name'] for row in result],
+                         ['Name 1', 'Name 2'])
+        self.assertEqual(list_endpoint.call_count, 2)
+        self.assertFalse(detail_endpoint.called)
+
+    def test_stale_timeout_needs_cache(self):
+        """
+        Check that stale objects can not be served from uncached fields
+        """
+        with self.assertRaises(ValueError):
+            RemoteField(source='thing_id', remote_sources=('id',),
+                        cache_stale_timeout=60, endpoints={})
+
+
+class RemoteIdentityMapTest(TestCase):
+
+    def setUp(self):
+        super(RemoteIdentityMapTest, self).setUp()
+        list_endpoint.reset_mock()
+        list_endpoint.side_effect = None
+        list_endpoint.return_value = [
+            {'id': 2001, 'name': 'Name 1'}, {'id': 2002, 'name': 'Name 2'}]
+        detail_endpoint.reset_mock()
+        detail_endpoint.side_effect = None
+        detail_endpoint.return_value = {'id': 2001, 'name': 'Name 1'}
+
+    def tearDown(self):
+        super(RemoteIdentityMapTest, self).tearDown()
+        ModelForTest.objects.all().delete()
+
+    def test_fields_sharing_endpoints_on_model_instance(self):
+        """
+        Serialize a model instance with two fields pointing to the same
+        remote object and check it is retrieved only once
+        """
+        model_instance = ModelForTest.objects.create(thing_id=2001)
+        expected = {'id': 1, 'thing': {'id': 2001}, 'thing_name': 'Name 1'}
+
+        result = SharedEndpointsTestSerializer(model_instance).data
+
+        self.assertEqual(result, expected)
+        detail_endpoint.assert_called_once_with(pk=2001)
+
+    def test_nested_fields_sharing_endpoints_on_queryset(self):
+        """
+        Serialize a queryset with the same serializer nested twice and
+        check the remote objects are retrieved only once
+        """
+        model_instance_1 = ModelForTest.objects.create(thing_id=2001)
+        model_instance_2 = ModelForTest.objects.create(thing_id=2002)
+        obj = ParentModelForTest.objects.create(test_instance=model_instance_1)
+        obj.test_instances.add(model_instance_1, model_instance_2)
+        ParentModelForTest.objects.create(test_instance=model_instance_2)
+        query = ParentModelForTest.objects.all()
+
+        result = ParentSharedEndpointsTestSerializer(query).data
+
+        self.assertEqual(result[0]['test_instance'], {
+            'id': 1, 'thing': {'id': 2001}, 'thing_name': 'Name 1'})
+        self.assertEqual(result[1]['test_instance'], {
+            'id': 2, 'thing': {'id': 2002}, 'thing_name': 'Name 2'})
+        self.assertEqual(sorted(i['thing_name']
+                                for i in result[0]['test_instances']),
+                         ['Name 1', 'Name 2'])
+        self.assertEqual(list_endpoint.call_count, 1)
+        self.assertFalse(detail_endpoint.called)
+
+    def test_identity_map_shared_on_context(self):
+        """
+        Serialize a model instance twice sharing the identity map on the
+        context and check the remote object is retrieved only once
+        """
+        model_instance = ModelForTest.objects.create(thing_id=2001)
+        context = {'remote_identity_map': RemoteIdentityMap()}
+
+        SharedEndpointsTestSerializer(model_instance, context=context).data
+        SharedEndpointsTestSerializer(model_instance, context=context).data
+
+        detail_endpoint.assert_called_once_with(pk=2001)
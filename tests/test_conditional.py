@@ -0,0 +1,116 @@
+import mock
+from unittest import TestCase
+
+from rest_framework import serializers
+
+from remotefields import (ConditionalRequests, NotModified,
+                          RemoteFieldsModelSerializerMixin, RemoteField,
+                          RemoteResponse, remote_field_resolved)
+from tests.models import ModelForTest
+
+
+list_endpoint = mock.Mock()
+detail_endpoint = mock.Mock()
+conditional = ConditionalRequests(max_entries=2)
+
+
+class ConditionalTestSerializer(RemoteFieldsModelSerializerMixin,
+                                serializers.ModelSerializer):
+    thing = RemoteField(
+        source='thing_id', remote_sources=('id', 'name',),
+        conditional=conditional,
+        endpoints={'list': list_endpoint, 'detail': detail_endpoint}
+    )
+
+    class Meta:
+        model = ModelForTest
+        fields = ('id', 'thing')
+
+
+class ConditionalRequestsTest(TestCase):
+
+    def setUp(self):
+        super(ConditionalRequestsTest, self).setUp()
+        conditional.entries.clear()
+        list_endpoint.reset_mock()
+        list_endpoint.side_effect = None
+        list_endpoint.return_value = RemoteResponse(
+            [{'id': 2001, 'name': 'Name 1'}, {'id': 2002, 'name': 'Name 2'}],
+            etag='"v1"', last_modified='Fri, 16 Oct 2026 10:00:00 GMT')
+        detail_endpoint.reset_mock()
+        ModelForTest.objects.create(thing_id=2001)
+        ModelForTest.objects.create(thing_id=2002)
+        self.metrics = []
+        remote_field_resolved.connect(self.receiver)
+
+    def tearDown(self):
+        super(ConditionalRequestsTest, self).tearDown()
+        remote_field_resolved.disconnect(self.receiver)
+        ModelForTest.objects.all().delete()
+
+    def receiver(self, sender, metrics, **kwargs):
+        self.metrics.append(metrics)
+
+    def serialize(self):
+        return ConditionalTestSerializer(
+            ModelForTest.objects.order_by('id'), many=True).data
+
+    def test_unchanged_response_is_reused(self):
+        """
+        Serialize twice, with the endpoint answering the second time that
+        the resource did not change, and check it is requested with the
+        validators and the previous response is served
+        """
+        first = self.serialize()
+        list_endpoint.side_effect = NotModified
+
+        second = self.serialize()
+
+        self.assertEqual(second, first)
+        self.assertEqual(list_endpoint.call_args_list, [
+            mock.call(),
+            mock.call(if_none_match='"v1"',
+                      if_modified_since='Fri, 16 Oct 2026 10:00:00 GMT')])
+        self.assertEqual(self.metrics[-1].not_modified, 1)
+
+    def test_changed_response_replaces_the_previous_one(self):
+        """
+        Serialize twice, with the endpoint returning a new response the
+        second time, and check its validators are kept
+        """
+        self.serialize()
+        list_endpoint.return_value = RemoteResponse(
+            [{'id': 2001, 'name': 'New 1'}], etag='"v2"')
+
+        data = self.serialize()
+
+        self.assertEqual([row['thing'] for row in data],
+                         [{'id': 2001, 'name': 'New 1'}, None])
+        entry, = conditional.entries.values()
+        self.assertEqual(entry[:2], ('"v2"', None))
+
+    def test_responses_without_validators(self):
+        """
+        Serialize with an endpoint returning plain data and check it is not
+        requested conditionally
+        """
+        list_endpoint.return_value = [{'id': 2001, 'name': 'Name 1'}]
+
+        self.serialize()
+        self.serialize()
+
+        self.assertEqual(list_endpoint.call_args_list,
+                         [mock.call(), mock.call()])
+        self.assertEqual(len(conditional.entries), 0)
+
+    def test_least_recently_used_responses_are_dropped(self):
+        """
+        Call an endpoint with more combinations of parameters than
+        `max_entries` and check the oldest responses are dropped
+        """
+        for page in (1, 2, 1, 3):
+            conditional.call(list_endpoint, {'page': page})
+
+        self.assertEqual(
+            list(conditional.entries),
+            [(list_endpoint, (('page', 1),)), (list_endpoint, (('page', 3),))])
@@ -0,0 +1,157 @@
+import json
+import threading
+from unittest import TestCase
+
+try:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+except ImportError:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+
+from rest_framework import serializers
+
+from remotefields import (ConditionalRequests, ConnectionPool, HttpEndpoint,
+                          RemoteFieldsModelSerializerMixin, RemoteField,
+                          RemoteNotFound, RemoteServerError)
+from tests.models import ModelForTest
+
+
+class FakeHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.paths.append(self.path)
+        if self.path.startswith('/things/404/'):
+            return self.send_body(404, b'{}')
+        if self.path.startswith('/things/400/'):
+            return self.send_body(400, b'{}')
+        if self.path.startswith('/things/503/'):
+            return self.send_body(503, b'{}')
+        if self.headers.get('If-None-Match') == '"v1"':
+            return self.send_body(304, b'')
+        body = json.dumps(
+            [{'id': 2001, 'name': 'Name 1'}, {'id': 2002, 'name': 'Name 2'}])
+        self.send_body(200, body.encode('utf-8'), etag='"v1"')
+
+    def send_body(self, status, body, etag=None):
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        if etag is not None:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class ConnectionPoolTest(TestCase):
+
+    def setUp(self):
+        super(ConnectionPoolTest, self).setUp()
+        self.server = FakeServer(('127.0.0.1', 0), FakeHandler)
+        self.server.paths = []
+        thread = threading.Thread(target=self.server.serve_forever,
+                                  kwargs={'poll_interval': 0.01})
+        thread.daemon = True
+        thread.start()
+        self.url = 'http://127.0.0.1:%s' % self.server.server_address[1]
+        self.pool = ConnectionPool(pool_size=2, max_per_host=2, timeout=5)
+        ModelForTest.objects.create(thing_id=2001)
+        ModelForTest.objects.create(thing_id=2002)
+
+    def tearDown(self):
+        super(ConnectionPoolTest, self).tearDown()
+        self.pool.close()
+        self.server.shutdown()
+        self.server.server_close()
+        ModelForTest.objects.all().delete()
+
+    def get_serializer_class(self, conditional=None):
+        list_endpoint = HttpEndpoint(self.url + '/things/', self.pool)
+        detail_endpoint = HttpEndpoint(self.url + '/things/{pk}/', self.pool)
+
+        class ConnectionsTestSerializer(RemoteFieldsModelSerializerMixin,
+                                        serializers.ModelSerializer):
+            thing = RemoteField(
+                source='thing_id', remote_sources=('id', 'name',),
+                bulk_param='pk__in', bulk_chunk_size=1,
+                conditional=conditional,
+                endpoints={'list': list_endpoint, 'detail': detail_endpoint}
+            )
+
+            class Meta:
+                model = ModelForTest
+                fields = ('id', 'thing')
+
+        return ConnectionsTestSerializer
+
+    def test_connections_are_reused(self):
+        """
+        Serialize a list making several remote calls and check they reuse
+        a single keep-alive connection
+        """
+        data = self.get_serializer_class()(
+            ModelForTest.objects.order_by('id'), many=True).data
+
+        self.assertEqual([row['thing']['name'] for row in data],
+                         ['Name 1', 'Name 2'])
+        self.assertEqual(self.server.paths, ['/things/?pk__in=2001',
+                                             '/things/?pk__in=2002'])
+        stats = self.pool.get_stats()[self.url]
+        self.assertEqual(stats['requests'], 2)
+        self.assertEqual(stats['connections'], 1)
+        self.assertEqual(stats['reused'], 1)
+        self.assertEqual(stats['idle'], 1)
+        self.assertEqual(stats['in_use'], 0)
+
+    def test_url_params_and_errors(self):
+        """
+        Call a detail endpoint answering with errors and check the pk is
+        sent on the path, and objects which do not exist raise
+        RemoteNotFound, server failures RemoteServerError, and the rest
+        ValueError
+        """
+        endpoint = HttpEndpoint(self.url + '/things/{pk}/', self.pool)
+
+        with self.assertRaises(RemoteNotFound):
+            endpoint(pk=404)
+        with self.assertRaises(RemoteServerError):
+            endpoint(pk=503)
+        with self.assertRaises(ValueError):
+            endpoint(pk=400)
+        self.assertEqual(self.server.paths,
+                         ['/things/404/', '/things/503/', '/things/400/'])
+
+    def test_url_params_are_quoted(self):
+        """
+        Call a detail endpoint with a key including reserved characters and
+        check it is quoted on the path
+        """
+        endpoint = HttpEndpoint(self.url + '/things/{pk}/', self.pool)
+
+        endpoint(pk=u'a b/c?d\xe9', fields='name')
+
+        self.assertEqual(self.server.paths,
+                         ['/things/a%20b%2Fc%3Fd%C3%A9/?fields=name'])
+
+    def test_conditional_requests(self):
+        """
+        Serialize twice with conditional requests and check the second time
+        the server answers 304 and the previous response is served
+        """
+        serializer_class = self.get_serializer_class(ConditionalRequests())
+        queryset = ModelForTest.objects.filter(thing_id=2001)
+
+        first = serializer_class(queryset, many=True).data
+        second = serializer_class(queryset, many=True).data
+
+        self.assertEqual(second, first)
+        self.assertEqual(len(self.server.paths), 2)
+        self.assertEqual(first[0]['thing'], {'id': 2001, 'name': 'Name 1'})
+        self.assertEqual(self.pool.get_stats()[self.url]['reused'], 1)
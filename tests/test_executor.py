@@ -0,0 +1,198 @@
+import mock
+import threading
+from unittest import TestCase
+
+from rest_framework import serializers
+
+from remotefields import RemoteFieldsModelSerializerMixin, RemoteField
+from remotefields import executor
+from remotefields.executor import call_with_timeout, run_concurrently
+from tests.models import ModelForTest
+
+
+first_called = threading.Event()
+second_called = threading.Event()
+
+
+def first_detail_endpoint(pk):
+    first_called.set()
+    second_called.wait(1)
+    return {'id': pk, 'name': 'First', 'concurrent': second_called.is_set()}
+
+
+def second_detail_endpoint(pk):
+    second_called.set()
+    first_called.wait(1)
+    return {'id': pk, 'name': 'Second', 'concurrent': first_called.is_set()}
+
+
+class ConcurrentTestSerializer(RemoteFieldsModelSerializerMixin,
+                               serializers.ModelSerializer):
+    first = RemoteField(
+        source='thing_id', remote_sources=('name', 'concurrent',),
+        endpoints={'list': mock.Mock(), 'detail': first_detail_endpoint}
+    )
+    second = RemoteField(
+        source='thing_id', remote_sources=('name', 'concurrent',),
+        endpoints={'list': mock.Mock(), 'detail': second_detail_endpoint}
+    )
+
+    remote_max_workers = 2
+
+    class Meta:
+        model = ModelForTest
+        fields = ('id', 'first', 'second')
+
+
+class ConcurrentResolutionTest(TestCase):
+
+    def setUp(self):
+        super(ConcurrentResolutionTest, self).setUp()
+        first_called.clear()
+        second_called.clear()
+
+    def tearDown(self):
+        super(ConcurrentResolutionTest, self).tearDown()
+        ModelForTest.objects.all().delete()
+
+    def test_fields_are_resolved_concurrently(self):
+        """
+        Serialize a model instance with two remote fields using different
+        endpoints and check both endpoints were running at the same time
+        """
+        model_instance = ModelForTest.objects.create(thing_id=2001)
+        expected = {'id': 1,
+                    'first': {'name': 'First', 'concurrent': True},
+                    'second': {'name': 'Second', 'concurrent': True}}
+
+        result = ConcurrentTestSerializer(model_instance).data
+
+        self.assertEqual(result, expected)
+
+    def test_first_error_is_raised(self):
+        """
+        Run some failing tasks and check the error of the first one is
+        raised once all of them finished
+        """
+        finished = []
+
+        def fail(error):
+            def task():
+                finished.append(error)
+                raise error
+            return task
+
+        tasks = [lambda: 'ok', fail(KeyError('first')),
+                 fail(ValueError('second'))]
+
+        with self.assertRaises(KeyError):
+            run_concurrently(tasks, 2)
+        self.assertEqual(len(finished), 2)
+
+    def test_sequential_without_workers(self):
+        """
+        Run some tasks without threads and check the results are kept in
+        order
+        """
+        tasks = [lambda: threading.current_thread(), lambda: 2]
+
+        self.assertEqual(run_concurrently(tasks, 0),
+                         [threading.current_thread(), 2])
+
+
+class CallPoolsTest(TestCase):
+
+    @mock.patch('remotefields.executor.get_call_pools',
+                mock.Mock(return_value=2))
+    @mock.patch('remotefields.executor._call_pool_keys', set())
+    def test_number_of_pools_is_bounded(self):
+        """
+        Call endpoints created at runtime with a timeout and check only the
+        first ones get their own pool of threads
+        """
+        keys = [mock.Mock() for _ in range(5)]
+
+        with mock.patch('remotefields.executor.get_pool',
+                        wraps=executor.get_pool) as get_pool:
+            for key in keys:
+                call_with_timeout(1, mock.Mock(), key=key)
+
+        self.assertEqual([call[1]['name'] for call in get_pool.call_args_list],
+                         [('calls', keys[0]), ('calls', keys[1]),
+                          ('calls', None), ('calls', None), ('calls', None)])
+
+
+class DataAsyncTest(TestCase):
+
+    def tearDown(self):
+        super(DataAsyncTest, self).tearDown()
+        ModelForTest.objects.all().delete()
+
+    def test_data_async(self):
+        """
+        Serialize a model instance with `data_async` and check the remote
+        fields are resolved on a background thread
+        """
+        threads = []
+
+        def detail_endpoint(pk):
+            threads.append(threading.current_thread())
+            return {'id': pk, 'name': 'Name of the thing'}
+
+        class AsyncTestSerializer(RemoteFieldsModelSerializerMixin,
+                                  serializers.ModelSerializer):
+            thing = RemoteField(
+                source='thing_id', remote_sources=('id', 'name',),
+                endpoints={'list': mock.Mock(), 'detail': detail_endpoint}
+            )
+
+            class Meta:
+                model = ModelForTest
+                fields = ('id', 'thing')
+
+        model_instance = ModelForTest.objects.create(thing_id=2001)
+        serializer = AsyncTestSerializer(model_instance)
+        callback = mock.Mock()
+        expected = {'id': 1,
+                    'thing': {'id': 2001, 'name': 'Name of the thing'}}
+
+        result = serializer.data_async(callback=callback).get(1)
+
+        self.assertEqual(result, expected)
+        self.assertEqual(serializer.data, expected)
+        callback.assert_called_once_with(expected)
+        self.assertEqual(len(threads), 1)
+        self.assertNotEqual(threads[0], threading.current_thread())
+
+    def test_data_while_resolving_async(self):
+        """
+        Evaluate `data` while `data_async` is resolving the remote fields in
+        the background and check it waits for them instead of resolving
+        them again
+        """
+        released = threading.Event()
+        detail_endpoint = mock.Mock(
+            side_effect=lambda pk: released.wait(1) and {'id': pk})
+
+        class AsyncTestSerializer(RemoteFieldsModelSerializerMixin,
+                                  serializers.ModelSerializer):
+            thing = RemoteField(
+                source='thing_id', remote_sources=('id',),
+                endpoints={'list': mock.Mock(), 'detail': detail_endpoint}
+            )
+
+            class Meta:
+                model = ModelForTest
+                fields = ('id', 'thing')
+
+        model_instance = ModelForTest.objects.create(thing_id=2001)
+        serializer = AsyncTestSerializer(model_instance)
+        expected = {'id': 1, 'thing': {'id': 2001}}
+
+        async_result = serializer.data_async()
+        threading.Timer(0.05, released.set).start()
+
+        self.assertEqual(serializer.data, expected)
+        self.assertEqual(serializer.data_async().get(1), expected)
+        self.assertEqual(async_result.get(1), expected)
+        detail_endpoint.assert_called_once_with(pk=2001)
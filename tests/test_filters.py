@@ -0,0 +1,159 @@
+import mock
+from unittest import TestCase
+
+from rest_framework import generics, serializers
+from rest_framework.test import APIRequestFactory
+
+from remotefields import (RemoteFieldsModelSerializerMixin, RemoteField,
+                          RemoteFieldsFilter)
+from tests.models import ModelForTest
+
+
+list_endpoint = mock.Mock()
+detail_endpoint = mock.Mock()
+
+NAMES = {2001: 'Bravo', 2002: 'Alpha', 2003: 'Charlie'}
+
+
+def remote_list(pk__in):
+    return [{'id': int(pk), 'name': NAMES[int(pk)]}
+            for pk in pk__in.split(',') if int(pk) in NAMES]
+
+
+class FilterTestSerializer(RemoteFieldsModelSerializerMixin,
+                           serializers.ModelSerializer):
+    thing = RemoteField(
+        source='thing_id', remote_sources=('id', 'name',),
+        bulk_param='pk__in',
+        endpoints={'list': list_endpoint, 'detail': detail_endpoint}
+    )
+    thing_name = RemoteField(
+        source='thing_id', remote_sources=('name',), flat=True,
+        bulk_param='pk__in',
+        endpoints={'list': list_endpoint, 'detail': detail_endpoint}
+    )
+
+    class Meta:
+        model = ModelForTest
+        fields = ('id', 'thing', 'thing_name')
+
+
+class FilterTestView(object):
+
+    def get_serializer_class(self):
+        return FilterTestSerializer
+
+
+class FilterTestDetailView(generics.RetrieveAPIView):
+    queryset = ModelForTest.objects.all()
+    serializer_class = FilterTestSerializer
+    filter_backends = (RemoteFieldsFilter,)
+
+
+class FakeRequest(object):
+
+    def __init__(self, **params):
+        self.QUERY_PARAMS = params
+
+
+class RemoteFieldsFilterTest(TestCase):
+
+    def setUp(self):
+        super(RemoteFieldsFilterTest, self).setUp()
+        list_endpoint.reset_mock()
+        list_endpoint.side_effect = remote_list
+        self.objects = [ModelForTest.objects.create(thing_id=thing_id)
+                        for thing_id in (2001, 2002, 2004, 2003, 2002)]
+
+    def tearDown(self):
+        super(RemoteFieldsFilterTest, self).tearDown()
+        ModelForTest.objects.all().delete()
+
+    def filter(self, queryset=None, view=None, **params):
+        if queryset is None:
+            queryset = ModelForTest.objects.order_by('id')
+        return RemoteFieldsFilter().filter_queryset(
+            FakeRequest(**params), queryset, view or FilterTestView())
+
+    def test_order_by_remote_attribute(self):
+        """
+        Order by a remote attribute and check the objects are ordered by it,
+        then by their previous order, with the missing ones last, retrieving
+        the remote objects in a single call
+        """
+        result = self.filter(ordering='thing.name')
+
+        expected = [self.objects[index] for index in (1, 4, 0, 3, 2)]
+        self.assertEqual(list(result), expected)
+        self.assertEqual(list_endpoint.call_count, 1)
+
+    def test_order_descending_by_flat_field(self):
+        """
+        Order descending by a flat field and check the missing objects are
+        still last
+        """
+        result = self.filter(ordering='-thing_name')
+
+        expected = [self.objects[index] for index in (3, 0, 1, 4, 2)]
+        self.assertEqual(list(result), expected)
+
+    def test_filter_by_remote_attribute(self):
+        """
+        Filter by a remote attribute and check only the matching objects
+        are kept
+        """
+        result = self.filter(**{'thing.name': 'Alpha'})
+
+        self.assertEqual(result.count(), 2)
+        self.assertEqual(list(result), [self.objects[1], self.objects[4]])
+
+    def test_slices_load_only_their_objects(self):
+        """
+        Take a page of the result and check only its objects are loaded,
+        on a list carrying the remote objects for the serializer
+        """
+        result = self.filter(ordering='thing.name')
+
+        queryset = result.queryset
+        with mock.patch.object(queryset, 'in_bulk',
+                               wraps=queryset.in_bulk) as in_bulk:
+            page = result[1:3]
+        in_bulk.assert_called_once_with(
+            [self.objects[4].pk, self.objects[0].pk])
+        self.assertEqual(page, [self.objects[4], self.objects[0]])
+
+        data = FilterTestSerializer(page, many=True).data
+        self.assertEqual([row['thing_name'] for row in data],
+                         ['Alpha', 'Bravo'])
+        self.assertEqual(list_endpoint.call_count, 1)
+
+    def test_detail_views_are_not_ordered(self):
+        """
+        Retrieve a single object from a detail view ordering by a remote
+        attribute and check the object is looked up on the queryset
+        untouched
+        """
+        detail_endpoint.return_value = {'id': 2004, 'name': 'Delta'}
+        instance = self.objects[2]
+        request = APIRequestFactory().get('/things/',
+                                          {'ordering': 'thing_name'})
+
+        response = FilterTestDetailView.as_view()(request, pk=instance.pk)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['thing_name'], 'Delta')
+        self.assertFalse(list_endpoint.called)
+
+    def test_unknown_terms_are_ignored(self):
+        """
+        Order by local and not allowed fields and check the queryset is
+        returned untouched, without remote calls
+        """
+        view = FilterTestView()
+        view.remote_ordering_fields = ('thing_name',)
+        queryset = ModelForTest.objects.all()
+
+        result = self.filter(queryset, view, ordering='id,thing.name')
+
+        self.assertIs(result, queryset)
+        self.assertFalse(list_endpoint.called)
@@ -0,0 +1,110 @@
+import mock
+from unittest import TestCase
+
+from django.http import HttpRequest, HttpResponse
+from rest_framework import serializers
+
+from remotefields import (RemoteFieldsModelSerializerMixin, RemoteField,
+                          record, remote_field_resolved)
+from remotefields.middleware import RemoteFieldsMetricsMiddleware
+from tests.models import ModelForTest
+
+
+list_endpoint = mock.Mock()
+
+
+def remote_list(pk__in):
+    record('bytes', 10)
+    return [{'id': int(pk), 'name': 'Name %s' % pk}
+            for pk in pk__in.split(',') if pk != '2003']
+
+
+class MetricsTestSerializer(RemoteFieldsModelSerializerMixin,
+                            serializers.ModelSerializer):
+    thing_name = RemoteField(
+        source='thing_id', remote_sources=('name',), flat=True,
+        bulk_param='pk__in',
+        endpoints={'list': list_endpoint, 'detail': mock.Mock()}
+    )
+
+    class Meta:
+        model = ModelForTest
+        fields = ('id', 'thing_name')
+
+
+class MetricsTest(TestCase):
+
+    def setUp(self):
+        super(MetricsTest, self).setUp()
+        list_endpoint.reset_mock()
+        list_endpoint.side_effect = remote_list
+        self.metrics = []
+        remote_field_resolved.connect(self.receiver)
+        for thing_id in (2001, 2002, 2002, 2003):
+            ModelForTest.objects.create(thing_id=thing_id)
+
+    def tearDown(self):
+        super(MetricsTest, self).tearDown()
+        remote_field_resolved.disconnect(self.receiver)
+        ModelForTest.objects.all().delete()
+
+    def receiver(self, sender, metrics, request, **kwargs):
+        self.metrics.append((sender, metrics, request))
+
+    def test_metrics_are_sent(self):
+        """
+        Serialize a queryset and check the metrics of its remote field are
+        sent once it is resolved
+        """
+        request = object()
+        serializer = MetricsTestSerializer(ModelForTest.objects.all(),
+                                           context={'request': request})
+
+        serializer.data
+
+        self.assertEqual(len(self.metrics), 1)
+        sender, metrics, sent_request = self.metrics[0]
+        self.assertEqual(sender, MetricsTestSerializer)
+        self.assertEqual(sent_request, request)
+        self.assertEqual(metrics.name, 'MetricsTestSerializer.thing_name')
+        expected = {'endpoint': 'list', 'rows': 4, 'pks': 3, 'calls': 1,
+                    'identity_hits': 0, 'cache_hits': 0, 'missing': 1,
+                    'bytes': 10}
+        result = metrics.as_dict()
+        self.assertEqual(
+            dict((key, result[key]) for key in expected), expected)
+        self.assertTrue(metrics.duration >= 0)
+
+    def test_middleware(self):
+        """
+        Process a request with the middleware and check the metrics are
+        collected and summarized on a Server-Timing header
+        """
+        middleware = RemoteFieldsMetricsMiddleware()
+        request = HttpRequest()
+        middleware.process_request(request)
+
+        MetricsTestSerializer(ModelForTest.objects.all(),
+                              context={'request': request}).data
+        response = middleware.process_response(request, HttpResponse())
+
+        self.assertEqual(len(request.remote_fields_metrics.fields), 1)
+        self.assertTrue(response['Server-Timing'].startswith(
+            'remote-fields;dur='))
+        self.assertIn('remote-MetricsTestSerializer.thing_name;dur=',
+                      response['Server-Timing'])
+        self.assertIn('list: 1 calls, 3 pks, 0 cache hits, 1 missing',
+                      response['Server-Timing'])
+
+    def test_middleware_without_remote_fields(self):
+        """
+        Process a request not resolving any remote field and check no
+        header is added
+        """
+        middleware = RemoteFieldsMetricsMiddleware()
+        request = HttpRequest()
+        middleware.process_request(request)
+
+        response = middleware.process_response(request, HttpResponse())
+
+        self.assertFalse(response.has_header('Server-Timing'))
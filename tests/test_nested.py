@@ -0,0 +1,101 @@
+import mock
+from unittest import TestCase
+
+from rest_framework import generics, serializers
+from rest_framework.test import APIRequestFactory
+
+from remotefields import RemoteFieldsModelSerializerMixin, RemoteField
+from tests.models import ModelForTest, ParentModelForTest
+
+
+list_endpoint = mock.Mock()
+detail_endpoint = mock.Mock()
+
+
+class ChildTestSerializer(RemoteFieldsModelSerializerMixin,
+                          serializers.ModelSerializer):
+    thing = RemoteField(
+        source='thing_id', remote_sources=('name',), flat=True,
+        endpoints={'list': list_endpoint, 'detail': detail_endpoint}
+    )
+
+    class Meta:
+        model = ModelForTest
+        fields = ('thing',)
+
+
+class ParentTestSerializer(RemoteFieldsModelSerializerMixin,
+                           serializers.ModelSerializer):
+    test_instance = ChildTestSerializer()
+
+    class Meta:
+        model = ParentModelForTest
+        fields = ('id', 'test_instance')
+
+
+class GrandparentTestSerializer(RemoteFieldsModelSerializerMixin,
+                                serializers.ModelSerializer):
+    parent = ParentTestSerializer(source='*')
+
+    class Meta:
+        model = ParentModelForTest
+        fields = ('id', 'parent')
+
+
+class ParentListView(generics.ListAPIView):
+    queryset = ParentModelForTest.objects.order_by('id')
+    serializer_class = ParentTestSerializer
+    paginate_by = 10
+
+
+class NestedTest(TestCase):
+
+    def setUp(self):
+        super(NestedTest, self).setUp()
+        list_endpoint.reset_mock()
+        list_endpoint.return_value = [
+            {'id': 2000 + i, 'name': 'N%s' % (2000 + i)} for i in range(20)]
+        detail_endpoint.reset_mock()
+        detail_endpoint.side_effect = lambda pk: {'id': pk,
+                                                  'name': 'N%s' % pk}
+        for i in range(10):
+            child = ModelForTest.objects.create(thing_id=2001 + i)
+            ParentModelForTest.objects.create(test_instance=child)
+
+    def tearDown(self):
+        super(NestedTest, self).tearDown()
+        ParentModelForTest.objects.all().delete()
+        ModelForTest.objects.all().delete()
+
+    def test_nested_serializers_of_a_paginated_view(self):
+        """
+        Render a paginated list view, whose serializer is a field of the
+        PaginationSerializer, and check its nested remote serializers are
+        resolved with a single remote call for the whole page
+        """
+        request = APIRequestFactory().get('/parents/')
+
+        response = ParentListView.as_view()(request)
+
+        self.assertEqual(response.data['count'], 10)
+        self.assertEqual(
+            [row['test_instance'] for row in response.data['results']],
+            [{'thing': 'N%s' % (2001 + i)} for i in range(10)])
+        self.assertEqual(list_endpoint.call_count, 1)
+        self.assertFalse(detail_endpoint.called)
+
+    def test_three_levels(self):
+        """
+        Serialize a queryset with two levels of nested remote serializers
+        and check the remote fields of the deepest one are resolved with a
+        single remote call
+        """
+        queryset = ParentModelForTest.objects.order_by('id')
+
+        data = GrandparentTestSerializer(queryset, many=True).data
+
+        self.assertEqual(
+            [row['parent']['test_instance'] for row in data],
+            [{'thing': 'N%s' % (2001 + i)} for i in range(10)])
+        self.assertEqual(list_endpoint.call_count, 1)
+        self.assertFalse(detail_endpoint.called)
@@ -0,0 +1,129 @@
+import mock
+from unittest import TestCase
+
+from rest_framework import serializers
+
+from remotefields import (RemoteFieldsModelSerializerMixin, RemoteField,
+                          LimitOffsetPagination, PagePagination)
+from tests.models import ModelForTest
+
+
+THINGS = [{'id': 2000 + i, 'name': 'Name %d' % i} for i in range(1, 10)]
+
+
+def page_endpoint(page):
+    start = (page - 1) * 3
+    return {'count': len(THINGS),
+            'results': THINGS[start:start + 3]}
+
+
+def next_page_endpoint(page):
+    start = (page - 1) * 3
+    return {'next': 'next' if start + 3 < len(THINGS) else None,
+            'results': THINGS[start:start + 3]}
+
+
+def offset_endpoint(limit, offset):
+    return {'results': THINGS[offset:offset + limit]}
+
+
+def get_serializer_class(list_endpoint, pagination):
+
+    class PaginationTestSerializer(RemoteFieldsModelSerializerMixin,
+                                   serializers.ModelSerializer):
+        thing = RemoteField(
+            source='thing_id', remote_sources=('name',), flat=True,
+            pagination=pagination,
+            endpoints={'list': list_endpoint, 'detail': mock.Mock()}
+        )
+
+        class Meta:
+            model = ModelForTest
+            fields = ('id', 'thing')
+
+    return PaginationTestSerializer
+
+
+class PaginationTest(TestCase):
+
+    def tearDown(self):
+        super(PaginationTest, self).tearDown()
+        ModelForTest.objects.all().delete()
+
+    def serialize(self, endpoint, pagination, thing_ids):
+        for thing_id in thing_ids:
+            ModelForTest.objects.create(thing_id=thing_id)
+        serializer_class = get_serializer_class(endpoint, pagination)
+        return [row['thing'] for row in
+                serializer_class(ModelForTest.objects.all()).data]
+
+    def test_pages_with_count(self):
+        """
+        Serialize a queryset pointing to remote objects of the last page of
+        an endpoint giving the count, and check every page is retrieved
+        """
+        endpoint = mock.Mock(side_effect=page_endpoint)
+
+        result = self.serialize(endpoint, PagePagination(max_workers=2),
+                                [2001, 2009])
+
+        self.assertEqual(result, ['Name 1', 'Name 9'])
+        self.assertEqual(sorted(call[1]['page']
+                                for call in endpoint.call_args_list),
+                         [1, 2, 3])
+
+    def test_pages_with_next_stop_early(self):
+        """
+        Serialize a queryset pointing to remote objects of the first pages
+        and check the last page is not retrieved
+        """
+        endpoint = mock.Mock(side_effect=next_page_endpoint)
+
+        result = self.serialize(endpoint, PagePagination(),
+                                [2002, 2005, 2010])
+
+        self.assertEqual(result, ['Name 2', 'Name 5', None])
+        self.assertEqual(endpoint.call_args_list, [
+            mock.call(page=1), mock.call(page=2), mock.call(page=3)])
+
+        endpoint.reset_mock()
+        ModelForTest.objects.all().delete()
+        result = self.serialize(endpoint, PagePagination(), [2002, 2005])
+
+        self.assertEqual(result, ['Name 2', 'Name 5'])
+        self.assertEqual(endpoint.call_args_list, [
+            mock.call(page=1), mock.call(page=2)])
+
+    def test_limit_offset(self):
+        """
+        Serialize a queryset using a limit/offset pagination without count
+        nor next, and check pages are retrieved until one is not full
+        """
+        endpoint = mock.Mock(side_effect=offset_endpoint)
+
+        result = self.serialize(endpoint, LimitOffsetPagination(limit=4),
+                                [2009, 2010])
+
+        self.assertEqual(result, ['Name 9', None])
+        self.assertEqual(endpoint.call_args_list, [
+            mock.call(limit=4, offset=0), mock.call(limit=4, offset=4),
+            mock.call(limit=4, offset=8)])
+
+    def test_limit_offset_capped_by_the_server(self):
+        """
+        Serialize a queryset using a limit/offset pagination on an endpoint
+        returning less remote objects than the limit, and check offsets
+        follow the size of the pages returned, so none is skipped
+        """
+        def capped_endpoint(limit, offset):
+            return {'count': len(THINGS),
+                    'results': THINGS[offset:offset + min(limit, 3)]}
+        endpoint = mock.Mock(side_effect=capped_endpoint)
+
+        result = self.serialize(endpoint, LimitOffsetPagination(limit=5),
+                                [2004, 2008])
+
+        self.assertEqual(result, ['Name 4', 'Name 8'])
+        self.assertEqual(sorted(call[1]['offset']
+                                for call in endpoint.call_args_list),
+                         [0, 3, 6])
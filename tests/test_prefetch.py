@@ -0,0 +1,89 @@
+import mock
+from unittest import TestCase
+
+from rest_framework import serializers
+
+from remotefields import (RemoteFieldsModelSerializerMixin, RemoteField,
+                          RemoteIdentityMap, prefetch_remote)
+from tests.models import ModelForTest
+
+
+list_endpoint = mock.Mock()
+detail_endpoint = mock.Mock()
+endpoints = {'list': list_endpoint, 'detail': detail_endpoint}
+
+
+class PrefetchTestSerializer(RemoteFieldsModelSerializerMixin,
+                             serializers.ModelSerializer):
+    thing = RemoteField(
+        source='thing_id', remote_sources=('id', 'name',),
+        endpoints=endpoints
+    )
+
+    class Meta:
+        model = ModelForTest
+        fields = ('id', 'thing')
+
+
+class OtherPrefetchTestSerializer(RemoteFieldsModelSerializerMixin,
+                                  serializers.ModelSerializer):
+    thing_name = RemoteField(
+        source='thing_id', remote_sources=('name',), flat=True,
+        endpoints=endpoints
+    )
+
+    class Meta:
+        model = ModelForTest
+        fields = ('id', 'thing_name')
+
+
+class PrefetchRemoteTest(TestCase):
+
+    def setUp(self):
+        super(PrefetchRemoteTest, self).setUp()
+        list_endpoint.reset_mock()
+        list_endpoint.return_value = [
+            {'id': 2001, 'name': 'Name 1'}, {'id': 2002, 'name': 'Name 2'}]
+        detail_endpoint.reset_mock()
+        ModelForTest.objects.create(thing_id=2001)
+        ModelForTest.objects.create(thing_id=2002)
+
+    def tearDown(self):
+        super(PrefetchRemoteTest, self).tearDown()
+        ModelForTest.objects.all().delete()
+
+    def test_prefetch_serializer_fields(self):
+        """
+        Prefetch the remote fields of a serializer, serialize the objects
+        with two serializers and check no more remote calls are made
+        """
+        objects = prefetch_remote(ModelForTest.objects.all(),
+                                  PrefetchTestSerializer)
+        self.assertEqual(list_endpoint.call_count, 1)
+
+        result = PrefetchTestSerializer(objects, many=True).data
+        other_result = OtherPrefetchTestSerializer(objects, many=True).data
+
+        self.assertEqual(result[1],
+                         {'id': 2, 'thing': {'id': 2002, 'name': 'Name 2'}})
+        self.assertEqual(other_result[0], {'id': 1, 'thing_name': 'Name 1'})
+        self.assertEqual(list_endpoint.call_count, 1)
+        self.assertFalse(detail_endpoint.called)
+
+    def test_prefetch_remote_field_on_context(self):
+        """
+        Prefetch a RemoteField into the identity map of a context and check
+        a single object is serialized without remote calls
+        """
+        context = {'remote_identity_map': RemoteIdentityMap()}
+        prefetch_remote(ModelForTest.objects.all(),
+                        PrefetchTestSerializer.base_fields['thing'],
+                        context=context)
+
+        result = PrefetchTestSerializer(ModelForTest.objects.get(pk=1),
+                                        context=context).data
+
+        self.assertEqual(result,
+                         {'id': 1, 'thing': {'id': 2001, 'name': 'Name 1'}})
+        self.assertEqual(list_endpoint.call_count, 1)
+        self.assertFalse(detail_endpoint.called)
@@ -0,0 +1,81 @@
+import mock
+from unittest import TestCase
+
+from rest_framework import serializers
+
+from remotefields import RemoteFieldsModelSerializerMixin, RemoteField
+from tests.models import ModelForTest
+
+
+list_endpoint = mock.Mock()
+detail_endpoint = mock.Mock()
+
+
+def remote_detail(pk, fields):
+    return dict((name, '%s %s' % (name, pk)) for name in fields.split(','))
+
+
+def remote_list(pk__in, fields):
+    return [dict(remote_detail(pk, fields), id=int(pk))
+            for pk in pk__in.split(',')]
+
+
+class ProjectionTestSerializer(RemoteFieldsModelSerializerMixin,
+                               serializers.ModelSerializer):
+    thing_name = RemoteField(
+        source='thing_id', remote_sources=('name',), flat=True,
+        bulk_param='pk__in', projection_param='fields',
+        endpoints={'list': list_endpoint, 'detail': detail_endpoint}
+    )
+    thing_code = RemoteField(
+        source='thing_id', remote_sources=('code',), flat=True,
+        bulk_param='pk__in', projection_param='fields',
+        endpoints={'list': list_endpoint, 'detail': detail_endpoint}
+    )
+
+    class Meta:
+        model = ModelForTest
+        fields = ('id', 'thing_name', 'thing_code')
+
+
+class ProjectionTest(TestCase):
+
+    def setUp(self):
+        super(ProjectionTest, self).setUp()
+        list_endpoint.reset_mock()
+        list_endpoint.side_effect = remote_list
+        detail_endpoint.reset_mock()
+        detail_endpoint.side_effect = remote_detail
+
+    def tearDown(self):
+        super(ProjectionTest, self).tearDown()
+        ModelForTest.objects.all().delete()
+
+    def test_projection_on_detail_endpoint(self):
+        """
+        Serialize a model instance and check the attributes of every field
+        sharing the endpoint are requested with a single call
+        """
+        model_instance = ModelForTest.objects.create(thing_id=2001)
+        expected = {'id': 1, 'thing_name': 'name 2001',
+                    'thing_code': 'code 2001'}
+
+        result = ProjectionTestSerializer(model_instance).data
+
+        self.assertEqual(result, expected)
+        detail_endpoint.assert_called_once_with(pk=2001, fields='code,name')
+
+    def test_projection_on_list_endpoint(self):
+        """
+        Serialize a queryset and check the 'id' is requested together with
+        the attributes of every field
+        """
+        ModelForTest.objects.create(thing_id=2001)
+        ModelForTest.objects.create(thing_id=2002)
+
+        result = ProjectionTestSerializer(ModelForTest.objects.all()).data
+
+        self.assertEqual([row['thing_code'] for row in result],
+                         ['code 2001', 'code 2002'])
+        list_endpoint.assert_called_once_with(pk__in='2001,2002',
+                                              fields='code,id,name')
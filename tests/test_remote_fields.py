@@ -1,5 +1,6 @@
 import mock
 import re
+import threading
 from unittest import TestCase
 
 import httpretty
@@ -65,6 +66,22 @@ class TestSerializerWithFlatField(RemoteFieldsModelSerializerMixin,
         fields = ('id', 'thing_name')
 
 
+class TestSerializerWithBulkField(RemoteFieldsModelSerializerMixin,
+                                  serializers.ModelSerializer):
+    thing = RemoteField(
+        source='thing_id', remote_sources=('id', 'name',),
+        bulk_param='pk__in',
+        endpoints={
+            'list': client.some.endpoint_list,
+            'detail': client.some.endpoint_detail
+        }
+    )
+
+    class Meta:
+        model = ModelForTest
+        fields = ('id', 'thing')
+
+
 class RemoteFieldsTest(TestCase):
 
     @classmethod
@@ -271,10 +288,10 @@ class RemoteFieldsTest(TestCase):
         expected = [
             {'id': 1,
              'test_instance': {
-                 'id': 1, 'thing': {'id': 2004, 'name': 'Name of the thing'}}},
+                 'id': 1, 'thing': {'id': 2004, 'name': 'Name 4'}}},
             {'id': 2,
              'test_instance': {
-                 'id': 2, 'thing': {'id': 2005, 'name': 'Name of the thing'}}},
+                 'id': 2, 'thing': {'id': 2005, 'name': 'Name 5'}}},
         ]
 
         with mock.patch.dict('rest_client.client.ENDPOINTS', self.endpoints):
@@ -323,3 +340,178 @@ class RemoteFieldsTest(TestCase):
 
         self.assertDictEqual(result[0], expected[0])
         self.assertDictEqual(result[1], expected[1])
+
+    def test_valid_model_queryset_with_bulk_field(self):
+        """
+        Serialize a queryset with a bulk remote field and check that only
+        the needed remote objects are requested
+        """
+        ModelForTest(thing_id=2003).save()
+        ModelForTest(thing_id=2002).save()
+        ModelForTest(thing_id=2003).save()
+        query = ModelForTest.objects.all()
+        serializer = TestSerializerWithBulkField(query)
+        expected = [
+            {'id': 1, 'thing': {'id': 2003, 'name': 'Name 3'}},
+            {'id': 2, 'thing': {'id': 2002, 'name': 'Name 2'}},
+            {'id': 3, 'thing': {'id': 2003, 'name': 'Name 3'}}
+        ]
+
+        with mock.patch.dict('rest_client.client.ENDPOINTS', self.endpoints):
+            result = serializer.data
+
+        self.assertEqual(result, expected)
+        self.assertEqual(httpretty.last_request().querystring,
+                         {'pk__in': ['2002,2003']})
+
+    def test_bulk_field_requests_are_chunked(self):
+        """
+        Check that the pks of a bulk remote field are split in chunks
+        """
+        ModelForTest(thing_id=2001).save()
+        ModelForTest(thing_id=2002).save()
+        ModelForTest(thing_id=2003).save()
+        list_endpoint = mock.Mock(side_effect=[
+            [{'id': 2001, 'name': 'Name 1'}, {'id': 2002, 'name': 'Name 2'}],
+            [{'id': 2003, 'name': 'Name 3'}]
+        ])
+
+        class ChunkedSerializer(RemoteFieldsModelSerializerMixin,
+                                serializers.ModelSerializer):
+            thing_name = RemoteField(
+                source='thing_id', remote_sources=('name',), flat=True,
+                bulk_param='pk__in', bulk_chunk_size=2,
+                endpoints={'list': list_endpoint, 'detail': mock.Mock()}
+            )
+
+            class Meta:
+                model = ModelForTest
+                fields = ('id', 'thing_name')
+
+        result = ChunkedSerializer(ModelForTest.objects.all()).data
+
+        self.assertEqual(result, [
+            {'id': 1, 'thing_name': 'Name 1'},
+            {'id': 2, 'thing_name': 'Name 2'},
+            {'id': 3, 'thing_name': 'Name 3'}
+        ])
+        self.assertEqual(list_endpoint.call_args_list, [
+            mock.call(pk__in='2001,2002'), mock.call(pk__in='2003')])
+
+    def test_nested_remote_fields_are_resolved_in_bulk(self):
+        """
+        Serialize a queryset with a nested serializer and check that the
+        nested remote fields are resolved with a single remote call
+        """
+        list_endpoint = mock.Mock(return_value=[
+            {'id': 2001, 'name': 'Name 1'}, {'id': 2002, 'name': 'Name 2'}])
+        detail_endpoint = mock.Mock()
+
+        class ChildSerializer(RemoteFieldsModelSerializerMixin,
+                              serializers.ModelSerializer):
+            thing_name = RemoteField(
+                source='thing_id', remote_sources=('name',), flat=True,
+                endpoints={'list': list_endpoint, 'detail': detail_endpoint}
+            )
+
+            class Meta:
+                model = ModelForTest
+                fields = ('id', 'thing_name')
+
+        class ParentSerializer(RemoteFieldsModelSerializerMixin,
+                               serializers.ModelSerializer):
+            test_instance = ChildSerializer()
+
+            class Meta:
+                model = ParentModelForTest
+                fields = ('id', 'test_instance')
+
+        for thing_id in (2001, 2002, 2001):
+            ParentModelForTest.objects.create(
+                test_instance=ModelForTest.objects.create(thing_id=thing_id))
+
+        result = ParentSerializer(ParentModelForTest.objects.all()).data
+
+        self.assertEqual(result, [
+            {'id': 1, 'test_instance': {'id': 1, 'thing_name': 'Name 1'}},
+            {'id': 2, 'test_instance': {'id': 2, 'thing_name': 'Name 2'}},
+            {'id': 3, 'test_instance': {'id': 3, 'thing_name': 'Name 1'}}
+        ])
+        self.assertEqual(list_endpoint.call_count, 1)
+        self.assertFalse(detail_endpoint.called)
+
+    def test_fields_are_not_rebuilt_for_every_row(self):
+        """
+        Serialize querysets of different sizes with a nested serializer and
+        check the fields are built the same number of times
+        """
+        list_endpoint = mock.Mock(return_value=[])
+
+        class ChildSerializer(RemoteFieldsModelSerializerMixin,
+                              serializers.ModelSerializer):
+            thing_name = RemoteField(
+                source='thing_id', remote_sources=('name',), flat=True,
+                endpoints={'list': list_endpoint, 'detail': mock.Mock()}
+            )
+
+            class Meta:
+                model = ModelForTest
+                fields = ('id', 'thing_name')
+
+        class ParentSerializer(RemoteFieldsModelSerializerMixin,
+                               serializers.ModelSerializer):
+            test_instance = ChildSerializer()
+
+            class Meta:
+                model = ParentModelForTest
+                fields = ('id', 'test_instance')
+
+        def count_get_fields_calls(rows):
+            for _ in range(rows):
+                ParentModelForTest.objects.create(
+                    test_instance=ModelForTest.objects.create(thing_id=2001))
+            with mock.patch.object(
+                    ChildSerializer, 'get_fields',
+                    autospec=True,
+                    side_effect=serializers.ModelSerializer.get_fields) as m:
+                ParentSerializer(ParentModelForTest.objects.all()).data
+            return m.call_count
+
+        self.assertEqual(count_get_fields_calls(2),
+                         count_get_fields_calls(10))
+
+    def test_meta_options_are_not_modified(self):
+        """
+        Serialize a model instance from several threads and check the
+        serializer options are never modified
+        """
+        detail_endpoint = mock.Mock(
+            return_value={'id': 2001, 'name': 'Name 1'})
+
+        class ListFieldsSerializer(RemoteFieldsModelSerializerMixin,
+                                   serializers.ModelSerializer):
+            thing = RemoteField(
+                source='thing_id', remote_sources=('name',), flat=True,
+                endpoints={'list': mock.Mock(), 'detail': detail_endpoint}
+            )
+
+            class Meta:
+                model = ModelForTest
+                fields = ['id', 'thing']
+
+        model_instance = ModelForTest.objects.create(thing_id=2001)
+        results = []
+
+        def serialize():
+            serializer = ListFieldsSerializer(model_instance)
+            results.append((serializer.data, serializer.opts.fields))
+
+        threads = [threading.Thread(target=serialize) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, [
+            ({'id': 1, 'thing': 'Name 1'}, ['id', 'thing'])] * 10)
+        self.assertEqual(ListFieldsSerializer.Meta.fields, ['id', 'thing'])
@@ -0,0 +1,136 @@
+import mock
+from unittest import TestCase
+
+from django.core.cache import cache
+from rest_framework import serializers
+
+from remotefields import RemoteFieldsModelSerializerMixin, RemoteField
+from tests.models import ModelForTest
+
+
+list_endpoint = mock.Mock()
+
+
+def remote_list(**params):
+    return [{'kind': 'thing', 'number': number, 'name': 'Name %d' % number}
+            for number in (2001, 2002)]
+
+
+class RemoteKeyTestSerializer(RemoteFieldsModelSerializerMixin,
+                              serializers.ModelSerializer):
+    thing = RemoteField(
+        source='thing_id', remote_sources=('name',), flat=True,
+        remote_key='number', bulk_param='number__in',
+        projection_param='fields', cache_name='numbered_things',
+        cache_timeout=60,
+        endpoints={'list': list_endpoint, 'detail': mock.Mock()}
+    )
+
+    class Meta:
+        model = ModelForTest
+        fields = ('id', 'thing')
+
+
+class CompositeKeyTestSerializer(RemoteFieldsModelSerializerMixin,
+                                 serializers.ModelSerializer):
+    thing = RemoteField(
+        source='thing_key', remote_sources=('name',), flat=True,
+        remote_key=('kind', 'number'), bulk_param='key__in',
+        endpoints={'list': list_endpoint, 'detail': mock.Mock()}
+    )
+
+    class Meta:
+        model = ModelForTest
+        fields = ('id', 'thing')
+
+
+class CallableKeyTestSerializer(RemoteFieldsModelSerializerMixin,
+                                serializers.ModelSerializer):
+    thing = RemoteField(
+        source='thing_id', remote_sources=('name',), flat=True,
+        remote_key=lambda remote_object: remote_object['number'],
+        endpoints={'list': list_endpoint, 'detail': mock.Mock()}
+    )
+
+    class Meta:
+        model = ModelForTest
+        fields = ('id', 'thing')
+
+
+class RemoteKeyTest(TestCase):
+
+    def setUp(self):
+        super(RemoteKeyTest, self).setUp()
+        list_endpoint.reset_mock()
+        list_endpoint.side_effect = remote_list
+        ModelForTest.objects.create(thing_id=2001)
+        ModelForTest.objects.create(thing_id=2002)
+        self.expected = [{'id': 1, 'thing': 'Name 2001'},
+                         {'id': 2, 'thing': 'Name 2002'}]
+
+    def tearDown(self):
+        super(RemoteKeyTest, self).tearDown()
+        ModelForTest.objects.all().delete()
+        cache.clear()
+
+    def test_remote_key(self):
+        """
+        Serialize a queryset with a field using a custom remote key and
+        check it is used to filter, index and cache the remote objects
+        """
+        result = RemoteKeyTestSerializer(ModelForTest.objects.all()).data
+
+        self.assertEqual(result, self.expected)
+        list_endpoint.assert_called_once_with(number__in='2001,2002',
+                                              fields='name,number')
+        self.assertEqual(cache.get('remotefields:numbered_things:name:2001'),
+                         {'name': 'Name 2001'})
+
+    def test_composite_remote_key(self):
+        """
+        Serialize a queryset with a field using a composite remote key and
+        check the remote objects are filtered and indexed by all its values
+        """
+        result = CompositeKeyTestSerializer(ModelForTest.objects.all()).data
+
+        self.assertEqual(result, self.expected)
+        list_endpoint.assert_called_once_with(
+            key__in='thing:2001,thing:2002')
+
+    def test_callable_remote_key_with_projection(self):
+        """
+        Serialize a queryset with a field using a callable remote key and a
+        projection, and check the attributes read by the key are requested
+        """
+        def projected_list(fields):
+            return [dict((name, remote_object[name])
+                         for name in fields.split(','))
+                    for remote_object in remote_list()]
+
+        class ProjectionKeyTestSerializer(CallableKeyTestSerializer):
+            thing = RemoteField(
+                source='thing_id', remote_sources=('name',), flat=True,
+                remote_key=lambda remote_object: remote_object['number'],
+                remote_key_attributes=('number',), projection_param='fields',
+                endpoints={'list': projected_list, 'detail': mock.Mock()}
+            )
+
+        result = ProjectionKeyTestSerializer(
+            ModelForTest.objects.all()).data
+
+        self.assertEqual(result, self.expected)
+        self.assertFalse(list_endpoint.called)
+        with self.assertRaises(ValueError):
+            RemoteField(
+                source='thing_id', remote_sources=('name',),
+                remote_key=lambda remote_object: remote_object['number'],
+                projection_param='fields', endpoints={})
+
+    def test_callable_remote_key(self):
+        """
+        Serialize a queryset with a field using a callable remote key and
+        check the remote objects are indexed by it
+        """
+        result = CallableKeyTestSerializer(ModelForTest.objects.all()).data
+
+        self.assertEqual(result, self.expected)
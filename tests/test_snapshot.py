@@ -0,0 +1,199 @@
+import json
+import mock
+import os
+import shutil
+import tempfile
+import threading
+import time
+from unittest import TestCase
+
+from rest_framework import serializers
+
+from remotefields import (CircuitOpen, RemoteFieldsModelSerializerMixin,
+                          RemoteField, RemoteNotFound, RemoteSnapshot)
+from tests.models import ModelForTest
+
+
+list_endpoint = mock.Mock()
+detail_endpoint = mock.Mock()
+
+
+def remote_list(pk__in):
+    return [{'id': int(pk), 'name': 'Name %s' % pk}
+            for pk in pk__in.split(',')]
+
+
+def make_serializer(snapshot):
+
+    class SnapshotTestSerializer(RemoteFieldsModelSerializerMixin,
+                                 serializers.ModelSerializer):
+        thing = RemoteField(
+            source='thing_id', remote_sources=('id', 'name',),
+            bulk_param='pk__in', snapshot=snapshot,
+            endpoints={'list': list_endpoint, 'detail': detail_endpoint}
+        )
+
+        class Meta:
+            model = ModelForTest
+            fields = ('id', 'thing')
+
+    return SnapshotTestSerializer
+
+
+class RemoteSnapshotTest(TestCase):
+
+    def setUp(self):
+        super(RemoteSnapshotTest, self).setUp()
+        list_endpoint.reset_mock()
+        list_endpoint.side_effect = remote_list
+        detail_endpoint.reset_mock()
+        detail_endpoint.side_effect = None
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'things.snapshot')
+        ModelForTest.objects.create(thing_id=2001)
+        ModelForTest.objects.create(thing_id=2002)
+
+    def tearDown(self):
+        super(RemoteSnapshotTest, self).tearDown()
+        shutil.rmtree(self.directory)
+        ModelForTest.objects.all().delete()
+
+    def serialize(self, snapshot):
+        return make_serializer(snapshot)(
+            ModelForTest.objects.order_by('id'), many=True).data
+
+    def test_warm_start(self):
+        """
+        Serialize some objects, check the file is saved in the background,
+        then serialize them again with a new snapshot loaded from the same
+        file (as a new worker would) and check the remote service is not
+        called again
+        """
+        with mock.patch('remotefields.snapshot.get_pool') as get_pool:
+            self.serialize(RemoteSnapshot(self.path, save_interval=0))
+
+        self.assertEqual(list_endpoint.call_count, 1)
+        self.assertFalse(os.path.exists(self.path))
+        (func,), _ = get_pool.return_value.apply_async.call_args
+        func()
+
+        data = self.serialize(RemoteSnapshot(self.path))
+
+        self.assertEqual(list_endpoint.call_count, 1)
+        self.assertEqual([row['thing'] for row in data],
+                         [{'id': 2001, 'name': 'Name 2001'},
+                          {'id': 2002, 'name': 'Name 2002'}])
+
+    def test_old_objects_are_retrieved_again(self):
+        """
+        Serialize some objects whose remote objects are older than the
+        `max_age` of the snapshot and check they are retrieved and updated
+        """
+        snapshot = RemoteSnapshot(self.path, max_age=60, save_interval=0)
+        snapshot.update({2001: {'id': 2001, 'name': 'Old'},
+                         2002: {'id': 2002, 'name': 'Old'}})
+        snapshot.entries[2002] = (time.time() - 120,
+                                  snapshot.entries[2002][1])
+
+        data = self.serialize(snapshot)
+
+        list_endpoint.assert_called_once_with(pk__in='2002')
+        self.assertEqual([row['thing']['name'] for row in data],
+                         ['Old', 'Name 2002'])
+        self.assertEqual(snapshot.entries[2002][1]['name'], 'Name 2002')
+
+    def test_fallback_while_unavailable(self):
+        """
+        Serialize some objects while the remote service is unavailable and
+        check the old remote objects of the snapshot are served
+        """
+        snapshot = RemoteSnapshot(self.path, max_age=0, save_interval=0)
+        snapshot.update({2001: {'id': 2001, 'name': 'Old 1'},
+                         2002: {'id': 2002, 'name': 'Old 2'}})
+        list_endpoint.side_effect = CircuitOpen
+
+        data = self.serialize(snapshot)
+
+        self.assertEqual([row['thing']['name'] for row in data],
+                         ['Old 1', 'Old 2'])
+
+    def test_only_objects_not_found_are_removed(self):
+        """
+        Serialize a single object whose 'detail' endpoint fails, and check
+        its remote object is only removed from the snapshot once the
+        endpoint confirms it does not exist
+        """
+        snapshot = RemoteSnapshot(self.path, max_age=0, save_interval=0)
+        snapshot.update({2001: {'id': 2001, 'name': 'Old 1'}})
+        model_instance = ModelForTest.objects.get(thing_id=2001)
+        detail_endpoint.side_effect = ValueError
+
+        make_serializer(snapshot)(model_instance).data
+
+        self.assertIn(2001, snapshot.entries)
+
+        detail_endpoint.side_effect = RemoteNotFound(2001)
+
+        make_serializer(snapshot)(model_instance).data
+
+        self.assertNotIn(2001, snapshot.entries)
+
+    def test_refresh(self):
+        """
+        Refresh a snapshot and check the whole remote collection is stored
+        on its file, with a versioned header
+        """
+        list_endpoint.side_effect = None
+        list_endpoint.return_value = [{'id': 2001, 'name': 'Name 1'},
+                                      {'id': 2003, 'name': 'Name 3'}]
+        snapshot = RemoteSnapshot(self.path)
+        field = make_serializer(snapshot)().fields['thing']
+
+        snapshot.refresh(field)
+
+        list_endpoint.assert_called_once_with()
+        with open(self.path) as snapshot_file:
+            lines = [json.loads(line) for line in snapshot_file]
+        self.assertEqual(lines[0]['version'], RemoteSnapshot.version)
+        self.assertEqual(lines[0]['timestamp'], snapshot.timestamp)
+        self.assertEqual(sorted(pk for pk, _, _ in lines[1:]), [2001, 2003])
+
+    def test_file_is_written_without_the_lock(self):
+        """
+        Replace the remote objects of a snapshot and check the lock used to
+        read them is free while its file is written
+        """
+        snapshot = RemoteSnapshot(self.path)
+        rename = os.rename
+        locked = []
+
+        def check_lock():
+            free = snapshot.lock.acquire(False)
+            if free:
+                snapshot.lock.release()
+            locked.append(not free)
+
+        def check_lock_and_rename(*args):
+            thread = threading.Thread(target=check_lock)
+            thread.start()
+            thread.join()
+            rename(*args)
+
+        with mock.patch('os.rename', side_effect=check_lock_and_rename):
+            snapshot.replace({2001: {'id': 2001}}, time.time())
+
+        self.assertEqual(locked, [False])
+        self.assertEqual(RemoteSnapshot(self.path).load().entries[2001][1],
+                         {'id': 2001})
+
+    def test_outdated_file_is_ignored(self):
+        """
+        Load a file written with another version and check the snapshot is
+        empty
+        """
+        with open(self.path, 'w') as snapshot_file:
+            snapshot_file.write('{"version": 0}\n[2001, 0, {"id": 2001}]\n')
+
+        snapshot = RemoteSnapshot(self.path).load()
+
+        self.assertEqual(snapshot.entries, {})
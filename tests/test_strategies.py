@@ -0,0 +1,105 @@
+import mock
+from unittest import TestCase
+
+from rest_framework import serializers
+
+from remotefields import RemoteFieldsModelSerializerMixin, RemoteField
+from tests.models import ModelForTest
+
+
+list_endpoint = mock.Mock()
+detail_endpoint = mock.Mock()
+
+
+def get_serializer_class(**kwargs):
+
+    class StrategyTestSerializer(RemoteFieldsModelSerializerMixin,
+                                 serializers.ModelSerializer):
+        thing_name = RemoteField(
+            source='thing_id', remote_sources=('name',), flat=True,
+            endpoints={'list': list_endpoint, 'detail': detail_endpoint},
+            **kwargs
+        )
+
+        class Meta:
+            model = ModelForTest
+            fields = ('id', 'thing_name')
+
+    return StrategyTestSerializer
+
+
+class StrategyTest(TestCase):
+
+    def setUp(self):
+        super(StrategyTest, self).setUp()
+        list_endpoint.reset_mock()
+        list_endpoint.return_value = [
+            {'id': 2001, 'name': 'Name 1'}, {'id': 2002, 'name': 'Name 2'}]
+        detail_endpoint.reset_mock()
+        detail_endpoint.side_effect = lambda pk: {'id': pk,
+                                                  'name': 'Name %d' % pk}
+        for thing_id in (2001, 2002, 2001):
+            ModelForTest.objects.create(thing_id=thing_id)
+
+    def tearDown(self):
+        super(StrategyTest, self).tearDown()
+        ModelForTest.objects.all().delete()
+
+    def serialize(self, **kwargs):
+        serializer_class = get_serializer_class(**kwargs)
+        return [row['thing_name'] for row
+                in serializer_class(ModelForTest.objects.all()).data]
+
+    def test_invalid_strategy(self):
+        """
+        Check that unknown strategies are rejected
+        """
+        with self.assertRaises(ValueError):
+            RemoteField(source='thing_id', remote_sources=('name',),
+                        endpoints={}, strategy='unknown')
+
+    def test_detail_strategy(self):
+        """
+        Serialize a queryset with the 'detail' strategy and check every
+        distinct pk is retrieved once using the 'detail' endpoint
+        """
+        result = self.serialize(strategy=RemoteField.DETAIL)
+
+        self.assertEqual(result, ['Name 2001', 'Name 2002', 'Name 2001'])
+        self.assertEqual(detail_endpoint.call_args_list,
+                         [mock.call(pk=2001), mock.call(pk=2002)])
+        self.assertFalse(list_endpoint.called)
+
+    def test_list_strategy(self):
+        """
+        Serialize a single object with the 'list' strategy and check the
+        'list' endpoint is used
+        """
+        serializer_class = get_serializer_class(strategy=RemoteField.LIST)
+
+        result = serializer_class(ModelForTest.objects.get(pk=2)).data
+
+        self.assertEqual(result, {'id': 2, 'thing_name': 'Name 2'})
+        self.assertFalse(detail_endpoint.called)
+
+    def test_auto_strategy_below_threshold(self):
+        """
+        Serialize a queryset with less distinct pks than the threshold and
+        check the 'detail' endpoint is used
+        """
+        result = self.serialize(strategy=RemoteField.AUTO, bulk_threshold=2)
+
+        self.assertEqual(result, ['Name 2001', 'Name 2002', 'Name 2001'])
+        self.assertEqual(detail_endpoint.call_count, 2)
+        self.assertFalse(list_endpoint.called)
+
+    def test_auto_strategy_above_threshold(self):
+        """
+        Serialize a queryset with more distinct pks than the threshold and
+        check the 'list' endpoint is used
+        """
+        result = self.serialize(strategy=RemoteField.AUTO, bulk_threshold=1)
+
+        self.assertEqual(result, ['Name 1', 'Name 2', 'Name 1'])
+        self.assertFalse(detail_endpoint.called)
+        list_endpoint.assert_called_once_with()
@@ -0,0 +1,99 @@
+import mock
+from unittest import TestCase
+
+from rest_framework import serializers
+
+from remotefields import RemoteFieldsModelSerializerMixin, RemoteField
+from tests.models import ModelForTest, ParentModelForTest
+
+
+list_endpoint = mock.Mock()
+
+
+class StreamingTestSerializer(RemoteFieldsModelSerializerMixin,
+                              serializers.ModelSerializer):
+    thing_name = RemoteField(
+        source='thing_id', remote_sources=('name',), flat=True,
+        bulk_param='pk__in',
+        endpoints={'list': list_endpoint, 'detail': mock.Mock()}
+    )
+
+    class Meta:
+        model = ModelForTest
+        fields = ('id', 'thing_name')
+
+
+class ParentStreamingTestSerializer(RemoteFieldsModelSerializerMixin,
+                                    serializers.ModelSerializer):
+    test_instance = StreamingTestSerializer()
+
+    class Meta:
+        model = ParentModelForTest
+        fields = ('id', 'test_instance')
+
+
+def remote_list(pk__in):
+    return [{'id': int(pk), 'name': 'Name %s' % pk}
+            for pk in pk__in.split(',')]
+
+
+class IterDataTest(TestCase):
+
+    def setUp(self):
+        super(IterDataTest, self).setUp()
+        list_endpoint.reset_mock()
+        list_endpoint.side_effect = remote_list
+        for thing_id in range(2001, 2006):
+            ParentModelForTest.objects.create(
+                test_instance=ModelForTest.objects.create(thing_id=thing_id))
+
+    def tearDown(self):
+        super(IterDataTest, self).tearDown()
+        ModelForTest.objects.all().delete()
+
+    def test_iter_data_resolves_every_chunk(self):
+        """
+        Stream a queryset in chunks and check the remote fields of every
+        chunk are resolved with a remote call
+        """
+        serializer = StreamingTestSerializer(ModelForTest.objects.all())
+        expected = [{'id': i, 'thing_name': 'Name %d' % (2000 + i)}
+                    for i in range(1, 6)]
+
+        result = list(serializer.iter_data(chunk_size=2))
+
+        self.assertEqual(result, expected)
+        self.assertEqual(list_endpoint.call_args_list, [
+            mock.call(pk__in='2001,2002'),
+            mock.call(pk__in='2003,2004'),
+            mock.call(pk__in='2005')])
+
+    def test_iter_data_is_lazy(self):
+        """
+        Check that only the first chunk is resolved before the first row
+        is consumed
+        """
+        serializer = StreamingTestSerializer(ModelForTest.objects.all())
+
+        rows = serializer.iter_data(chunk_size=2)
+        self.assertFalse(list_endpoint.called)
+
+        self.assertEqual(next(rows), {'id': 1, 'thing_name': 'Name 2001'})
+        list_endpoint.assert_called_once_with(pk__in='2001,2002')
+
+    def test_iter_data_with_nested(self):
+        """
+        Stream a queryset with a nested serializer and check the nested
+        remote fields are resolved too
+        """
+        serializer = ParentStreamingTestSerializer(
+            ParentModelForTest.objects.all())
+        expected = [
+            {'id': i,
+             'test_instance': {'id': i, 'thing_name': 'Name %d' % (2000 + i)}}
+            for i in range(1, 6)]
+
+        result = list(serializer.iter_data(chunk_size=3))
+
+        self.assertEqual(result, expected)
+        self.assertEqual(list_endpoint.call_count, 2)
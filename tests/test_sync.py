@@ -0,0 +1,183 @@
+import mock
+import os
+import shutil
+import tempfile
+import time
+from unittest import TestCase
+
+from rest_framework import serializers
+
+from remotefields import (RemoteFieldsModelSerializerMixin, RemoteField,
+                          RemoteSnapshot, RemoteSync)
+from tests.models import ModelForTest
+
+
+list_endpoint = mock.Mock()
+detail_endpoint = mock.Mock()
+
+
+def make_serializer(sync):
+
+    class SyncTestSerializer(RemoteFieldsModelSerializerMixin,
+                             serializers.ModelSerializer):
+        thing = RemoteField(
+            source='thing_id', remote_sources=('id', 'name',), sync=sync,
+            endpoints={'list': list_endpoint, 'detail': detail_endpoint}
+        )
+
+        class Meta:
+            model = ModelForTest
+            fields = ('id', 'thing')
+
+    return SyncTestSerializer
+
+
+class RemoteSyncTest(TestCase):
+
+    def setUp(self):
+        super(RemoteSyncTest, self).setUp()
+        list_endpoint.reset_mock()
+        list_endpoint.side_effect = None
+        list_endpoint.return_value = [
+            {'id': 2001, 'name': 'Name 1'}, {'id': 2002, 'name': 'Name 2'}]
+        detail_endpoint.reset_mock()
+        self.first = ModelForTest.objects.create(thing_id=2001)
+        self.second = ModelForTest.objects.create(thing_id=2002)
+
+    def tearDown(self):
+        super(RemoteSyncTest, self).tearDown()
+        ModelForTest.objects.all().delete()
+
+    def serialize(self, sync, instance=None):
+        serializer_class = make_serializer(sync)
+        if instance is not None:
+            return serializer_class(instance).data
+        return serializer_class(
+            ModelForTest.objects.order_by('id'), many=True).data
+
+    def test_table_is_loaded_once(self):
+        """
+        Serialize a list and a single object and check the whole remote
+        collection is retrieved only once
+        """
+        sync = RemoteSync(interval=60)
+
+        data = self.serialize(sync)
+        single = self.serialize(sync, self.second)
+
+        list_endpoint.assert_called_once_with()
+        self.assertFalse(detail_endpoint.called)
+        self.assertEqual([row['thing']['name'] for row in data],
+                         ['Name 1', 'Name 2'])
+        self.assertEqual(single['thing'], {'id': 2002, 'name': 'Name 2'})
+
+    def test_changes_and_tombstones(self):
+        """
+        Synchronize a loaded table and check only the changes since the
+        previous synchronization are requested, and the deleted remote
+        objects are removed
+        """
+        sync = RemoteSync(modified_since_param='changed_after')
+        field = make_serializer(sync)().fields['thing']
+        sync.sync(field)
+        cursor = sync.cursor
+        list_endpoint.return_value = [
+            {'id': 2001, 'deleted': True}, {'id': 2003, 'name': 'Name 3'}]
+
+        sync.sync(field)
+
+        list_endpoint.assert_called_with(
+            changed_after=sync.format_cursor(cursor - 60))
+        self.assertEqual(sorted(sync.table), [2002, 2003])
+        data = self.serialize(sync)
+        self.assertEqual([row['thing'] for row in data],
+                         [None, {'id': 2002, 'name': 'Name 2'}])
+
+    def test_projection_includes_tombstones(self):
+        """
+        Synchronize a field requesting a projection of the remote objects
+        and check the attribute marking the deleted ones is requested too
+        """
+        sync = RemoteSync()
+
+        class ProjectionSyncTestSerializer(RemoteFieldsModelSerializerMixin,
+                                           serializers.ModelSerializer):
+            thing = RemoteField(
+                source='thing_id', remote_sources=('name',), flat=True,
+                projection_param='fields', sync=sync,
+                endpoints={'list': list_endpoint, 'detail': detail_endpoint}
+            )
+
+            class Meta:
+                model = ModelForTest
+                fields = ('id', 'thing')
+
+        field = ProjectionSyncTestSerializer().fields['thing']
+        sync.sync(field)
+        list_endpoint.return_value = [{'id': 2001, 'deleted': True}]
+
+        sync.sync(field)
+
+        self.assertEqual(list_endpoint.call_args[1]['fields'],
+                         'deleted,id,name')
+        self.assertEqual(sorted(sync.table), [2002])
+
+    def test_overlap(self):
+        """
+        Synchronize a loaded table and check the changes are requested
+        since the previous synchronization minus the overlap, so changes
+        stamped by a remote clock behind the local one are not missed
+        """
+        sync = RemoteSync(overlap=300)
+        field = make_serializer(sync)().fields['thing']
+        sync.sync(field)
+        cursor = sync.cursor
+
+        sync.sync(field)
+
+        list_endpoint.assert_called_with(
+            modified_since=sync.format_cursor(cursor - 300))
+
+    def test_old_table_is_synchronized_in_the_background(self):
+        """
+        Serialize with a table older than the interval and check it is
+        served while the changes are retrieved in the background
+        """
+        sync = RemoteSync(interval=60)
+        self.serialize(sync)
+        sync.synced_at = time.time() - 120
+        list_endpoint.return_value = [{'id': 2002, 'name': 'New 2'}]
+
+        with mock.patch('remotefields.sync.get_pool') as get_pool:
+            data = self.serialize(sync)
+
+        self.assertEqual(data[1]['thing']['name'], 'Name 2')
+        (func, args), _ = get_pool.return_value.apply_async.call_args
+        func(*args)
+        self.assertEqual(sync.table[2002]['name'], 'New 2')
+        self.assertFalse(sync.syncing)
+
+    def test_snapshot(self):
+        """
+        Synchronize a table with a snapshot, then start a new one from the
+        same file and check only the changes since it was saved are
+        requested
+        """
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'things.snapshot')
+        sync = RemoteSync(snapshot=RemoteSnapshot(path))
+        with mock.patch('remotefields.snapshot.get_pool') as get_pool:
+            sync.sync(make_serializer(sync)().fields['thing'])
+        self.assertFalse(os.path.exists(path))
+        (func,), _ = get_pool.return_value.apply_async.call_args
+        func()
+        list_endpoint.return_value = []
+
+        new_sync = RemoteSync(snapshot=RemoteSnapshot(path))
+        data = self.serialize(new_sync)
+
+        list_endpoint.assert_called_with(
+            modified_since=sync.format_cursor(sync.cursor - 60))
+        self.assertEqual([row['thing']['name'] for row in data],
+                         ['Name 1', 'Name 2'])
@@ -0,0 +1,131 @@
+import mock
+import threading
+import time
+from unittest import TestCase
+
+from rest_framework import serializers
+
+from remotefields import RemoteFieldsModelSerializerMixin, RemoteField
+from tests.models import ModelForTest
+
+
+released = threading.Event()
+
+
+def slow_detail_endpoint(pk):
+    released.wait(5)
+    return {'id': pk, 'name': 'Slow'}
+
+
+def fast_detail_endpoint(pk):
+    return {'id': pk, 'name': 'Fast'}
+
+
+class TimeoutTestSerializer(RemoteFieldsModelSerializerMixin,
+                            serializers.ModelSerializer):
+    slow = RemoteField(
+        source='thing_id', remote_sources=('name',), flat=True,
+        timeout=0.05, placeholder='Unavailable',
+        endpoints={'list': mock.Mock(), 'detail': slow_detail_endpoint}
+    )
+    fast = RemoteField(
+        source='thing_id', remote_sources=('name',), flat=True,
+        timeout=0.05, placeholder='Unavailable',
+        endpoints={'list': mock.Mock(), 'detail': fast_detail_endpoint}
+    )
+
+    class Meta:
+        model = ModelForTest
+        fields = ('id', 'slow', 'fast')
+
+
+class DeadlineTestSerializer(RemoteFieldsModelSerializerMixin,
+                             serializers.ModelSerializer):
+    slow = RemoteField(
+        source='thing_id', remote_sources=('name',), flat=True,
+        endpoints={'list': mock.Mock(), 'detail': slow_detail_endpoint}
+    )
+
+    remote_timeout = 0.05
+
+    class Meta:
+        model = ModelForTest
+        fields = ('id', 'slow')
+
+
+class TimeoutTest(TestCase):
+
+    def setUp(self):
+        super(TimeoutTest, self).setUp()
+        released.clear()
+        self.model_instance = ModelForTest.objects.create(thing_id=2001)
+
+    def tearDown(self):
+        super(TimeoutTest, self).tearDown()
+        released.set()
+        ModelForTest.objects.all().delete()
+
+    def test_field_timeout(self):
+        """
+        Serialize a model instance with a remote field not answering on
+        time and check it is filled with its placeholder
+        """
+        serializer = TimeoutTestSerializer(self.model_instance)
+        expected = {'id': 1, 'slow': 'Unavailable', 'fast': 'Fast'}
+
+        result = serializer.data
+
+        self.assertEqual(result, expected)
+        self.assertEqual(serializer.timed_out_fields,
+                         set(['TimeoutTestSerializer.slow']))
+
+    @mock.patch('remotefields.executor.get_call_workers',
+                mock.Mock(return_value=2))
+    @mock.patch('remotefields.executor._call_pool_keys', set())
+    def test_hung_endpoint_does_not_hold_up_the_rest(self):
+        """
+        Serialize a model instance while every thread calling a remote
+        endpoint is hung on it, and check the calls to another endpoint are
+        not held up behind them
+        """
+        for _ in range(2):
+            TimeoutTestSerializer(self.model_instance).data
+
+        result = TimeoutTestSerializer(self.model_instance).data
+
+        self.assertEqual(result,
+                         {'id': 1, 'slow': 'Unavailable', 'fast': 'Fast'})
+
+    def test_serializer_deadline(self):
+        """
+        Serialize a model instance with a serializer timeout and check the
+        field waiting for a slow remote call is filled with None
+        """
+        serializer = DeadlineTestSerializer(self.model_instance)
+        start = time.time()
+
+        result = serializer.data
+
+        self.assertEqual(result, {'id': 1, 'slow': None})
+        self.assertTrue(time.time() - start < 1)
+
+    def test_expired_context_deadline(self):
+        """
+        Serialize a model instance once the deadline given on the context
+        has passed and check the remote endpoint is not called
+        """
+        detail_endpoint = mock.Mock()
+
+        class ContextDeadlineTestSerializer(DeadlineTestSerializer):
+            slow = RemoteField(
+                source='thing_id', remote_sources=('name',), flat=True,
+                endpoints={'list': mock.Mock(), 'detail': detail_endpoint}
+            )
+
+            remote_timeout = None
+
+        serializer = ContextDeadlineTestSerializer(
+            self.model_instance, context={'remote_deadline': time.time()})
+
+        self.assertEqual(serializer.data, {'id': 1, 'slow': None})
+        self.assertFalse(detail_endpoint.called)
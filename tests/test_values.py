@@ -0,0 +1,90 @@
+import mock
+from unittest import TestCase
+
+from rest_framework import serializers
+
+from remotefields import (RemoteFieldsModelSerializerMixin, RemoteField,
+                          RemoteIdentityMap)
+from tests.models import ModelForTest
+
+
+list_endpoint = mock.Mock()
+
+
+class CopiedValuesTestSerializer(RemoteFieldsModelSerializerMixin,
+                                 serializers.ModelSerializer):
+    thing = RemoteField(
+        source='thing_id', remote_sources=('id', 'name',),
+        endpoints={'list': list_endpoint, 'detail': mock.Mock()}
+    )
+
+    class Meta:
+        model = ModelForTest
+        fields = ('id', 'thing')
+
+
+class SharedValuesTestSerializer(RemoteFieldsModelSerializerMixin,
+                                 serializers.ModelSerializer):
+    thing = RemoteField(
+        source='thing_id', remote_sources=('id', 'name',),
+        share_values=True,
+        endpoints={'list': list_endpoint, 'detail': mock.Mock()}
+    )
+
+    class Meta:
+        model = ModelForTest
+        fields = ('id', 'thing')
+
+
+class RemoteValuesTest(TestCase):
+
+    def setUp(self):
+        super(RemoteValuesTest, self).setUp()
+        list_endpoint.reset_mock()
+        list_endpoint.return_value = [
+            {'id': 2001, 'name': 'Name 1', 'description': 'Not needed'},
+            {'id': 2002, 'name': 'Name 2', 'description': 'Not needed'}
+        ]
+        for thing_id in (2001, 2001, 2002):
+            ModelForTest.objects.create(thing_id=thing_id)
+
+    def tearDown(self):
+        super(RemoteValuesTest, self).tearDown()
+        ModelForTest.objects.all().delete()
+
+    def test_repeated_pks_get_copies(self):
+        """
+        Serialize a queryset with repeated remote pks and check every row
+        gets its own copy of the remote value
+        """
+        result = CopiedValuesTestSerializer(ModelForTest.objects.all()).data
+
+        self.assertEqual(result[0]['thing'], {'id': 2001, 'name': 'Name 1'})
+        self.assertEqual(result[0]['thing'], result[1]['thing'])
+        self.assertIsNot(result[0]['thing'], result[1]['thing'])
+
+    def test_repeated_pks_share_values(self):
+        """
+        Serialize a queryset with repeated remote pks using `share_values`
+        and check the rows share the same remote value
+        """
+        result = SharedValuesTestSerializer(ModelForTest.objects.all()).data
+
+        self.assertEqual(result[0]['thing'], {'id': 2001, 'name': 'Name 1'})
+        self.assertIs(result[0]['thing'], result[1]['thing'])
+        self.assertEqual(result[2]['thing'], {'id': 2002, 'name': 'Name 2'})
+
+    def test_only_needed_attributes_are_kept(self):
+        """
+        Serialize a queryset and check the remote objects are kept without
+        the attributes which are not needed
+        """
+        identity_map = RemoteIdentityMap()
+
+        CopiedValuesTestSerializer(
+            ModelForTest.objects.all(),
+            context={'remote_identity_map': identity_map}).data
+
+        resource, = identity_map.resources.values()
+        self.assertEqual(resource, {2001: {'id': 2001, 'name': 'Name 1'},
+                                    2002: {'id': 2002, 'name': 'Name 2'}})